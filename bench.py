@@ -0,0 +1,157 @@
+"""
+브라우저 프로필 벤치마크
+
+기본 Chrome 프로필과 빠른 프로필(get_chrome_driver(fast=True))로 같은 검색 결과 페이지를
+여러 번 열어 페이지 로드 시간과 전송 바이트 수를 비교한다.
+
+사용 예:
+    python bench.py 양말 --runs 5
+    python bench.py 양말 --runs 3 --json bench_profile.json
+
+로그인 정보는 main.py와 같이 저장된 세션(.domeggook_session.json) 또는 환경변수(DOMEID, DOMPWD)를 사용한다.
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from main import (
+    SEARCH_MAX_PAGE_SIZE,
+    build_search_url,
+    ensure_login,
+    get_chrome_driver,
+    wait_for_search_results,
+)
+
+
+def collect_network_totals(driver):
+    """
+    마지막 호출 이후 쌓인 performance 로그에서 네트워크 사용량 합계 계산
+
+    Returns:
+        {'bytes': 전송 바이트 수, 'requests': 요청 수, 'blocked': 차단된 요청 수}
+    """
+    totals = {'bytes': 0, 'requests': 0, 'blocked': 0}
+    for entry in driver.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            totals['requests'] += 1
+        elif method == 'Network.loadingFinished':
+            totals['bytes'] += int(params.get('encodedDataLength') or 0)
+        elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+            totals['blocked'] += 1
+    return totals
+
+
+def measure_search_page(driver, url, timeout=30):
+    """
+    검색 결과 페이지를 한 번 열고 측정
+
+    Returns:
+        {'get_seconds': driver.get() 반환까지 걸린 시간,
+         'ready_seconds': 결과 카드가 모두 나타날 때까지 걸린 시간,
+         'found': 결과 카드 발견 여부, 'bytes', 'requests', 'blocked'}
+    """
+    collect_network_totals(driver)  # 이전 페이지의 로그 비우기
+
+    start = time.perf_counter()
+    driver.get(url)
+    get_seconds = time.perf_counter() - start
+    found = wait_for_search_results(driver, timeout=timeout)
+    ready_seconds = time.perf_counter() - start
+
+    # 결과가 준비된 시점까지의 전송량 (이후 늦게 끝나는 요청은 다음 측정 전에 버려짐)
+    measurement = {'get_seconds': get_seconds, 'ready_seconds': ready_seconds, 'found': found}
+    measurement.update(collect_network_totals(driver))
+    return measurement
+
+
+def run_profile(search_keyword, fast, runs=3, headless=True, username=None, password=None):
+    """
+    한 프로필로 검색 결과 페이지를 runs번 열어 측정값 리스트 반환
+
+    첫 번째 요청은 로그인 직후라 캐시 상태가 다르므로 측정에서 제외한다.
+    """
+    name = "빠른 프로필" if fast else "기본 프로필"
+    print(f"\n[{name}] 브라우저 시작 및 로그인...")
+    driver = get_chrome_driver(headless=headless, fast=fast, log_network=True)
+    try:
+        if not ensure_login(driver, username=username, password=password):
+            raise RuntimeError("로그인에 실패하여 벤치마크를 진행할 수 없습니다.")
+
+        url = build_search_url(search_keyword, page=1, page_size=SEARCH_MAX_PAGE_SIZE)
+        measure_search_page(driver, url)  # 워밍업
+
+        measurements = []
+        for run in range(1, runs + 1):
+            measurement = measure_search_page(driver, url)
+            measurements.append(measurement)
+            print(f"  {run}/{runs}: 로드 {measurement['get_seconds']:.2f}초, 결과 준비 {measurement['ready_seconds']:.2f}초, "
+                  f"{measurement['bytes'] / 1024:,.0f}KB, 요청 {measurement['requests']}개 (차단 {measurement['blocked']}개)")
+        return measurements
+    finally:
+        driver.quit()
+
+
+def summarize(measurements):
+    """측정값 리스트의 중앙값 요약"""
+    return {
+        key: statistics.median(m[key] for m in measurements)
+        for key in ('get_seconds', 'ready_seconds', 'bytes', 'requests', 'blocked')
+    }
+
+
+def print_comparison(default_summary, fast_summary):
+    """기본 프로필 대비 빠른 프로필의 감소율 출력"""
+    print("\n" + "=" * 60)
+    print("프로필 비교 (중앙값)")
+    print("=" * 60)
+    print(f"  {'항목':<16}{'기본':>14}{'빠른':>14}{'감소':>10}")
+    rows = [
+        ('페이지 로드(초)', 'get_seconds', "{:.2f}"),
+        ('결과 준비(초)', 'ready_seconds', "{:.2f}"),
+        ('전송량(KB)', 'bytes', "{:,.0f}"),
+        ('요청 수', 'requests', "{:.0f}"),
+    ]
+    for label, key, fmt in rows:
+        base = default_summary[key]
+        fast = fast_summary[key]
+        scale = 1024 if key == 'bytes' else 1
+        reduction = f"{(1 - fast / base) * 100:.0f}%" if base else "-"
+        print(f"  {label:<16}{fmt.format(base / scale):>14}{fmt.format(fast / scale):>14}{reduction:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기본/빠른 브라우저 프로필의 검색 페이지 로드 시간과 전송량 비교")
+    parser.add_argument('keyword', nargs='?', default="양말", help="측정에 사용할 검색어 (기본: 양말)")
+    parser.add_argument('--runs', type=int, default=3, help="프로필별 측정 횟수 (기본: 3)")
+    parser.add_argument('--no-headless', action='store_true', help="브라우저 창을 표시")
+    parser.add_argument('--json', dest='json_path', help="측정 결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    default_runs = run_profile(args.keyword, fast=False, runs=args.runs, headless=not args.no_headless)
+    fast_runs = run_profile(args.keyword, fast=True, runs=args.runs, headless=not args.no_headless)
+
+    default_summary = summarize(default_runs)
+    fast_summary = summarize(fast_runs)
+    print_comparison(default_summary, fast_summary)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'keyword': args.keyword,
+                'runs': args.runs,
+                'default': {'summary': default_summary, 'runs': default_runs},
+                'fast': {'summary': fast_summary, 'runs': fast_runs},
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n✓ 측정 결과 저장: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+"""
+검색/파싱/전송 처리량 벤치마크 모음
+
+로컬 대체 사이트(standin_site.py)를 스레드로 띄우고 녹화된 검색 결과 페이지(fixtures/supplyList)나
+result/search_results_*.json으로 만든 페이지를 대상으로 측정한다. 실제 사이트와 계정은 필요 없다.
+
+측정 항목:
+    - parse_search_results_html (lxml) 처리량 (상품/초)
+    - parse_search_results 일괄 추출/기존 방식 처리량 (상품/초, 브라우저 필요)
+    - extract_price_number 1회 호출 시간 (마이크로초)
+    - 백엔드별(HTTP, Selenium 기존 방식, 일괄 추출 JS) 검색어 처리량 (검색어/분, 첫 페이지 기준)
+    - 체크박스 선택 시간 (상품당 밀리초, 일괄/기존 방식)
+    - 파싱/체크박스 선택의 상품당 WebDriver 명령 수 (main.DRIVER_COMMANDS 계측)
+
+측정 결과는 bench_history.json에 누적되고, 기준값(bench_baseline.json)과 비교해
+정해진 비율 이상 나빠진 항목을 회귀로 표시한다 (회귀가 있으면 종료 코드 1).
+
+사용 예:
+    python bench_suite.py run                      # 측정 후 기록
+    python bench_suite.py run --no-browser --compare
+    python bench_suite.py run --save-baseline      # 이번 결과를 기준값으로 저장
+    python bench_suite.py compare                  # 마지막 기록을 기준값과 비교
+"""
+
+import argparse
+import contextlib
+import glob
+import importlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import timeit
+from datetime import datetime
+from urllib.parse import urlparse
+
+from standin_site import (
+    FIXTURE_DIR,
+    RESULT_DIR,
+    SESSION_COOKIE,
+    load_result_products,
+    render_product_card,
+    render_search_page,
+    serve,
+)
+
+HISTORY_PATH = "bench_history.json"
+BASELINE_PATH = "bench_baseline.json"
+REGRESSION_THRESHOLD = 0.10  # 기준값보다 10% 이상 나빠지면 회귀
+
+# 지표 이름: (출력 이름, 값이 클수록 좋은지)
+METRICS = {
+    'parse_html_products_per_sec': ("HTML 파싱 (상품/초)", True),
+    'parse_bulk_products_per_sec': ("일괄 추출 파싱 (상품/초)", True),
+    'parse_legacy_products_per_sec': ("기존 방식 파싱 (상품/초)", True),
+    'extract_price_number_us': ("extract_price_number (µs/회)", False),
+    'http_keywords_per_min': ("HTTP 검색 (검색어/분)", True),
+    'selenium_keywords_per_min': ("Selenium 검색 (검색어/분)", True),
+    'bulk_js_keywords_per_min': ("일괄 추출 JS 검색 (검색어/분)", True),
+    'checkbox_batch_ms_per_product': ("체크박스 일괄 선택 (ms/상품)", False),
+    'checkbox_legacy_ms_per_product': ("체크박스 기존 선택 (ms/상품)", False),
+    'parse_bulk_commands_per_product': ("일괄 추출 파싱 (명령/상품)", False),
+    'parse_legacy_commands_per_product': ("기존 방식 파싱 (명령/상품)", False),
+    'checkbox_batch_commands_per_product': ("체크박스 일괄 선택 (명령/상품)", False),
+    'checkbox_legacy_commands_per_product': ("체크박스 기존 선택 (명령/상품)", False),
+}
+
+# result JSON에 없는 형태까지 포함한 가격 텍스트 표본
+PRICE_TEXT_SAMPLES = ["29,530원", "12,000원", " 1,234,567 원", "980원", "가격문의", "", None, "3,500원~"]
+
+
+@contextlib.contextmanager
+def quiet():
+    """측정 중 main.py의 진행 메시지 출력 숨기기"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def load_app(base_url):
+    """
+    사이트 주소를 대체 사이트로 지정한 뒤 main 모듈 불러오기
+
+    main.py는 import할 때 환경변수에서 사이트 주소를 읽으므로 환경변수를 먼저 설정한다.
+    """
+    for name in ('DOMEGGOOK_URL', 'DOMEMEDB_URL', 'SPEEDGO_URL'):
+        os.environ[name] = base_url
+    app = importlib.import_module('main')
+    # 로컬 대체 사이트만 호출하므로 사이트 요청 속도 제한은 끄고 처리량 자체를 잰다
+    app.RATE_LIMITER.configure(rate=0)
+    return app
+
+
+def default_keywords(fixture_dir=FIXTURE_DIR, result_dir=RESULT_DIR, limit=5):
+    """녹화된 페이지가 있는 검색어, 없으면 결과 파일이 큰 순서로 limit개"""
+    recorded = sorted({
+        os.path.basename(path).rsplit('_p', 1)[0]
+        for path in glob.glob(os.path.join(fixture_dir, "supplyList", "*_p1_sz*.html"))
+    })
+    if recorded:
+        return recorded[:limit]
+    paths = sorted(glob.glob(os.path.join(result_dir, "search_results_*.json")), key=os.path.getsize, reverse=True)
+    return [os.path.basename(path)[len("search_results_"):-len(".json")] for path in paths[:limit]]
+
+
+def load_search_pages(search_keywords, fixture_dir=FIXTURE_DIR, result_dir=RESULT_DIR):
+    """
+    파싱 벤치마크에 쓸 검색 결과 페이지 HTML 리스트
+
+    검색어마다 녹화된 페이지가 있으면 그 페이지들을, 없으면 결과 JSON으로 만든 페이지 하나를 사용한다.
+    """
+    pages = []
+    for search_keyword in search_keywords:
+        recorded = sorted(glob.glob(os.path.join(fixture_dir, "supplyList", f"{search_keyword}_p*_sz*.html")))
+        if recorded:
+            for path in recorded:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    pages.append(f.read())
+            continue
+        products = load_result_products(result_dir, search_keyword)
+        if products:
+            cards_html = "".join(render_product_card(p) for p in products)
+            pages.append(render_search_page(search_keyword, cards_html))
+    return pages
+
+
+def best_rate(items, func, repeat):
+    """func()를 repeat번 실행하여 가장 빠른 실행의 초당 처리량 (items / 초)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return items / best if best else 0.0
+
+
+def bench_parse_html(app, pages, repeat):
+    """parse_search_results_html 처리량 (상품/초)"""
+    with quiet():
+        products = sum(len(app.parse_search_results_html(page)) for page in pages)
+
+        def parse_all():
+            for page in pages:
+                app.parse_search_results_html(page)
+
+        rate = best_rate(products, parse_all, repeat)
+    return rate, {'pages': len(pages), 'products': products}
+
+
+def bench_extract_price_number(app, search_keywords, result_dir=RESULT_DIR, number=20000):
+    """extract_price_number 1회 호출 시간 (마이크로초, timeit 5회 중 최소)"""
+    samples = list(PRICE_TEXT_SAMPLES)
+    for search_keyword in search_keywords:
+        samples.extend(p.get('price') for p in load_result_products(result_dir, search_keyword)[:50])
+
+    def run():
+        for text in samples:
+            app.extract_price_number(text)
+
+    best = min(timeit.repeat(run, number=max(1, number // len(samples)), repeat=5))
+    calls = max(1, number // len(samples)) * len(samples)
+    return best / calls * 1e6, {'samples': len(samples)}
+
+
+def logged_in_session(app, server):
+    """대체 사이트에 로그인된 requests.Session (로그인 폼을 거치지 않고 세션 발급)"""
+    token = server.state.login("bench")
+    session = app.create_http_session(cookies=[
+        {'name': SESSION_COOKIE, 'value': token, 'domain': urlparse(server.base_url).hostname}
+    ])
+    session.cache_user = "bench"
+    return session
+
+
+def logged_in_driver(app, server, fast=False):
+    """대체 사이트에 로그인된 Chrome driver"""
+    driver = app.get_chrome_driver(headless=True, fast=fast)
+    driver.get(f"{server.base_url}/index/")
+    driver.add_cookie({'name': SESSION_COOKIE, 'value': server.state.login("bench"), 'path': '/'})
+    return driver
+
+
+def keywords_per_minute(search_keywords, search, repeat):
+    """
+    검색어 목록을 repeat번 검색하여 검색어/분 중앙값 계산
+
+    Args:
+        search: 검색어 하나를 검색하고 결과 리스트를 반환하는 함수
+
+    Returns:
+        (검색어/분, 검색어당 평균 상품 수)
+    """
+    rates = []
+    products = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        products = sum(len(search(search_keyword)) for search_keyword in search_keywords)
+        elapsed = time.perf_counter() - start
+        rates.append(len(search_keywords) / elapsed * 60 if elapsed else 0.0)
+    return statistics.median(rates), products / len(search_keywords)
+
+
+def bench_http(app, server, search_keywords, repeat, cache_dir):
+    """HTTP 백엔드 검색어/분 (반복마다 빈 응답 캐시로 시작하여 캐시 적중 제외)"""
+    session = logged_in_session(app, server)
+    original_cache = app.HTTP_CACHE
+
+    def search(search_keyword):
+        return app.search_products_http(search_keyword, session, max_pages=1)
+
+    rates = []
+    products = 0.0
+    with quiet():
+        for run in range(repeat):
+            app.HTTP_CACHE = app.HttpCache(path=os.path.join(cache_dir, f"http_cache_{run}.db"))
+            try:
+                rate, products = keywords_per_minute(search_keywords, search, 1)
+            finally:
+                app.HTTP_CACHE.close()
+                app.HTTP_CACHE = original_cache
+            rates.append(rate)
+    session.close()
+    return statistics.median(rates), {'products_per_keyword': products}
+
+
+def commands_per_product(app, products, func):
+    """func()를 한 번 실행하는 동안의 상품당 WebDriver 명령 수 (DRIVER_COMMANDS로 계측)"""
+    before = app.DRIVER_COMMANDS.thread_total()
+    func()
+    return (app.DRIVER_COMMANDS.thread_total() - before) / products if products else 0.0
+
+
+def bench_browser(app, server, search_keywords, repeat, fast=False):
+    """
+    브라우저가 필요한 측정 (Selenium/일괄 추출 JS 검색, parse_search_results, 체크박스 선택)
+
+    WebDriver 명령 수도 계측하여 상품당 명령 수와 DRIVER_COMMAND_BUDGETS 초과 건수를 함께 기록한다.
+
+    Returns:
+        (지표 딕셔너리, 상세 정보 딕셔너리)
+    """
+    metrics = {}
+    details = {}
+    app.DRIVER_COMMANDS.enable()
+    app.DRIVER_COMMANDS.reset()
+    driver = logged_in_driver(app, server, fast=fast)
+    try:
+        def open_page(search_keyword):
+            driver.get(app.build_search_url(search_keyword, page=1, page_size=app.SEARCH_MAX_PAGE_SIZE))
+            app.wait_for_search_results(driver)
+
+        def search_selenium(search_keyword):
+            open_page(search_keyword)
+            return app.parse_search_results(driver, bulk=False)
+
+        def search_bulk_js(search_keyword):
+            return list(app.iter_search_products(search_keyword, driver=driver, max_pages=1))
+
+        with quiet():
+            metrics['selenium_keywords_per_min'], details['selenium_products_per_keyword'] = \
+                keywords_per_minute(search_keywords, search_selenium, repeat)
+            metrics['bulk_js_keywords_per_min'], details['bulk_js_products_per_keyword'] = \
+                keywords_per_minute(search_keywords, search_bulk_js, repeat)
+
+            # 이미 열린 페이지에서 파싱만 측정 (상품이 가장 많은 검색어 사용)
+            search_keyword = max(search_keywords, key=lambda kw: len(load_result_products(RESULT_DIR, kw)))
+            open_page(search_keyword)
+            products = len(app.parse_search_results(driver, bulk=True))
+            metrics['parse_bulk_products_per_sec'] = best_rate(
+                products, lambda: app.parse_search_results(driver, bulk=True), repeat)
+            metrics['parse_legacy_products_per_sec'] = best_rate(
+                products, lambda: app.parse_search_results(driver, bulk=False), repeat)
+            for method, bulk in (('bulk', True), ('legacy', False)):
+                metrics[f'parse_{method}_commands_per_product'] = commands_per_product(
+                    app, products, lambda: app.parse_search_results(driver, bulk=bulk))
+            details['browser_parse'] = {'keyword': search_keyword, 'products': products}
+
+            # 체크박스 선택 (방식마다 페이지를 새로 열어 선택되지 않은 상태에서 시작)
+            for name, select in (('batch', app.select_product_checkboxes),
+                                 ('legacy', app.select_product_checkboxes_legacy)):
+                timings = []
+                for _ in range(repeat):
+                    open_page(search_keyword)
+                    product_ids = driver.execute_script(
+                        "return Array.prototype.map.call(document.querySelectorAll(\"input[name='item[]']\"),"
+                        " function (cb) { return cb.value; });")
+                    if not product_ids:
+                        break
+                    before = app.DRIVER_COMMANDS.thread_total()
+                    start = time.perf_counter()
+                    selected = select(driver, product_ids)
+                    elapsed = time.perf_counter() - start
+                    timings.append(elapsed / len(product_ids) * 1000)
+                    metrics[f'checkbox_{name}_commands_per_product'] = \
+                        (app.DRIVER_COMMANDS.thread_total() - before) / len(product_ids)
+                    details[f'checkbox_{name}_selected'] = sum(1 for ok in selected.values() if ok)
+                if timings:
+                    metrics[f'checkbox_{name}_ms_per_product'] = statistics.median(timings)
+        details['driver_command_budget_violations'] = app.DRIVER_COMMANDS.violations[:20]
+    finally:
+        driver.quit()
+    return metrics, details
+
+
+def git_revision():
+    """현재 git 커밋 (git이 없으면 None)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(search_keywords, repeat=3, browser=True, fast=False, fixture_dir=FIXTURE_DIR, result_dir=RESULT_DIR):
+    """
+    벤치마크 전체 실행
+
+    Returns:
+        기록 항목 딕셔너리 ({'timestamp', 'revision', 'keywords', 'repeat', 'metrics', 'details'})
+    """
+    server = serve(port=0, fixture_dir=fixture_dir, result_dir=result_dir, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    app = load_app(server.base_url)
+
+    metrics = {}
+    details = {}
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            pages = load_search_pages(search_keywords, fixture_dir, result_dir)
+            if pages:
+                print(f"HTML 파싱 측정 ({len(pages)}페이지)...")
+                metrics['parse_html_products_per_sec'], details['parse_html'] = bench_parse_html(app, pages, repeat)
+            else:
+                print("⚠ 파싱할 검색 결과 페이지가 없어 HTML 파싱 측정을 건너뜁니다.")
+
+            print("extract_price_number 측정...")
+            metrics['extract_price_number_us'], details['extract_price_number'] = \
+                bench_extract_price_number(app, search_keywords, result_dir)
+
+            print(f"HTTP 검색 측정 (검색어 {len(search_keywords)}개 x {repeat}회)...")
+            metrics['http_keywords_per_min'], details['http'] = \
+                bench_http(app, server, search_keywords, repeat, cache_dir)
+
+        if browser:
+            print(f"브라우저 측정 (검색어 {len(search_keywords)}개 x {repeat}회)...")
+            try:
+                browser_metrics, browser_details = bench_browser(app, server, search_keywords, repeat, fast=fast)
+                metrics.update(browser_metrics)
+                details.update(browser_details)
+            except Exception as e:
+                print(f"⚠ 브라우저 측정을 건너뜁니다: {e}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'keywords': list(search_keywords),
+        'repeat': repeat,
+        'fast_profile': fast,
+        'metrics': metrics,
+        'details': details,
+    }
+
+
+def load_json(path, default):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data):
+    """임시 파일에 쓴 뒤 교체 (중간에 중단되어도 기존 파일 유지)"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def append_history(entry, path=HISTORY_PATH):
+    history = load_json(path, [])
+    history.append(entry)
+    write_json(path, history)
+
+
+def print_metrics(entry):
+    print("\n" + "=" * 60)
+    print(f"벤치마크 결과 ({entry['timestamp']}, {entry.get('revision') or '-'})")
+    print("=" * 60)
+    for key, (label, _) in METRICS.items():
+        if key in entry['metrics']:
+            print(f"  {label:<32}{entry['metrics'][key]:>14,.2f}")
+
+
+def compare(entry, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    측정값을 기준값과 비교하여 출력
+
+    Returns:
+        회귀로 판정된 지표 이름 리스트
+    """
+    regressions = []
+    print("\n" + "=" * 60)
+    print(f"기준값 비교 (기준: {baseline['timestamp']}, {baseline.get('revision') or '-'}, 허용 {threshold:.0%})")
+    print("=" * 60)
+    print(f"  {'항목':<32}{'기준':>12}{'현재':>12}{'변화':>9}")
+    for key, (label, higher_is_better) in METRICS.items():
+        base = baseline['metrics'].get(key)
+        current = entry['metrics'].get(key)
+        if base is None or current is None:
+            continue
+        change = (current - base) / base if base else 0.0
+        worse = -change if higher_is_better else change
+        mark = ""
+        if worse > threshold:
+            regressions.append(key)
+            mark = " ✗ 회귀"
+        elif -worse > threshold:
+            mark = " ✓ 개선"
+        print(f"  {label:<32}{base:>12,.2f}{current:>12,.2f}{change:>+9.1%}{mark}")
+
+    if regressions:
+        print(f"\n✗ 회귀 {len(regressions)}개: {', '.join(METRICS[key][0] for key in regressions)}")
+    else:
+        print("\n✓ 회귀 없음")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색/파싱/전송 처리량 벤치마크 (로컬 대체 사이트 사용)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="벤치마크 실행 후 기록")
+    run_parser.add_argument('keywords', nargs='*', help="측정에 사용할 검색어 (기본: 녹화된 검색어 또는 큰 결과 파일 5개)")
+    run_parser.add_argument('--repeat', type=int, default=3, help="측정 반복 횟수 (기본: 3)")
+    run_parser.add_argument('--no-browser', action='store_true', help="브라우저가 필요한 측정 건너뛰기")
+    run_parser.add_argument('--fast', action='store_true', help="빠른 브라우저 프로필 사용")
+    run_parser.add_argument('--fixtures', default=FIXTURE_DIR, help=f"녹화된 페이지 폴더 (기본: {FIXTURE_DIR})")
+    run_parser.add_argument('--results', default=RESULT_DIR, help=f"결과 JSON 폴더 (기본: {RESULT_DIR})")
+    run_parser.add_argument('--history', default=HISTORY_PATH, help=f"기록 파일 (기본: {HISTORY_PATH})")
+    run_parser.add_argument('--save-baseline', action='store_true', help="이번 결과를 기준값으로 저장")
+    run_parser.add_argument('--compare', action='store_true', help="측정 후 기준값과 비교")
+
+    compare_parser = commands.add_parser('compare', help="마지막 기록을 기준값과 비교")
+    compare_parser.add_argument('--history', default=HISTORY_PATH, help=f"기록 파일 (기본: {HISTORY_PATH})")
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument('--baseline', default=BASELINE_PATH, help=f"기준값 파일 (기본: {BASELINE_PATH})")
+        sub.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                         help=f"회귀로 판정할 악화 비율 (기본: {REGRESSION_THRESHOLD})")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        search_keywords = args.keywords or default_keywords(args.fixtures, args.results)
+        if not search_keywords:
+            print("✗ 측정에 사용할 검색어가 없습니다. 검색어를 지정하거나 result/ 또는 fixtures/를 준비하세요.")
+            return 1
+        print(f"검색어: {', '.join(search_keywords)}")
+        entry = run_suite(search_keywords, repeat=args.repeat, browser=not args.no_browser, fast=args.fast,
+                          fixture_dir=args.fixtures, result_dir=args.results)
+        print_metrics(entry)
+        append_history(entry, args.history)
+        print(f"\n✓ 기록 저장: {args.history}")
+        if args.save_baseline:
+            write_json(args.baseline, entry)
+            print(f"✓ 기준값 저장: {args.baseline}")
+            return 0
+        if not args.compare:
+            return 0
+    else:
+        history = load_json(args.history, [])
+        if not history:
+            print(f"✗ 기록이 없습니다: {args.history}")
+            return 1
+        entry = history[-1]
+        print_metrics(entry)
+
+    baseline = load_json(args.baseline, None)
+    if baseline is None:
+        print(f"⚠ 기준값 파일이 없습니다: {args.baseline} (run --save-baseline으로 저장)")
+        return 0
+    return 1 if compare(entry, baseline, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+"""
+예전 검색 결과(result/search_results_*.json)를 SQLite 상품 저장소로 가져오기
+
+파일 하나를 작업 하나로 프로세스 풀에서 읽고(JSON 파싱 + 해시 계산), 저장은 메인 프로세스에서
+ProductStore로 한다. 상품은 product_id 기준으로 합쳐지고 검색어는 파일 이름에서 복원한다.
+이미 가져온 파일은 수정 시각/크기가 같으면 읽지 않고, 내용 해시가 같으면 다시 저장하지 않는다.
+
+사용 예:
+    python import_results.py
+    python import_results.py result --db products.db --workers 4
+    python import_results.py --force   # 모든 파일을 다시 가져오기
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from main import PRODUCT_DB_PATH, ProductStore, keyword_from_result_path
+
+
+def read_result_file(path):
+    """
+    결과 파일 하나를 읽어 (내용 해시, 상품 리스트) 반환 (프로세스 풀 작업 단위)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    results = json.loads(data.decode('utf-8'))
+    if not isinstance(results, list):
+        raise ValueError("상품 리스트 형식이 아닙니다")
+    return hashlib.sha256(data).hexdigest(), results
+
+
+def import_results(result_dir="result", db_path=PRODUCT_DB_PATH, workers=None, force=False):
+    """
+    결과 폴더의 JSON 파일을 상품 저장소로 가져오기
+
+    Args:
+        result_dir: search_results_*.json 파일이 있는 폴더
+        db_path: SQLite 상품 저장소 경로
+        workers: 프로세스 수 (None이면 CPU 수)
+        force: True면 이미 가져온 파일도 다시 가져옴
+
+    Returns:
+        {'files', 'imported', 'unchanged', 'failed', 'products', 'seconds'} 딕셔너리
+    """
+    start = time.perf_counter()
+    paths = sorted(glob.glob(os.path.join(result_dir, "search_results_*.json")))
+    stats = {'files': len(paths), 'imported': 0, 'unchanged': 0, 'failed': 0, 'products': 0}
+
+    with ProductStore(db_path) as store:
+        # 수정 시각과 크기가 그대로인 파일은 열지도 않음
+        pending = {}
+        for path in paths:
+            path = os.path.normpath(path)
+            st = os.stat(path)
+            record = store.get_imported_file(path)
+            if not force and record and record['mtime'] == st.st_mtime and record['size'] == st.st_size:
+                stats['unchanged'] += 1
+                continue
+            pending[path] = (st, record)
+
+        if pending:
+            print(f"{len(pending)}개 파일을 읽는 중... (전체 {len(paths)}개)")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(read_result_file, path): path for path in pending}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    st, record = pending[path]
+                    try:
+                        sha256, results = future.result()
+                    except Exception as e:
+                        stats['failed'] += 1
+                        print(f"✗ {path}: {e}")
+                        continue
+
+                    # 수정 시각만 바뀌고 내용은 같으면 기록만 갱신
+                    if not force and record and record['sha256'] == sha256:
+                        store.record_imported_file(path, st.st_mtime, st.st_size, sha256, record['products'])
+                        stats['unchanged'] += 1
+                        continue
+
+                    keyword = keyword_from_result_path(path)
+                    seen_at = datetime.fromtimestamp(st.st_mtime).isoformat(timespec='seconds')
+                    count = store.upsert_results(keyword, results, seen_at=seen_at)
+                    store.record_imported_file(path, st.st_mtime, st.st_size, sha256, count)
+                    stats['imported'] += 1
+                    stats['products'] += count
+
+        stats['total_products'] = store.count()
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="result/*.json 검색 결과를 SQLite 상품 저장소로 가져오기")
+    parser.add_argument('result_dir', nargs='?', default="result", help="결과 JSON 폴더 (기본: result)")
+    parser.add_argument('--db', default=PRODUCT_DB_PATH, help=f"상품 저장소 경로 (기본: {PRODUCT_DB_PATH})")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--force', action='store_true', help="이미 가져온 파일도 다시 가져오기")
+    args = parser.parse_args()
+
+    stats = import_results(args.result_dir, db_path=args.db, workers=args.workers, force=args.force)
+    print(f"\n✓ 가져오기 완료 ({stats['seconds']:.2f}초): 파일 {stats['files']}개 중 "
+          f"{stats['imported']}개 가져옴, {stats['unchanged']}개 변경 없음, {stats['failed']}개 실패")
+    print(f"  가져온 상품 {stats['products']}건 → 저장소 전체 {stats['total_products']}개 상품")
+
+
+if __name__ == "__main__":
+    main()
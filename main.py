@@ -2,7 +2,10 @@
 도매꾹 사이트 접속 및 스크래핑을 위한 메인 스크립트
 """
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from bs4 import BeautifulSoup
+from lxml import html as lxml_html
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -15,421 +18,2596 @@ import time
 import json
 import re
 import os
-from urllib.parse import quote, urlparse, parse_qs
+import sys
+import asyncio
+import queue
+import threading
+import sqlite3
+import math
+import random
+import hashlib
+import base64
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import quote, urlparse, parse_qs, urljoin, parse_qsl, urlencode, urlunparse
+
+
+# 로그인 세션(쿠키) 저장 파일 및 유효 시간
+SESSION_STORE_PATH = ".domeggook_session.json"
+SESSION_TTL_SECONDS = 12 * 60 * 60
+
+# 사이트 주소 (환경변수로 바꾸면 standin_site.py 같은 로컬 대체 사이트로 실행 가능)
+DOMEGGOOK_URL = os.getenv('DOMEGGOOK_URL', "https://domeggook.com").rstrip('/')
+DOMEMEDB_URL = os.getenv('DOMEMEDB_URL', "https://domemedb.domeggook.com").rstrip('/')
+SPEEDGO_URL = os.getenv('SPEEDGO_URL', "https://speedgo.domeggook.com").rstrip('/')
+# 로그인 쿠키를 모을 도메인 (이 도메인과 하위 도메인의 쿠키만 세션 파일에 저장)
+COOKIE_DOMAIN = urlparse(DOMEGGOOK_URL).hostname
+
+# 로그인 페이지 (back 파라미터는 로그인 후 돌아갈 페이지, {DOMEMEDB_URL}/index를 base64 인코딩)
+LOGIN_URL = (f"{DOMEGGOOK_URL}/ssl/member/mem_loginForm.php?back="
+             + base64.b64encode(f"{DOMEMEDB_URL}/index".encode('utf-8')).decode('ascii'))
+
+# 로그인 폼 요소 선택자 (도매꾹 통합 로그인 페이지, 앞에서부터 순서대로 시도)
+LOGIN_USER_ID_SELECTORS = [
+    "input[name='user_id']",
+    "input[name='id']",
+    "input[name='username']",
+    "input[name='mem_id']",
+    "input[type='text'][id*='id']",
+    "input[type='text'][id*='user']",
+    "input[type='text'][id*='mem']",
+    "#user_id",
+    "#id",
+    "#mem_id",
+    "input[placeholder*='아이디']",
+    "input[placeholder*='ID']",
+]
+
+LOGIN_PASSWORD_SELECTORS = [
+    "input[name='password']",
+    "input[name='pwd']",
+    "input[name='mem_pwd']",
+    "input[type='password']",
+    "#password",
+    "#pwd",
+    "#mem_pwd",
+    "input[placeholder*='비밀번호']",
+    "input[placeholder*='Password']",
+]
+
+LOGIN_BUTTON_SELECTORS = [
+    "button[type='submit']",
+    "input[type='submit']",
+    "button.btn-login",
+    "button[class*='login']",
+    ".login-btn",
+    "#loginBtn",
+    "button:contains('로그인')",
+    "a[href*='login']",
+    "input[value*='로그인']",
+    "button:contains('로그인')",
+    "[onclick*='login']",
+]
+
+# 검색 결과 페이지 번호/페이지당 상품 수 파라미터 (supplyList.php)
+SEARCH_PAGE_PARAM = "pg"
+SEARCH_PAGE_SIZE_PARAM = "sz"
+SEARCH_MAX_PAGE_SIZE = 100  # 사이트에서 선택할 수 있는 가장 큰 페이지 크기
+
+# 서버에서 먼저 거르도록 검색 URL에 넣는 필터 파라미터 (supplyList.php)
+# None으로 두면 그 필터는 URL에 넣지 않는다. 서버가 무시하는 파라미터여도 결과는 같도록
+# 클라이언트에서도 항상 passes_product_filters()로 한 번 더 거른다.
+SEARCH_MIN_PRICE_PARAM = "minPrice"
+SEARCH_FAST_DELIVERY_PARAM = "fastDelivery"   # 값: 1
+SEARCH_MIN_GRADE_PARAM = "minGrade"
+
+# 가격 정렬 파라미터 (find_price_threshold_page의 가격순 이진 탐색용, None이면 정렬 요청 안 함)
+SEARCH_SORT_PARAM = "so"
+SEARCH_SORT_PRICE_ASC = "pa"  # 낮은 가격순
+# max_pages를 주지 않았을 때 가격순 이진 탐색이 확인할 최대 페이지 번호
+# (마지막 이후 페이지 번호에 마지막 페이지를 다시 돌려주는 사이트에서 갤로핑이 끝없이 이어지지 않도록)
+PRICE_SEARCH_MAX_PAGES = 1000
+# 카드가 0개여도 검색 결과 페이지에는 항상 있는 마이박스담기 버튼의 onclick 함수
+# (필터 때문에 결과가 정말 없는 페이지와 깨진/빈 응답을 구분하는 데 사용)
+SEARCH_PAGE_MARKER = "hashTagAdd"
+
+# 논리 요소별로 실제로 맞았던 선택자를 기억하는 파일 (SelectorRegistry)
+SELECTOR_CACHE_PATH = ".selector_cache.json"
+
+# 모든 검색어의 결과를 모아 두는 SQLite 상품 저장소 (ProductStore)
+PRODUCT_DB_PATH = "products.db"
+# 스피드고로 전송한 상품을 다시 전송하지 않는 기간 (None이면 만료 없음)
+TRANSFER_TTL_SECONDS = None
+
+# 브라우저를 거치지 않는 HTTP 요청의 디스크 캐시 (HttpCache)
+HTTP_CACHE_PATH = ".http_cache.db"
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# URL 종류별 캐시 유효 시간 (초): (URL에 포함된 문자열, 유효 시간), 먼저 맞는 항목 사용
+HTTP_CACHE_TTLS = [
+    ("supplyList.php", 60 * 60),        # 검색 결과 페이지
+    ("itemView.php", 24 * 60 * 60),     # 상품 상세 페이지
+]
+HTTP_CACHE_DEFAULT_TTL = 10 * 60
+
+# 단계별 소요 시간(span) 기록 파일 (JSON Lines, --trace로 지정)
+TRACE_PATH = "trace.jsonl"
+
+# 검색어별 진행 기록 (중단된 실행을 --resume으로 이어서 실행)
+RUN_JOURNAL_PATH = "run_journal.jsonl"
+
+# 실패 진단 스냅샷 (메모리에는 최근 N개만, 파일은 --diagnostics 또는 실행 실패 시에만 저장)
+DIAGNOSTICS_DIR = "diagnostics"
+DIAGNOSTICS_MAX_SNAPSHOTS = 20
+DIAGNOSTICS_MAX_HTML_CHARS = 1_000_000
+
+# 사이트 요청 속도 제한 (토큰 버킷: 초당 요청 수와 한 번에 몰아서 보낼 수 있는 요청 수)
+# 같은 컴퓨터의 모든 스레드/프로세스가 RATE_LIMIT_STATE_PATH 파일 잠금으로 버킷을 공유한다.
+RATE_LIMIT_PER_SECOND = 2.0
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_STATE_PATH = ".rate_limit.state"
+
+# 실패 종류별 재시도 정책 (call_with_retries)
+# attempts: 최대 시도 횟수, base_delay: 첫 재시도 전 대기(초, 이후 두 배씩), max_delay: 최대 대기(초)
+RETRY_POLICIES = {
+    'navigation_timeout': {'label': "페이지 이동 시간 초과/연결 실패", 'attempts': 3, 'base_delay': 2.0, 'max_delay': 30.0},
+    'empty_results': {'label': "검색 결과 페이지 아님", 'attempts': 2, 'base_delay': 3.0, 'max_delay': 10.0},
+    'login_redirect': {'label': "로그인 페이지로 이동됨", 'attempts': 2, 'base_delay': 1.0, 'max_delay': 5.0},
+    'popup_not_found': {'label': "스피드고전송 팝업 없음", 'attempts': 3, 'base_delay': 2.0, 'max_delay': 15.0},
+}
+
+# 회로 차단기: 최근 CIRCUIT_WINDOW번의 시도 중 CIRCUIT_FAILURE_THRESHOLD번 이상 실패하면
+# CIRCUIT_COOLDOWN_SECONDS초 동안 전체 실행을 멈추고, CIRCUIT_MAX_TRIPS번 멈춘 뒤에도 실패하면 실행을 끝냄
+CIRCUIT_WINDOW = 10
+CIRCUIT_FAILURE_THRESHOLD = 6
+CIRCUIT_COOLDOWN_SECONDS = 120
+CIRCUIT_MAX_TRIPS = 3
+
+# 단계별 WebDriver 명령 수 예산 (--driver-commands로 계측할 때 확인)
+# per_product: 구간의 상품 수(products)로 나눈 명령 수, per_span: 구간 하나의 명령 수
+DRIVER_COMMAND_BUDGETS = {
+    'parse': {'per_product': 5},
+    'mybox_select': {'per_product': 3},
+    'navigate': {'per_span': 3},
+}
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+def build_search_url(search_keyword, page=None, page_size=None, min_price=None, fast_delivery=None, min_grade=None,
+                     sort=None):
+    """
+    검색어로 supplyList.php 검색 결과 URL 생성
+    
+    필터는 서버에서 먼저 걸러 주도록 SEARCH_*_PARAM 파라미터로 넣는다 (파라미터가 None이면 생략).
+    
+    Args:
+        search_keyword: 검색할 키워드
+        page: 페이지 번호 (1부터 시작, None이면 사이트 기본값)
+        page_size: 페이지당 상품 수 (None이면 사이트 기본값)
+        min_price: 최소 가격
+        fast_delivery: True면 빠른배송 상품만
+        min_grade: 최소 판매자 등급
+        sort: 정렬 값 (예: SEARCH_SORT_PRICE_ASC, None이면 사이트 기본 정렬)
+    
+    Returns:
+        검색 결과 페이지 URL
+    """
+    encoded_keyword = quote(search_keyword, safe='')
+    url = f"{DOMEMEDB_URL}/index/item/supplyList.php?sf=subject&enc=utf8&fromOversea=0&mode=search&sw={encoded_keyword}"
+    if min_price and SEARCH_MIN_PRICE_PARAM:
+        url += f"&{SEARCH_MIN_PRICE_PARAM}={int(min_price)}"
+    if fast_delivery and SEARCH_FAST_DELIVERY_PARAM:
+        url += f"&{SEARCH_FAST_DELIVERY_PARAM}=1"
+    if min_grade and SEARCH_MIN_GRADE_PARAM:
+        url += f"&{SEARCH_MIN_GRADE_PARAM}={int(min_grade)}"
+    if sort and SEARCH_SORT_PARAM:
+        url += f"&{SEARCH_SORT_PARAM}={sort}"
+    if page_size:
+        url += f"&{SEARCH_PAGE_SIZE_PARAM}={page_size}"
+    if page:
+        url += f"&{SEARCH_PAGE_PARAM}={page}"
+    return url
 
 
 def access_with_requests():
     """requests 라이브러리를 사용한 간단한 접속"""
-    url = "https://domemedb.domeggook.com/index/?mainChannel=aihome"
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    }
+    url = f"{DOMEMEDB_URL}/index/?mainChannel=aihome"
     
     try:
         print(f"requests로 {url} 접속 시도 중...")
-        response = requests.get(url, headers=headers, timeout=10)
+        response = HTTP_CACHE.get(create_http_session(), url, timeout=10)
         response.raise_for_status()
         
         print(f"✓ 접속 성공! 상태 코드: {response.status_code}")
         print(f"✓ 페이지 제목: {BeautifulSoup(response.text, 'html.parser').title.string if response.text else 'N/A'}")
         
         return response
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, OfflineCacheMiss) as e:
         print(f"✗ 접속 실패: {e}")
         return None
 
 
-def get_chrome_driver(headless=True):
-    """Chrome WebDriver 설정 및 반환"""
-    chrome_options = Options()
-    if headless:
-        chrome_options.add_argument('--headless')  # 헤드리스 모드 (브라우저 창 숨김)
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-    
-    return webdriver.Chrome(options=chrome_options)
-
-
-def login_to_domeggook(driver, username=None, password=None):
+def create_http_session(cookies=None, pool_size=10):
     """
-    도매꾹 사이트에 로그인
+    커넥션 풀을 사용하는 requests.Session 생성 (모든 요청은 RATE_LIMITER 속도 제한을 거침)
     
     Args:
-        driver: Selenium WebDriver 객체
-        username: 로그인 아이디 (None이면 사용자 입력 요청, 환경변수 DOMEID에서도 읽음)
-        password: 비밀번호 (None이면 사용자 입력 요청, 환경변수 DOMPWD에서도 읽음)
+        cookies: 세션에 넣을 쿠키 리스트 (Selenium get_cookies() 형식, None이면 쿠키 없음)
+        pool_size: 호스트별로 유지할 최대 연결 수
     
     Returns:
-        로그인 성공 여부 (bool)
+        requests.Session 객체
     """
-    import os
+    session = requests.Session()
+    adapter = RateLimitedAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
     
-    try:
-        # 환경변수에서 로그인 정보 읽기 (선택사항)
-        if not username:
-            username = os.getenv('DOMEID')
-        if not password:
-            password = os.getenv('DOMPWD')
-        
-        # 로그인 페이지로 이동 (올바른 URL 사용)
-        # back 파라미터는 로그인 후 돌아갈 페이지를 지정 (base64 인코딩된 URL)
-        back_url = "aHR0cHM6Ly9kb21lbWVkYi5kb21lZ2dvb2suY29tL2luZGV4"  # domemedb.domeggook.com/index를 base64 인코딩
-        login_url = f"https://domeggook.com/ssl/member/mem_loginForm.php?back={back_url}"
-        print(f"\n로그인 페이지로 이동: {login_url}")
-        driver.get(login_url)
-        
-        # 페이지 로딩 대기
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
+    for cookie in cookies or []:
+        session.cookies.set(
+            cookie['name'],
+            cookie['value'],
+            domain=cookie.get('domain') or '',  # None이면 requests가 AttributeError를 냄
+            path=cookie.get('path', '/'),
         )
-        time.sleep(1)
-        
-        # 로그인 정보 입력 받기
-        if not username:
-            username = input("아이디를 입력하세요: ").strip()
-        if not password:
-            import getpass
-            password = getpass.getpass("비밀번호를 입력하세요: ").strip()
-        
-        if not username or not password:
-            print("✗ 아이디와 비밀번호가 필요합니다.")
-            return False
-        
-        # 로그인 폼 요소 찾기
-        # 다양한 선택자 시도 (도매꾹 통합 로그인 페이지)
-        user_id_selectors = [
-            "input[name='user_id']",
-            "input[name='id']",
-            "input[name='username']",
-            "input[name='mem_id']",
-            "input[type='text'][id*='id']",
-            "input[type='text'][id*='user']",
-            "input[type='text'][id*='mem']",
-            "#user_id",
-            "#id",
-            "#mem_id",
-            "input[placeholder*='아이디']",
-            "input[placeholder*='ID']",
-        ]
-        
-        password_selectors = [
-            "input[name='password']",
-            "input[name='pwd']",
-            "input[name='mem_pwd']",
-            "input[type='password']",
-            "#password",
-            "#pwd",
-            "#mem_pwd",
-            "input[placeholder*='비밀번호']",
-            "input[placeholder*='Password']",
-        ]
-        
-        user_id_input = None
-        password_input = None
-        
-        # 아이디 입력 필드 찾기
-        for selector in user_id_selectors:
-            try:
-                user_id_input = driver.find_element(By.CSS_SELECTOR, selector)
-                print(f"✓ 아이디 입력 필드 찾음: {selector}")
-                break
-            except NoSuchElementException:
-                continue
+    
+    return session
+
+
+class RateLimiter:
+    """
+    사이트 요청 속도 제한 (토큰 버킷, 스레드와 프로세스가 공유)
+    
+    버킷 상태(남은 토큰, 갱신 시각)를 작은 파일에 두고 파일 잠금(POSIX fcntl.flock,
+    Windows msvcrt.locking) 안에서만 읽고 쓰므로, DriverPool의 스레드와 따로 실행한
+    여러 main.py 프로세스가 합쳐서 rate(초당 요청 수)를 넘지 않는다. burst개까지는 기다리지 않고 보낸다.
+    토큰이 없으면 자리를 예약하고(토큰이 음수가 됨) 잠금 밖에서 자기 차례까지만 기다리므로
+    대기 중인 요청끼리 잠금을 두고 경쟁하지 않고 제한 속도에 꽉 맞춰 보낸다.
+    
+    모든 탐색이 이 버킷을 거친다:
+        - driver.get: get_chrome_driver()에서 attach()로 감쌈
+        - requests: create_http_session()의 RateLimitedAdapter (HttpCache 미스/재검증, 로그인 포함)
+        - Playwright page.goto: acquire_async()
+    
+    사용 예:
+        RATE_LIMITER.configure(rate=1.0, burst=3)
+        RATE_LIMITER.acquire(url)  # 필요한 만큼 기다린 뒤 반환
+    """
+    
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST, path=RATE_LIMIT_STATE_PATH):
+        self.rate = rate
+        self.burst = burst
+        self.path = path
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'waited': 0, 'wait_seconds': 0.0}
+    
+    @property
+    def enabled(self):
+        return bool(self.rate)
+    
+    def configure(self, rate=None, burst=None):
+        """속도 제한 변경 (rate=0이면 제한하지 않음)"""
+        if rate is not None:
+            self.rate = rate
+        if burst is not None:
+            self.burst = max(1, burst)
+    
+    @contextmanager
+    def _locked_state(self):
+        """프로세스 간 배타 잠금을 잡고 상태 파일 객체를 반환"""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, 'r+b') as f:
+            if os.name == 'nt':
+                import msvcrt
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue  # LK_LOCK은 약 10초 동안 못 잡으면 실패하므로 다시 시도
+                try:
+                    yield f
+                finally:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield f
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    
+    def reserve(self):
+        """
+        토큰 하나를 예약하고 보내기 전에 기다려야 할 시간(초) 반환
         
-        # 비밀번호 입력 필드 찾기
-        for selector in password_selectors:
+        프로세스 간 공유이므로 시각은 time.time()을 쓴다.
+        """
+        with self.lock, self._locked_state() as f:
+            now = time.time()
             try:
-                password_input = driver.find_element(By.CSS_SELECTOR, selector)
-                print(f"✓ 비밀번호 입력 필드 찾음: {selector}")
-                break
-            except NoSuchElementException:
-                continue
+                tokens, updated = (float(value) for value in f.read().split())
+            except ValueError:
+                tokens, updated = float(self.burst), now  # 처음 사용하거나 깨진 상태 파일
+            tokens = min(float(self.burst), tokens + max(0.0, now - updated) * self.rate) - 1
+            f.seek(0)
+            f.truncate()
+            f.write(f"{tokens:.6f} {now:.6f}".encode('ascii'))
+            f.flush()
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        with self.lock:
+            self.stats['requests'] += 1
+            if wait > 0:
+                self.stats['waited'] += 1
+                self.stats['wait_seconds'] += wait
+        return wait
+    
+    @staticmethod
+    def applies_to(url):
+        """속도 제한 대상인지 (http(s) 요청만, about:blank/data: 등은 제외)"""
+        return url is None or str(url).startswith(('http://', 'https://'))
+    
+    def acquire(self, url=None):
+        """필요하면 기다렸다가 반환 (기다린 시간(초) 반환)"""
+        if not self.enabled or not self.applies_to(url):
+            return 0.0
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self, url=None):
+        """acquire()의 asyncio 버전 (이벤트 루프를 막지 않고 기다림)"""
+        if not self.enabled or not self.applies_to(url):
+            return 0.0
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+    
+    def attach(self, driver):
+        """driver.get을 감싸 페이지 이동마다 acquire() 호출"""
+        if getattr(driver, 'rate_limiter', None) is self:
+            return driver
+        original_get = driver.get
+        limiter = self
         
-        if not user_id_input or not password_input:
-            print("✗ 로그인 폼을 찾을 수 없습니다.")
-            # 페이지 소스 일부 출력 (디버깅용)
-            try:
-                page_source = driver.page_source[:2000]
-                print(f"페이지 소스 샘플:\n{page_source}")
-            except:
-                pass
-            return False
+        def get(url):
+            limiter.acquire(url)
+            return original_get(url)
         
-        # 로그인 정보 입력
-        user_id_input.clear()
-        user_id_input.send_keys(username)
-        time.sleep(0.5)
+        driver.get = get
+        driver.rate_limiter = self
+        return driver
+    
+    def report(self):
+        """속도 제한으로 기다린 요청 수와 시간 출력"""
+        if not self.stats['requests']:
+            return
+        print(f"\n속도 제한 ({self.rate:g}회/초, 버스트 {self.burst}): 요청 {self.stats['requests']}회 중 "
+              f"{self.stats['waited']}회 대기, 합계 {self.stats['wait_seconds']:.1f}초")
+
+
+RATE_LIMITER = RateLimiter()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """요청을 보내기 전에 RATE_LIMITER를 거치는 requests 어댑터"""
+    
+    def send(self, request, **kwargs):
+        RATE_LIMITER.acquire(request.url)
+        return super().send(request, **kwargs)
+
+
+class OfflineCacheMiss(Exception):
+    """오프라인 모드에서 요청한 URL이 캐시에 없는 경우"""
+
+
+class HttpCache:
+    """
+    브라우저를 거치지 않는 GET 요청의 디스크(SQLite) 응답 캐시
+    
+    키는 정규화한 URL(쿼리 파라미터 정렬, fragment 제거)과 로그인 사용자이다.
+    URL 종류별 유효 시간(HTTP_CACHE_TTLS) 안의 응답은 요청 없이 돌려주고, 지난 응답은
+    ETag/Last-Modified가 있으면 조건부 요청(304 Not Modified)으로 재검증한다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 응답부터 지운다.
+    offline=True면 네트워크를 쓰지 않고 캐시에 있는 응답만 (만료되었어도) 돌려준다.
+    
+    사용 예:
+        response = HTTP_CACHE.get(session, url, timeout=10)
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            final_url TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            body BLOB NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            stored_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+    """
+    
+    def __init__(self, path=HTTP_CACHE_PATH, max_bytes=HTTP_CACHE_MAX_BYTES, offline=False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        self.conn = None  # 처음 사용할 때 연결 (import만 해도 파일이 생기지 않도록)
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'offline_hits': 0, 'offline_misses': 0}
+    
+    def _connect(self):
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(self.SCHEMA)
+        return self.conn
+    
+    @staticmethod
+    def normalize_url(url):
+        """스킴/호스트 소문자, 쿼리 파라미터 정렬, fragment 제거"""
+        parsed = urlparse(url)
+        query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+        return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path or '/', parsed.params, query, ''))
+    
+    @staticmethod
+    def ttl_for(url):
+        """URL 종류별 캐시 유효 시간 (초)"""
+        for pattern, ttl in HTTP_CACHE_TTLS:
+            if pattern in url:
+                return ttl
+        return HTTP_CACHE_DEFAULT_TTL
+    
+    @staticmethod
+    def user_for(session):
+        """
+        캐시 키에 넣을 로그인 사용자 (get_logged_in_http_session이 session.cache_user에 기록)
         
-        password_input.clear()
-        password_input.send_keys(password)
-        time.sleep(0.5)
+        아이디를 알 수 없으면 쿠키 값의 해시를 써서 다른 계정의 응답을 공유하지 않는다.
+        """
+        user = getattr(session, 'cache_user', None)
+        if user:
+            return user
+        if not len(session.cookies):
+            return 'anonymous'
+        values = sorted(f"{cookie.domain}|{cookie.name}={cookie.value}" for cookie in session.cookies)
+        return 'cookies:' + hashlib.sha256("\n".join(values).encode('utf-8')).hexdigest()[:16]
+    
+    def _key(self, url, user):
+        return hashlib.sha256(f"{user}|{self.normalize_url(url)}".encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _build_response(row, url):
+        """캐시에 저장된 행으로 requests.Response 복원"""
+        response = requests.Response()
+        response.status_code = row['status']
+        response._content = row['body']
+        response.headers = CaseInsensitiveDict(json.loads(row['headers']))
+        response.url = row['final_url']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.request = requests.Request('GET', url).prepare()
+        response.from_cache = True
+        return response
+    
+    def get(self, session, url, timeout=10, **kwargs):
+        """
+        캐시를 거쳐 GET 요청
         
-        # 로그인 버튼 찾기 및 클릭
-        login_button_selectors = [
-            "button[type='submit']",
-            "input[type='submit']",
-            "button.btn-login",
-            "button[class*='login']",
-            ".login-btn",
-            "#loginBtn",
-            "button:contains('로그인')",
-            "a[href*='login']",
-            "input[value*='로그인']",
-            "button:contains('로그인')",
-            "[onclick*='login']",
-        ]
+        Args:
+            session: requests.Session 객체
+            url: 요청할 URL
+            timeout: 요청 타임아웃 (초)
+            **kwargs: session.get()에 넘길 나머지 인자 (headers 등)
         
-        login_button = None
-        for selector in login_button_selectors:
-            try:
-                login_button = driver.find_element(By.CSS_SELECTOR, selector)
-                print(f"✓ 로그인 버튼 찾음: {selector}")
-                break
-            except NoSuchElementException:
-                continue
+        Returns:
+            requests.Response 객체 (캐시에서 온 응답은 from_cache=True)
         
-        if not login_button:
-            # Enter 키로 로그인 시도
-            password_input.send_keys(Keys.RETURN)
-            print("✓ Enter 키로 로그인 시도")
-        else:
-            login_button.click()
-            print("✓ 로그인 버튼 클릭")
+        Raises:
+            OfflineCacheMiss: 오프라인 모드인데 캐시에 없는 경우
+        """
+        key = self._key(url, self.user_for(session))
+        now = time.time()
         
-        # 로그인 완료 대기
-        time.sleep(3)
+        with self.lock:
+            conn = self._connect()
+            row = conn.execute("SELECT * FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                fresh = now - row['stored_at'] < self.ttl_for(url)
+                if fresh or self.offline:
+                    with conn:
+                        conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                    self.stats['hits' if fresh else 'offline_hits'] += 1
+                    return self._build_response(row, url)
         
-        # 로그인 성공 확인 (URL 변경 또는 특정 요소 확인)
-        current_url = driver.current_url
+        if self.offline:
+            with self.lock:
+                self.stats['offline_misses'] += 1
+            raise OfflineCacheMiss(f"오프라인 모드: 캐시에 없는 URL입니다: {url}")
         
-        # 로그인 성공 조건:
-        # 1. login 관련 URL이 아니거나
-        # 2. domemedb.domeggook.com으로 리다이렉트되었거나
-        # 3. 로그아웃 버튼이나 마이페이지 링크가 있는 경우
-        if "login" not in current_url.lower() or "domemedb" in current_url.lower() or "mainChannel" in current_url.lower():
-            # 추가 확인: 로그아웃 버튼이나 마이페이지 링크 확인
-            try:
-                logout_elements = driver.find_elements(By.CSS_SELECTOR, "a[href*='logout'], a[href*='mypage'], [class*='logout'], [class*='mypage']")
-                if logout_elements:
-                    print("✓ 로그인 성공! (로그아웃/마이페이지 링크 확인)")
-                    return True
-            except:
-                pass
-            
-            # URL 기반 확인
-            if "domemedb" in current_url.lower() or "mainChannel" in current_url.lower():
-                print("✓ 로그인 성공! (URL 확인)")
-                return True
-            elif "login" not in current_url.lower():
-                print("✓ 로그인 성공! (로그인 페이지에서 이동)")
-                return True
+        # 만료된 응답이 있으면 조건부 요청으로 재검증
+        headers = dict(kwargs.pop('headers', None) or {})
+        if row is not None:
+            if row['etag']:
+                headers['If-None-Match'] = row['etag']
+            if row['last_modified']:
+                headers['If-Modified-Since'] = row['last_modified']
+        response = session.get(url, headers=headers, timeout=timeout, **kwargs)
         
-        # 로그인 실패 메시지 확인
-        try:
-            error_selectors = [
-                ".error", ".alert", "[class*='error']", "[class*='alert']",
-                "[class*='fail']", "[class*='warning']", ".msg-error"
-            ]
-            for selector in error_selectors:
-                try:
-                    error_msg = driver.find_element(By.CSS_SELECTOR, selector)
-                    error_text = error_msg.text.strip()
-                    if error_text:
-                        print(f"✗ 로그인 실패: {error_text}")
-                        return False
-                except:
-                    continue
-        except:
-            pass
+        if response.status_code == 304 and row is not None:
+            with self.lock, self.conn:
+                self.conn.execute(
+                    "UPDATE responses SET stored_at = ?, last_access = ?, etag = COALESCE(?, etag) WHERE key = ?",
+                    (now, now, response.headers.get('ETag'), key),
+                )
+                self.stats['revalidated'] += 1
+            return self._build_response(row, url)
         
-        print("✗ 로그인 실패: 로그인 상태를 확인할 수 없습니다.")
-        print(f"  현재 URL: {current_url}")
-        return False
-            
-    except Exception as e:
-        print(f"✗ 로그인 중 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        with self.lock:
+            self.stats['misses'] += 1
+        # 로그인 페이지로 이동된 응답(세션 만료)이나 오류 응답은 저장하지 않음
+        redirected_to_login = "login" in response.url.lower() and "login" not in url.lower()
+        if response.status_code == 200 and not redirected_to_login:
+            self.store(url, key, response)
+        return response
+    
+    def store(self, url, key, response):
+        """응답 저장 후 크기 제한을 넘으면 오래 사용하지 않은 응답부터 삭제"""
+        body = response.content
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO responses
+                    (key, url, final_url, status, headers, body, etag, last_modified, stored_at, last_access, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                key, self.normalize_url(url), response.url, response.status_code,
+                json.dumps(dict(response.headers)), body,
+                response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, len(body),
+            ))
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                # 한 번 정리할 때 여유를 두어 (90%까지) 매 요청마다 삭제하지 않도록 함
+                target = self.max_bytes * 0.9
+                for old_key, size in self.conn.execute(
+                    "SELECT key, size FROM responses ORDER BY last_access"
+                ).fetchall():
+                    if total <= target:
+                        break
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                    total -= size
+    
+    def invalidate(self, session, url):
+        """저장된 응답 삭제 (내용이 비정상인 응답을 다시 요청하기 전에 호출)"""
+        key = self._key(url, self.user_for(session))
+        with self.lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+    
+    def print_stats(self):
+        """캐시 적중 통계 출력"""
+        stats = self.stats
+        if not any(stats.values()):
+            return
+        print(f"\nHTTP 캐시: 적중 {stats['hits']}회, 재검증(304) {stats['revalidated']}회, 요청 {stats['misses']}회"
+              + (f", 오프라인 적중 {stats['offline_hits']}회, 오프라인 없음 {stats['offline_misses']}회" if self.offline else ""))
+    
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
 
 
-def access_with_selenium(headless=True):
-    """Selenium을 사용한 브라우저 자동화 접속"""
-    url = "https://domemedb.domeggook.com/index/?mainChannel=aihome"
-    
-    driver = None
-    try:
-        print(f"Selenium으로 {url} 접속 시도 중...")
-        driver = get_chrome_driver(headless=headless)
-        driver.get(url)
-        
-        # 페이지 로딩 대기
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        
-        print(f"✓ 접속 성공!")
-        print(f"✓ 페이지 제목: {driver.title}")
-        print(f"✓ 현재 URL: {driver.current_url}")
-        
-        return driver
-    except Exception as e:
-        print(f"✗ 접속 실패: {e}")
-        print("ChromeDriver가 설치되어 있는지 확인하세요.")
-        if driver:
-            driver.quit()
-        return None
+HTTP_CACHE = HttpCache()
 
 
-def add_products_to_mybox(driver, product_ids=None, select_all=False):
+def copy_driver_cookies(driver, session):
     """
-    검색 결과에서 상품을 선택하고 마이박스에 담기
+    로그인된 WebDriver의 쿠키를 requests.Session으로 복사
     
     Args:
-        driver: Selenium WebDriver 객체
-        product_ids: 선택할 상품번호 리스트 (None이면 모든 상품 선택)
-        select_all: True면 모든 상품 선택
+        driver: 로그인된 Selenium WebDriver 객체
+        session: 쿠키를 받을 requests.Session 객체
     
     Returns:
-        성공 여부 (bool)
+        복사한 쿠키 개수 (int)
     """
-    try:
-        print("\n마이박스에 상품 추가 중...")
-        
-        if select_all:
+    cookies = collect_login_cookies(driver)
+    for cookie in cookies:
+        session.cookies.set(
+            cookie['name'],
+            cookie['value'],
+            domain=cookie.get('domain') or '',  # None이면 requests가 AttributeError를 냄
+            path=cookie.get('path', '/'),
+        )
+    return len(cookies)
+
+
+def collect_login_cookies(driver):
+    """
+    WebDriver에서 도매꾹 관련 도메인(COOKIE_DOMAIN: domeggook.com, domemedb.domeggook.com 등)의 쿠키 수집
+    
+    Chrome DevTools(Network.getAllCookies)로 현재 페이지와 관계없이 모든 도메인의 쿠키를 읽고,
+    사용할 수 없으면 현재 페이지의 쿠키만 읽는다.
+    
+    Args:
+        driver: 로그인된 Selenium WebDriver 객체
+    
+    Returns:
+        쿠키 리스트 (Selenium get_cookies() 형식)
+    """
+    try:
+        cdp_cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+        cookies = []
+        for cookie in cdp_cookies:
+            converted = {
+                'name': cookie['name'],
+                'value': cookie['value'],
+                'domain': cookie.get('domain'),
+                'path': cookie.get('path', '/'),
+                'secure': cookie.get('secure', False),
+                'httpOnly': cookie.get('httpOnly', False),
+            }
+            if not cookie.get('session') and cookie.get('expires', -1) > 0:
+                converted['expiry'] = int(cookie['expires'])
+            cookies.append(converted)
+    except Exception:
+        cookies = driver.get_cookies()
+    
+    return [c for c in cookies if (c.get('domain') or '').lstrip('.').endswith(COOKIE_DOMAIN)]
+
+
+def save_login_session(cookies, path=SESSION_STORE_PATH, ttl=SESSION_TTL_SECONDS, user=None):
+    """
+    로그인 쿠키를 만료 시각과 함께 파일에 저장
+    
+    Args:
+        cookies: 쿠키 리스트 (collect_login_cookies 결과)
+        path: 저장할 파일 경로
+        ttl: 세션 유효 시간 (초)
+        user: 실제로 로그인한 아이디 (HttpCache 키용, load_login_user로 읽음)
+    """
+    now = time.time()
+    data = {
+        'saved_at': now,
+        'expires_at': now + ttl,
+        'user': user,
+        'cookies': cookies,
+    }
+    # 다른 실행과 동시에 읽더라도 깨진 파일이 보이지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    if os.name == 'posix':
+        os.chmod(tmp_path, 0o600)  # 쿠키에는 인증 정보가 있으므로 본인만 읽을 수 있게 함
+    os.replace(tmp_path, path)
+
+
+def load_login_session(path=SESSION_STORE_PATH):
+    """
+    저장된 로그인 쿠키 읽기
+    
+    Args:
+        path: 세션 파일 경로
+    
+    Returns:
+        쿠키 리스트, 파일이 없거나 만료되었으면 None
+    """
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠ 저장된 로그인 세션을 읽을 수 없습니다: {e}")
+        return None
+    
+    if data.get('expires_at', 0) <= time.time():
+        print("⚠ 저장된 로그인 세션이 만료되었습니다.")
+        return None
+    
+    return data.get('cookies') or None
+
+
+def load_login_user(path=SESSION_STORE_PATH):
+    """
+    저장된 로그인 세션의 아이디 읽기 (세션이 만료되어도 반환, 오프라인 캐시 키용)
+    
+    Returns:
+        아이디, 파일이 없거나 아이디가 기록되지 않았으면 None
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('user') or None
+    except (OSError, ValueError):
+        return None
+
+
+def clear_login_session(path=SESSION_STORE_PATH):
+    """저장된 로그인 세션 파일 삭제"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def is_session_logged_in(session, timeout=10):
+    """
+    requests.Session의 쿠키가 아직 로그인 상태인지 가볍게 확인
+    
+    메인 페이지 HTML 한 번만 받아 로그아웃/마이페이지 링크가 있는지 확인한다.
+    
+    Args:
+        session: 쿠키가 담긴 requests.Session 객체
+        timeout: 요청 타임아웃 (초)
+    
+    Returns:
+        로그인 상태 여부 (bool)
+    """
+    try:
+        response = session.get(f"{DOMEMEDB_URL}/index/", timeout=timeout)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"⚠ 로그인 상태 확인 실패: {e}")
+        return False
+    
+    if "mem_loginForm" in response.url:
+        return False
+    page = response.text.lower()
+    return 'logout' in page or 'mypage' in page
+
+
+def apply_cookies_to_driver(driver, cookies):
+    """
+    저장된 쿠키를 WebDriver에 주입
+    
+    Chrome DevTools(Network.setCookie)를 사용하면 페이지 이동 없이 모든 도메인에 쿠키를 넣을 수 있고,
+    사용할 수 없으면 도메인별로 한 번씩 이동한 뒤 add_cookie로 넣는다.
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        cookies: 쿠키 리스트 (collect_login_cookies 결과)
+    """
+    try:
+        for cookie in cookies:
+            params = {
+                'name': cookie['name'],
+                'value': cookie['value'],
+                'domain': cookie.get('domain'),
+                'path': cookie.get('path', '/'),
+                'secure': cookie.get('secure', False),
+                'httpOnly': cookie.get('httpOnly', False),
+            }
+            if cookie.get('expiry'):
+                params['expires'] = cookie['expiry']
+            driver.execute_cdp_cmd('Network.setCookie', params)
+        return
+    except Exception:
+        pass
+    
+    by_domain = {}
+    for cookie in cookies:
+        by_domain.setdefault((cookie.get('domain') or '').lstrip('.'), []).append(cookie)
+    
+    for domain, domain_cookies in by_domain.items():
+        driver.get(f"{urlparse(DOMEMEDB_URL).scheme}://{domain}/robots.txt")
+        for cookie in domain_cookies:
+            try:
+                driver.add_cookie({k: v for k, v in cookie.items() if k in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'expiry')})
+            except Exception as e:
+                print(f"  쿠키 주입 실패 ({cookie.get('name')}): {e}")
+
+
+def ensure_login(driver, username=None, password=None, session_path=SESSION_STORE_PATH):
+    """
+    저장된 로그인 세션을 재사용하고, 없거나 만료된 경우에만 로그인 폼으로 로그인
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        username: 로그인 아이디 (login_to_domeggook 참고)
+        password: 비밀번호 (login_to_domeggook 참고)
+        session_path: 세션 파일 경로 (None이면 세션 캐시를 사용하지 않음)
+    
+    Returns:
+        로그인 성공 여부 (bool)
+    """
+    with TRACER.span('login') as span:
+        if session_path:
+            cookies = load_login_session(session_path)
+            if cookies:
+                if is_session_logged_in(create_http_session(cookies)):
+                    apply_cookies_to_driver(driver, cookies)
+                    driver.login_user = load_login_user(session_path)
+                    print(f"✓ 저장된 로그인 세션 사용 ({len(cookies)}개 쿠키)")
+                    span.attrs['method'] = 'session'
+                    return True
+                print("⚠ 저장된 로그인 세션이 더 이상 유효하지 않아 다시 로그인합니다.")
+                clear_login_session(session_path)
+                span.retry()
+        
+        span.attrs['method'] = 'form'
+        if not login_to_domeggook(driver, username=username, password=password):
+            span.outcome = 'fail'
+            return False
+        
+        if session_path:
+            try:
+                cookies = collect_login_cookies(driver)
+                save_login_session(cookies, session_path, user=getattr(driver, 'login_user', None))
+                print(f"✓ 로그인 세션 저장: {session_path} ({len(cookies)}개 쿠키)")
+            except Exception as e:
+                print(f"⚠ 로그인 세션 저장 실패: {e}")
+        
+        return True
+
+
+def get_logged_in_http_session(username=None, password=None, session_path=SESSION_STORE_PATH, headless=True):
+    """
+    로그인된 requests.Session 반환 (저장된 세션이 유효하면 브라우저를 띄우지 않음)
+    
+    Args:
+        username: 로그인 아이디 (login_to_domeggook 참고)
+        password: 비밀번호 (login_to_domeggook 참고)
+        session_path: 세션 파일 경로
+        headless: 다시 로그인해야 할 때 브라우저를 헤드리스로 실행할지 여부
+    
+    Returns:
+        requests.Session 객체, 로그인 실패 시 None
+    """
+    # HttpCache는 사용자별로 응답을 나눠 저장하므로 실제로 로그인한 아이디를 세션에 기록
+    # (알 수 없으면 HttpCache.user_for가 쿠키 값의 해시를 사용)
+    cache_user = username or os.getenv('DOMEID')
+    
+    cookies = load_login_session(session_path)
+    if cookies:
+        session = create_http_session(cookies)
+        session.cache_user = load_login_user(session_path) or cache_user
+        if is_session_logged_in(session):
+            print(f"✓ 저장된 로그인 세션 사용 ({len(cookies)}개 쿠키)")
+            return session
+        clear_login_session(session_path)
+    
+    with TRACER.span('driver_start'):
+        driver = get_chrome_driver(headless=headless)
+    try:
+        if not ensure_login(driver, username=username, password=password, session_path=session_path):
+            return None
+        session = create_http_session()
+        session.cache_user = getattr(driver, 'login_user', None) or cache_user
+        copy_driver_cookies(driver, session)
+        return session
+    finally:
+        driver.quit()
+
+
+# 빠른 프로필에서 DevTools(Network.setBlockedURLs)로 차단할 리소스 URL 패턴
+# 검색/마이박스 작업에는 이미지·폰트·동영상이 필요 없다 (이미지 URL은 src 속성에서 그대로 읽힘)
+FAST_PROFILE_BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+]
+
+# 빠른 프로필에서 추가하는 Chrome 옵션 (확장 프로그램과 백그라운드 작업 끄기)
+FAST_PROFILE_ARGUMENTS = [
+    '--disable-extensions',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-notifications',
+    '--metrics-recording-only',
+    '--no-first-run',
+    '--mute-audio',
+    '--blink-settings=imagesEnabled=false',
+]
+
+
+def get_chrome_driver(headless=True, fast=False, log_network=False):
+    """
+    Chrome WebDriver 설정 및 반환
+    
+    Args:
+        headless: 헤드리스 모드 사용 여부
+        fast: True면 빠른 프로필 사용 (이미지/폰트/동영상 차단, eager 페이지 로드 전략,
+              확장 프로그램과 백그라운드 작업 비활성화)
+        log_network: True면 DevTools 네트워크 이벤트를 performance 로그로 수집
+                     (driver.get_log('performance'), 전송량 측정용)
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument('--headless')  # 헤드리스 모드 (브라우저 창 숨김)
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+    
+    if fast:
+        for argument in FAST_PROFILE_ARGUMENTS:
+            chrome_options.add_argument(argument)
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        })
+        # DOMContentLoaded까지만 기다림 (이후 필요한 요소는 wait_until 조건으로 대기)
+        chrome_options.page_load_strategy = 'eager'
+    
+    if log_network:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    
+    driver = webdriver.Chrome(options=chrome_options)
+    
+    if fast:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': FAST_PROFILE_BLOCKED_URLS})
+        except Exception as e:
+            print(f"⚠ 리소스 차단 설정 실패 (이미지 설정만 적용): {e}")
+    
+    if DRIVER_COMMANDS.enabled:
+        DRIVER_COMMANDS.attach(driver)
+    RATE_LIMITER.attach(driver)
+    return driver
+
+
+# 대기 구간별 실제 소요 시간 기록 {label: [(소요 시간(초), 조건 충족 여부), ...]}
+WAIT_STATS = {}
+WAIT_STATS_LOCK = threading.Lock()
+
+
+def record_wait(label, elapsed, satisfied):
+    """대기 구간 하나의 소요 시간을 WAIT_STATS에 기록"""
+    with WAIT_STATS_LOCK:
+        WAIT_STATS.setdefault(label, []).append((elapsed, satisfied))
+
+
+def wait_until(driver, condition, timeout=10, label="wait", poll_frequency=0.1):
+    """
+    condition(driver)가 참 값을 반환할 때까지 대기 (고정 time.sleep 대신 사용)
+    
+    조건이 충족되었는지와 관계없이 실제로 기다린 시간을 label별로 기록한다.
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        condition: driver를 받아 조건 충족 시 참 값을 반환하는 함수 (expected_conditions 사용 가능)
+        timeout: 최대 대기 시간 (초)
+        label: 대기 구간 이름 (WAIT_STATS 키)
+        poll_frequency: 조건 확인 간격 (초)
+    
+    Returns:
+        condition이 반환한 값, 시간 초과 시 None
+    """
+    start = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+        satisfied = True
+    except TimeoutException:
+        result = None
+        satisfied = False
+    record_wait(label, time.perf_counter() - start, satisfied)
+    return result
+
+
+def get_wait_stats():
+    """
+    대기 구간별 통계 반환
+    
+    Returns:
+        {label: {'count', 'total', 'avg', 'max', 'timeouts'}} 딕셔너리
+    """
+    with WAIT_STATS_LOCK:
+        snapshot = {label: list(entries) for label, entries in WAIT_STATS.items()}
+    
+    stats = {}
+    for label, entries in snapshot.items():
+        durations = [elapsed for elapsed, _ in entries]
+        stats[label] = {
+            'count': len(entries),
+            'total': sum(durations),
+            'avg': sum(durations) / len(durations),
+            'max': max(durations),
+            'timeouts': sum(1 for _, satisfied in entries if not satisfied),
+        }
+    return stats
+
+
+def print_wait_stats():
+    """대기 구간별 소요 시간 요약 출력"""
+    stats = get_wait_stats()
+    if not stats:
+        return
+    print("\n대기 시간 통계:")
+    print(f"  {'구간':<24}{'횟수':>6}{'합계(초)':>10}{'평균(초)':>10}{'최대(초)':>10}{'시간초과':>8}")
+    for label, item in sorted(stats.items(), key=lambda kv: kv[1]['total'], reverse=True):
+        print(f"  {label:<24}{item['count']:>6}{item['total']:>10.2f}{item['avg']:>10.2f}{item['max']:>10.2f}{item['timeouts']:>8}")
+
+
+class Span:
+    """
+    처리 단계 하나의 실행 기록 (SpanTracer.span/sequence가 만들고 끝날 때 파일에 기록)
+    
+    구간 안에서 outcome('ok', 'fail', 'timeout', 'error')을 바꾸거나 retry()로 재시도 횟수를 늘릴 수 있다.
+    """
+    
+    def __init__(self, stage, keyword=None, **attrs):
+        self.stage = stage
+        self.keyword = keyword
+        self.attrs = attrs
+        self.outcome = 'ok'
+        self.retries = 0
+        self.error = None
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        # WebDriver 명령 계측 중이면 시작 시점의 (현재 스레드) 명령 수
+        self.commands_start = DRIVER_COMMANDS.thread_total() if DRIVER_COMMANDS.enabled else None
+    
+    def retry(self):
+        self.retries += 1
+    
+    def to_record(self):
+        record = {
+            'ts': datetime.fromtimestamp(self.started_at).isoformat(timespec='milliseconds'),
+            'stage': self.stage,
+            'keyword': self.keyword,
+            'duration': round(time.perf_counter() - self._start, 4),
+            'outcome': self.outcome,
+            'retries': self.retries,
+            'thread': threading.current_thread().name,
+        }
+        if self.error:
+            record['error'] = self.error
+        record.update(self.attrs)
+        return record
+
+
+class StageSequence:
+    """
+    한 함수 안에서 차례로 이어지는 단계들 (enter로 다음 단계를 시작하면 이전 단계는 'ok'로 끝남)
+    
+    사용 예:
+        stages = TRACER.sequence()
+        try:
+            stages.enter('mybox_select')
+            ...
+            stages.enter('mybox_click')
+            ...
+            stages.finish('ok')
+            return True
+        finally:
+            stages.finish('fail')  # 중간에 return/예외로 빠져나간 단계
+    """
+    
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.current = None
+    
+    def enter(self, stage, **attrs):
+        self.finish('ok')
+        self.current = self.tracer.start(stage, **attrs)
+        return self.current
+    
+    def retry(self):
+        if self.current is not None:
+            self.current.retry()
+    
+    def finish(self, outcome='ok'):
+        if self.current is None:
+            return
+        span, self.current = self.current, None
+        if span.outcome == 'ok':
+            span.outcome = outcome
+        self.tracer.end(span)
+
+
+class SpanTracer:
+    """
+    처리 단계별 소요 시간을 JSON Lines 파일에 한 줄씩 기록
+    
+    한 줄은 {'ts', 'stage', 'keyword', 'duration', 'outcome', 'retries', 'thread', ...} 형식이다.
+    검색어는 스레드별로 set_keyword()로 지정한 값이 들어간다 (DriverPool의 스레드마다 다름).
+    path가 None이면 기록하지 않는다 (구간 측정 비용만 남음).
+    요약은 trace_summary.py로 출력한다.
+    
+    사용 예:
+        with TRACER.span('parse') as span:
+            results = parse(...)
+            if not results:
+                span.outcome = 'fail'
+    """
+    
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self._file = None
+        self._local = threading.local()
+    
+    def open(self, path=TRACE_PATH):
+        """기록 시작 (기존 파일에 이어서 기록)"""
+        self.close()
+        self.path = path
+    
+    def set_keyword(self, search_keyword):
+        """현재 스레드에서 이후 기록되는 구간의 검색어 지정"""
+        self._local.keyword = search_keyword
+    
+    def current_keyword(self):
+        return getattr(self._local, 'keyword', None)
+    
+    def _open_spans(self):
+        if not hasattr(self._local, 'open_spans'):
+            self._local.open_spans = []
+        return self._local.open_spans
+    
+    def current_stage(self):
+        """현재 스레드에서 가장 안쪽에 열린 구간의 단계 이름 (없으면 None)"""
+        open_spans = self._open_spans()
+        return open_spans[-1].stage if open_spans else None
+    
+    def start(self, stage, **attrs):
+        span = Span(stage, self.current_keyword(), **attrs)
+        self._open_spans().append(span)
+        return span
+    
+    def end(self, span):
+        """구간 종료: WebDriver 명령 수 기록/예산 확인 후 파일에 기록"""
+        open_spans = self._open_spans()
+        if span in open_spans:
+            open_spans.remove(span)
+        if span.commands_start is not None:
+            span.attrs['commands'] = DRIVER_COMMANDS.thread_total() - span.commands_start
+            DRIVER_COMMANDS.check_budget(span)
+        self.write(span)
+    
+    @contextmanager
+    def span(self, stage, **attrs):
+        """with 블록 하나를 구간으로 기록 (예외가 나면 outcome='error'로 기록하고 다시 발생)"""
+        span = self.start(stage, **attrs)
+        try:
+            yield span
+        except Exception as e:
+            span.outcome = 'error'
+            span.error = f"{type(e).__name__}: {e}"[:200]
+            raise
+        finally:
+            self.end(span)
+    
+    def sequence(self):
+        return StageSequence(self)
+    
+    def write(self, span):
+        if not self.path:
+            return
+        line = json.dumps(span.to_record(), ensure_ascii=False) + "\n"
+        with self.lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+    
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+TRACER = SpanTracer()
+
+
+class DriverCommandCounter:
+    """
+    WebDriver 명령(chromedriver 왕복)을 단계와 호출 함수별로 세는 계측기 (기본 꺼짐)
+    
+    enable()한 뒤 만든 driver는 get_chrome_driver()에서 attach()되어 driver.execute가 감싸진다.
+    WebElement의 명령(find_element, get_attribute, .text, click 등)도 모두 driver.execute를 거치므로 함께 세어진다.
+    단계는 현재 열린 TRACER 구간(span)의 이름이고, 호출 함수는 명령을 부른 main.py의 함수이다.
+    구간이 끝날 때 명령 수가 budgets(DRIVER_COMMAND_BUDGETS)를 넘으면 violations에 기록한다.
+    
+    사용 예 (테스트나 벤치마크에서):
+        DRIVER_COMMANDS.enable()
+        driver = get_chrome_driver()
+        ...
+        DRIVER_COMMANDS.assert_within_budgets()
+    """
+    
+    def __init__(self, budgets=None):
+        self.budgets = DRIVER_COMMAND_BUDGETS if budgets is None else budgets
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.stats = {}  # {(단계, 호출 함수, 명령): [횟수, 소요 시간(초)]}
+        self.violations = []
+        self._local = threading.local()
+    
+    def enable(self, budgets=None):
+        if budgets is not None:
+            self.budgets = budgets
+        self.enabled = True
+    
+    def reset(self):
+        with self.lock:
+            self.stats.clear()
+            self.violations.clear()
+    
+    def attach(self, driver):
+        """driver.execute를 감싸서 명령마다 record() 호출 (같은 driver에 두 번 붙이지 않음)"""
+        if getattr(driver, 'command_counter', None) is self:
+            return driver
+        original_execute = driver.execute
+        counter = self
+        
+        def execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                counter.record(driver_command, time.perf_counter() - start)
+        
+        driver.execute = execute
+        driver.command_counter = self
+        return driver
+    
+    @staticmethod
+    def caller_name():
+        """명령을 부른 main.py 함수 이름 (selenium 내부와 계측 함수는 건너뜀)"""
+        frame = sys._getframe(3)
+        while frame is not None:
+            name = frame.f_code.co_name
+            if frame.f_globals.get('__name__') == __name__ and name not in ('execute', 'condition', '<lambda>'):
+                return name
+            frame = frame.f_back
+        return '?'
+    
+    def thread_total(self):
+        """현재 스레드에서 지금까지 실행한 명령 수"""
+        return getattr(self._local, 'total', 0)
+    
+    def record(self, command, elapsed):
+        self._local.total = self.thread_total() + 1
+        key = (TRACER.current_stage() or '-', self.caller_name(), command)
+        with self.lock:
+            item = self.stats.setdefault(key, [0, 0.0])
+            item[0] += 1
+            item[1] += elapsed
+    
+    def check_budget(self, span):
+        """끝난 구간의 명령 수가 예산을 넘는지 확인 (넘으면 violations에 추가하고 True 반환)"""
+        budget = self.budgets.get(span.stage)
+        if not budget:
+            return False
+        commands = span.attrs.get('commands', 0)
+        products = span.attrs.get('products')
+        if 'per_product' in budget and products:
+            value, limit, unit = commands / products, budget['per_product'], 'per_product'
+        elif 'per_span' in budget:
+            value, limit, unit = commands, budget['per_span'], 'per_span'
+        else:
+            return False
+        if value <= limit:
+            return False
+        span.attrs['over_budget'] = True
+        with self.lock:
+            self.violations.append({
+                'stage': span.stage, 'keyword': span.keyword, 'unit': unit,
+                'value': round(value, 2), 'limit': limit, 'commands': commands, 'products': products,
+            })
+        return True
+    
+    def assert_within_budgets(self):
+        """예산을 넘은 구간이 있으면 AssertionError (테스트에서 왕복 수 회귀 확인용)"""
+        if self.violations:
+            worst = max(self.violations, key=lambda v: v['value'] / v['limit'])
+            raise AssertionError(
+                f"WebDriver 명령 예산 초과 {len(self.violations)}건 (최대: {worst['stage']} "
+                f"{worst['value']} > {worst['limit']} {worst['unit']})"
+            )
+    
+    def totals(self, index):
+        """stats를 단계(0)/호출 함수(1)/명령(2) 기준으로 합산 {이름: [횟수, 소요 시간]}"""
+        with self.lock:
+            items = list(self.stats.items())
+        totals = {}
+        for key, (count, elapsed) in items:
+            item = totals.setdefault(key[index], [0, 0.0])
+            item[0] += count
+            item[1] += elapsed
+        return totals
+    
+    def report(self, top=10):
+        """단계별/호출 함수별/명령별 WebDriver 명령 수와 소요 시간, 예산 초과 출력"""
+        if not self.stats:
+            return
+        for title, index in (("단계", 0), ("호출 함수", 1), ("명령", 2)):
+            totals = sorted(self.totals(index).items(), key=lambda kv: kv[1][0], reverse=True)
+            print(f"\nWebDriver 명령 ({title}별):")
+            print(f"  {title:<28}{'횟수':>8}{'합계(초)':>10}{'평균(ms)':>10}")
+            for name, (count, elapsed) in totals[:top]:
+                print(f"  {name:<28}{count:>8}{elapsed:>10.2f}{elapsed / count * 1000:>10.1f}")
+        
+        if self.violations:
+            print(f"\n⚠ WebDriver 명령 예산 초과 {len(self.violations)}건:")
+            by_stage = {}
+            for violation in self.violations:
+                by_stage.setdefault(violation['stage'], []).append(violation)
+            for stage, items in by_stage.items():
+                worst = max(items, key=lambda v: v['value'])
+                print(f"  {stage}: {len(items)}건, 최대 {worst['value']} (예산 {worst['limit']} {worst['unit']}, "
+                      f"검색어 '{worst['keyword']}')")
+        else:
+            print("\n✓ WebDriver 명령 예산 초과 없음")
+
+
+DRIVER_COMMANDS = DriverCommandCounter()
+
+
+class DiagnosticsBuffer:
+    """
+    실패 진단용 페이지 스냅샷 링 버퍼 (최근 max_snapshots개만 메모리에 보관)
+    
+    파싱 루프 안에서는 카드 번호와 이미 읽어 둔 값만 notes 리스트에 적고 (WebDriver 왕복/출력 없음),
+    루프가 끝난 뒤 capture()로 페이지 HTML을 페이지당 한 번만 가져온다.
+    파일로는 dump()를 부를 때만 쓴다 (main.py --diagnostics 또는 실행 실패 시).
+    
+    사용 예:
+        notes = []
+        for idx, card in enumerate(cards):
+            if price is None:
+                notes.append({'card': idx + 1, 'reason': 'price_missing'})
+        if notes:
+            DIAGNOSTICS.capture('price_missing', driver=driver, notes=notes)
+    """
+    
+    def __init__(self, max_snapshots=DIAGNOSTICS_MAX_SNAPSHOTS, max_html_chars=DIAGNOSTICS_MAX_HTML_CHARS):
+        self.max_html_chars = max_html_chars
+        self.snapshots = deque(maxlen=max_snapshots)
+        self.lock = threading.Lock()
+        self.captured = 0
+        self.failures = []
+    
+    @property
+    def failed(self):
+        return bool(self.failures)
+    
+    def capture(self, reason, driver=None, html=None, url=None, notes=None, keyword=None, **details):
+        """
+        현재 페이지의 스냅샷 저장 (html을 넘기지 않으면 driver.page_source를 한 번 읽음)
+        
+        Args:
+            reason: 스냅샷 이유 (파일 이름에 들어감, 예: 'price_missing', 'login_form_missing')
+            driver: Selenium WebDriver 객체 (html/url을 읽을 때 사용)
+            html: 이미 가지고 있는 페이지 HTML (HTTP 응답 등)
+            url: 페이지 URL
+            notes: 카드별 메모 리스트
+            keyword: 검색어 (None이면 현재 스레드의 TRACER 검색어)
+            **details: 그 외 기록할 값
+        
+        Returns:
+            스냅샷 번호 (실행 중 1부터 증가)
+        """
+        if driver is not None:
+            if html is None:
+                try:
+                    html = driver.page_source
+                except Exception as e:
+                    html = f"<!-- page_source 읽기 실패: {e} -->"
+            if url is None:
+                try:
+                    url = driver.current_url
+                except Exception:
+                    pass
+        
+        with self.lock:
+            self.captured += 1
+            snapshot_id = self.captured
+            self.snapshots.append({
+                'id': snapshot_id,
+                'ts': datetime.now().isoformat(timespec='seconds'),
+                'reason': reason,
+                'stage': TRACER.current_stage(),
+                'keyword': keyword if keyword is not None else TRACER.current_keyword(),
+                'url': url,
+                'details': details,
+                'notes': notes or [],
+                'html': (html or '')[:self.max_html_chars],
+            })
+        return snapshot_id
+    
+    def mark_failed(self, reason):
+        """실행 실패 기록 (실행이 끝날 때 스냅샷을 파일로 저장하게 됨)"""
+        with self.lock:
+            self.failures.append(reason)
+    
+    def dump(self, directory=DIAGNOSTICS_DIR):
+        """
+        보관 중인 스냅샷을 HTML 파일과 색인 JSON으로 저장
+        
+        Returns:
+            색인 파일 경로, 스냅샷이 없으면 None
+        """
+        with self.lock:
+            snapshots = list(self.snapshots)
+            failures = list(self.failures)
+            dropped = self.captured - len(snapshots)
+        if not snapshots:
+            return None
+        
+        os.makedirs(directory, exist_ok=True)
+        run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        index = []
+        for snapshot in snapshots:
+            file_name = f"{run_id}_{snapshot['id']:03d}_{snapshot['reason']}.html"
+            with open(os.path.join(directory, file_name), 'w', encoding='utf-8') as f:
+                f.write(snapshot['html'])
+            entry = {key: value for key, value in snapshot.items() if key != 'html'}
+            entry['file'] = file_name
+            index.append(entry)
+        
+        index_path = os.path.join(directory, f"{run_id}_index.json")
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({'failures': failures, 'dropped': dropped, 'snapshots': index}, f, ensure_ascii=False, indent=2)
+        print(f"✓ 진단 스냅샷 {len(snapshots)}개 저장: {index_path}" + (f" (오래된 {dropped}개는 버려짐)" if dropped else ""))
+        return index_path
+
+
+DIAGNOSTICS = DiagnosticsBuffer()
+
+
+def document_ready():
+    """document.readyState가 interactive 이상이면 참"""
+    return lambda d: d.execute_script("return document.readyState") in ('interactive', 'complete')
+
+
+def any_element_present(selectors):
+    """CSS 선택자 중 하나라도 요소가 있으면 그 요소를 반환"""
+    def condition(d):
+        for selector in selectors:
+            try:
+                elements = d.find_elements(By.CSS_SELECTOR, selector)
+            except Exception:
+                continue
+            if elements:
+                return elements[0]
+        return False
+    return condition
+
+
+def element_count_stable(selector, quiet_period=0.5):
+    """
+    selector에 해당하는 요소 수가 1개 이상이고 quiet_period 동안 변하지 않으면 그 개수를 반환
+    
+    (무한 스크롤/지연 로딩으로 결과 카드가 늘어나는 동안은 계속 대기)
+    """
+    state = {'count': None, 'since': time.perf_counter()}
+    
+    def condition(d):
+        count = d.execute_script("return document.querySelectorAll(arguments[0]).length", selector)
+        now = time.perf_counter()
+        if count != state['count']:
+            state['count'] = count
+            state['since'] = now
+            return False
+        if count and now - state['since'] >= quiet_period:
+            return count
+        return False
+    return condition
+
+
+# element_count_stable()의 Playwright 버전 (page.wait_for_function용, 이전 호출의 개수는 window에 보관)
+ELEMENT_COUNT_STABLE_JS = r"""
+([selector, quietMs]) => {
+    const count = document.querySelectorAll(selector).length;
+    const now = performance.now();
+    const state = window.__elementCountStable || (window.__elementCountStable = {count: -1, since: now});
+    if (count !== state.count) {
+        state.count = count;
+        state.since = now;
+        return false;
+    }
+    return count > 0 && now - state.since >= quietMs;
+}
+"""
+
+
+def checkbox_checked(element, expected=True):
+    """체크박스의 checked 상태가 expected가 되면 참"""
+    return lambda d: element.is_selected() == expected
+
+
+def ajax_idle(min_wait=0.0):
+    """
+    페이지의 jQuery ajax 요청이 모두 끝나면 참 (클릭 후 처리 완료 대기용)
+    
+    클릭 핸들러가 요청을 늦게 시작하는 경우를 위해 최소 min_wait초는 기다린다.
+    """
+    start = time.perf_counter()
+    script = "return document.readyState === 'complete' && (!window.jQuery || window.jQuery.active === 0)"
+    
+    def condition(d):
+        if time.perf_counter() - start < min_wait:
+            return False
+        return d.execute_script(script)
+    return condition
+
+
+class SelectorRegistry:
+    """
+    여러 선택자를 순서대로 시도하는 요소 찾기에서 실제로 맞았던 선택자를 기억하는 레지스트리
+    
+    논리 요소 이름(예: 'login_user_id')별로 마지막으로 맞은 선택자를 파일에 저장해 두고
+    다음 실행부터 그 선택자를 먼저 시도한다. 선택자가 실패할 때마다 WebDriver 왕복이 한 번씩
+    늘어나므로, 이름별 첫 시도 적중률과 실패 횟수를 기록해 느린 대체 경로를 확인할 수 있다.
+    
+    선택자는 CSS 문자열 또는 (By, 값) 튜플이며, 값에는 str.format 자리표시자를 쓸 수 있다.
+    예: registry.find(driver, 'mybox_checkbox', ["#input_check3_{product_id}"], product_id="123")
+    """
+    
+    def __init__(self, path=SELECTOR_CACHE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.winners = {}
+        self.stats = {}
+        self.dirty = False  # 마지막 저장 이후 통계가 바뀌었는지 (flush()용)
+        self.load()
+    
+    @staticmethod
+    def _normalize(selector):
+        return tuple(selector) if isinstance(selector, (tuple, list)) else (By.CSS_SELECTOR, selector)
+    
+    @staticmethod
+    def _key(entry):
+        return f"{entry[0]}|{entry[1]}"
+    
+    def load(self):
+        """저장된 선택자 기록 읽기 (파일이 없거나 깨졌으면 빈 상태로 시작)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.winners = data.get('winners', {})
+            self.stats = data.get('stats', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠ 선택자 캐시를 읽을 수 없습니다: {e}")
+    
+    def save(self):
+        """선택자 기록을 파일에 저장"""
+        if not self.path:
+            return
+        with self.lock:
+            data = {'winners': dict(self.winners), 'stats': json.loads(json.dumps(self.stats))}
+            self.dirty = False
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+    
+    def flush(self):
+        """우선 선택자가 바뀌지 않아 아직 저장하지 않은 통계가 있으면 저장 (실행 끝에 호출)"""
+        if not self.dirty:
+            return
+        try:
+            self.save()
+        except OSError as e:
+            print(f"⚠ 선택자 캐시 저장 실패: {e}")
+    
+    def ordered(self, name, selectors):
+        """기억해 둔 선택자를 맨 앞으로 옮긴 (By, 값) 리스트 반환"""
+        entries = [self._normalize(selector) for selector in selectors]
+        winner = self.winners.get(name)
+        if winner:
+            for idx, entry in enumerate(entries):
+                if self._key(entry) == winner:
+                    return [entry] + entries[:idx] + entries[idx + 1:]
+        return entries
+    
+    def record(self, name, entry, misses):
+        """
+        찾기 결과 기록
+        
+        Args:
+            name: 논리 요소 이름
+            entry: 맞은 (By, 값) 튜플 (찾지 못했으면 None)
+            misses: 맞기 전까지 실패한 선택자 수
+        """
+        changed = False
+        with self.lock:
+            item = self.stats.setdefault(name, {
+                'lookups': 0, 'first_try_hits': 0, 'fallback_hits': 0, 'not_found': 0, 'misses': 0, 'wins': {},
+            })
+            item['lookups'] += 1
+            item['misses'] += misses
+            self.dirty = True
+            if entry is None:
+                item['not_found'] += 1
+            else:
+                key = self._key(entry)
+                item['wins'][key] = item['wins'].get(key, 0) + 1
+                if misses == 0:
+                    item['first_try_hits'] += 1
+                else:
+                    item['fallback_hits'] += 1
+                if self.winners.get(name) != key:
+                    self.winners[name] = key
+                    changed = True
+        if changed:
+            try:
+                self.save()
+            except OSError as e:
+                print(f"⚠ 선택자 캐시 저장 실패: {e}")
+    
+    def find(self, root, name, selectors, **format_args):
+        """
+        선택자를 (기억해 둔 것부터) 차례로 시도하여 첫 번째로 찾은 요소 반환
+        
+        Args:
+            root: WebDriver 또는 WebElement
+            name: 논리 요소 이름
+            selectors: CSS 문자열 또는 (By, 값) 튜플 리스트
+            **format_args: 선택자 자리표시자에 넣을 값
+        
+        Returns:
+            찾은 WebElement, 없으면 None
+        """
+        misses = 0
+        for entry in self.ordered(name, selectors):
+            value = entry[1].format(**format_args) if format_args else entry[1]
+            try:
+                elements = root.find_elements(entry[0], value)
+            except Exception:
+                elements = []
+            if elements:
+                self.record(name, entry, misses)
+                return elements[0]
+            misses += 1
+        self.record(name, None, misses)
+        return None
+    
+    def wait_find(self, driver, name, selectors, timeout=10, label=None, **format_args):
+        """
+        선택자 중 하나에 해당하는 요소가 나타날 때까지 대기 (선택자마다 따로 기다리지 않음)
+        
+        Returns:
+            찾은 WebElement, 시간 초과 시 None
+        """
+        entries = self.ordered(name, selectors)
+        
+        def condition(d):
+            for idx, entry in enumerate(entries):
+                value = entry[1].format(**format_args) if format_args else entry[1]
+                try:
+                    elements = d.find_elements(entry[0], value)
+                except Exception:
+                    continue
+                if elements:
+                    return elements[0], idx
+            return False
+        
+        found = wait_until(driver, condition, timeout=timeout, label=label or name)
+        if not found:
+            self.record(name, None, len(entries))
+            return None
+        element, idx = found
+        self.record(name, entries[idx], idx)
+        return element
+    
+    def report(self):
+        """논리 요소별 선택자 적중률 출력"""
+        with self.lock:
+            stats = json.loads(json.dumps(self.stats))
+            winners = dict(self.winners)
+        if not stats:
+            return
+        print("\n선택자 적중 통계 (누적):")
+        print(f"  {'요소':<22}{'조회':>6}{'첫시도':>8}{'대체':>6}{'실패':>6}{'평균 miss':>10}  현재 우선 선택자")
+        for name, item in sorted(stats.items(), key=lambda kv: kv[1]['misses'], reverse=True):
+            lookups = item['lookups'] or 1
+            first_rate = item['first_try_hits'] / lookups * 100
+            winner = (winners.get(name) or '').split('|', 1)[-1]
+            print(f"  {name:<22}{item['lookups']:>6}{first_rate:>7.0f}%{item['fallback_hits']:>6}{item['not_found']:>6}"
+                  f"{item['misses'] / lookups:>10.2f}  {winner}")
+
+
+SELECTOR_REGISTRY = SelectorRegistry()
+
+
+def login_to_domeggook(driver, username=None, password=None):
+    """
+    도매꾹 사이트에 로그인
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        username: 로그인 아이디 (None이면 사용자 입력 요청, 환경변수 DOMEID에서도 읽음)
+        password: 비밀번호 (None이면 사용자 입력 요청, 환경변수 DOMPWD에서도 읽음)
+    
+    Returns:
+        로그인 성공 여부 (bool)
+    """
+    import os
+    
+    try:
+        # 환경변수에서 로그인 정보 읽기 (선택사항)
+        if not username:
+            username = os.getenv('DOMEID')
+        if not password:
+            password = os.getenv('DOMPWD')
+        
+        # 로그인 페이지로 이동 (올바른 URL 사용)
+        # back 파라미터는 로그인 후 돌아갈 페이지를 지정 (base64 인코딩된 URL)
+        login_url = LOGIN_URL
+        print(f"\n로그인 페이지로 이동: {login_url}")
+        driver.get(login_url)
+        
+        # 로그인 폼(비밀번호 입력 필드)이 나타날 때까지 대기
+        wait_until(driver, any_element_present(LOGIN_PASSWORD_SELECTORS), timeout=10, label="login_form")
+        
+        # 로그인 정보 입력 받기
+        if not username:
+            username = input("아이디를 입력하세요: ").strip()
+        if not password:
+            import getpass
+            password = getpass.getpass("비밀번호를 입력하세요: ").strip()
+        
+        if not username or not password:
+            print("✗ 아이디와 비밀번호가 필요합니다.")
+            return False
+        # 입력받은 아이디까지 포함해 실제로 로그인한 아이디를 기록 (ensure_login이 세션과 함께 저장)
+        driver.login_user = username
+        
+        # 로그인 폼 요소 찾기
+        # 다양한 선택자 시도 (도매꾹 통합 로그인 페이지, 지난번에 맞았던 선택자부터)
+        user_id_input = SELECTOR_REGISTRY.find(driver, 'login_user_id', LOGIN_USER_ID_SELECTORS)
+        if user_id_input:
+            print("✓ 아이디 입력 필드 찾음")
+        
+        password_input = SELECTOR_REGISTRY.find(driver, 'login_password', LOGIN_PASSWORD_SELECTORS)
+        if password_input:
+            print("✓ 비밀번호 입력 필드 찾음")
+        
+        if not user_id_input or not password_input:
+            snapshot_id = DIAGNOSTICS.capture('login_form_missing', driver=driver)
+            print(f"✗ 로그인 폼을 찾을 수 없습니다. (진단 스냅샷 #{snapshot_id})")
+            return False
+        
+        # 로그인 정보 입력
+        user_id_input.clear()
+        user_id_input.send_keys(username)
+        
+        password_input.clear()
+        password_input.send_keys(password)
+        
+        # 로그인 버튼 찾기 및 클릭
+        login_button = SELECTOR_REGISTRY.find(driver, 'login_button', LOGIN_BUTTON_SELECTORS)
+        if login_button:
+            print("✓ 로그인 버튼 찾음")
+        
+        if not login_button:
+            # Enter 키로 로그인 시도
+            password_input.send_keys(Keys.RETURN)
+            print("✓ Enter 키로 로그인 시도")
+        else:
+            login_button.click()
+            print("✓ 로그인 버튼 클릭")
+        
+        # 로그인 완료 대기 (로그인 페이지를 벗어날 때까지, 실패하면 시간 초과 후 아래에서 확인)
+        wait_until(driver, lambda d: "mem_loginform" not in d.current_url.lower(), timeout=10, label="login_redirect")
+        
+        # 로그인 성공 확인 (URL 변경 또는 특정 요소 확인)
+        current_url = driver.current_url
+        
+        # 로그인 성공 조건:
+        # 1. login 관련 URL이 아니거나
+        # 2. domemedb.domeggook.com으로 리다이렉트되었거나
+        # 3. 로그아웃 버튼이나 마이페이지 링크가 있는 경우
+        if "login" not in current_url.lower() or "domemedb" in current_url.lower() or "mainChannel" in current_url.lower():
+            # 추가 확인: 로그아웃 버튼이나 마이페이지 링크 확인
+            try:
+                logout_elements = driver.find_elements(By.CSS_SELECTOR, "a[href*='logout'], a[href*='mypage'], [class*='logout'], [class*='mypage']")
+                if logout_elements:
+                    print("✓ 로그인 성공! (로그아웃/마이페이지 링크 확인)")
+                    return True
+            except:
+                pass
+            
+            # URL 기반 확인
+            if "domemedb" in current_url.lower() or "mainChannel" in current_url.lower():
+                print("✓ 로그인 성공! (URL 확인)")
+                return True
+            elif "login" not in current_url.lower():
+                print("✓ 로그인 성공! (로그인 페이지에서 이동)")
+                return True
+        
+        # 로그인 실패 메시지 확인
+        try:
+            error_selectors = [
+                ".error", ".alert", "[class*='error']", "[class*='alert']",
+                "[class*='fail']", "[class*='warning']", ".msg-error"
+            ]
+            for selector in error_selectors:
+                try:
+                    error_msg = driver.find_element(By.CSS_SELECTOR, selector)
+                    error_text = error_msg.text.strip()
+                    if error_text:
+                        print(f"✗ 로그인 실패: {error_text}")
+                        return False
+                except:
+                    continue
+        except:
+            pass
+        
+        print("✗ 로그인 실패: 로그인 상태를 확인할 수 없습니다.")
+        print(f"  현재 URL: {current_url}")
+        return False
+            
+    except Exception as e:
+        print(f"✗ 로그인 중 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def access_with_selenium(headless=True):
+    """Selenium을 사용한 브라우저 자동화 접속"""
+    url = f"{DOMEMEDB_URL}/index/?mainChannel=aihome"
+    
+    driver = None
+    try:
+        print(f"Selenium으로 {url} 접속 시도 중...")
+        driver = get_chrome_driver(headless=headless)
+        driver.get(url)
+        
+        # 페이지 로딩 대기
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
+        
+        print(f"✓ 접속 성공!")
+        print(f"✓ 페이지 제목: {driver.title}")
+        print(f"✓ 현재 URL: {driver.current_url}")
+        
+        return driver
+    except Exception as e:
+        print(f"✗ 접속 실패: {e}")
+        print("ChromeDriver가 설치되어 있는지 확인하세요.")
+        if driver:
+            driver.quit()
+        return None
+
+
+# 상품 체크박스를 브라우저 안에서 한 번에 선택하는 스크립트
+# arguments[0]: 상품번호 리스트 (null이면 페이지의 모든 item[] 체크박스)
+# 페이지 스크립트가 선택 개수 등을 갱신할 수 있도록 체크박스마다 click/input/change 이벤트를 발생시키고,
+# 이벤트 처리 후의 실제 checked 상태를 상품번호별로 돌려준다.
+BATCH_SELECT_JS = r"""
+const ids = arguments[0];
+const esc = (v) => String(v).replace(/["'\\]/g, '\\$&');
+const selectorsFor = (id) => {
+    const v = esc(id);
+    return [
+        `input[type='checkbox'][name='item[]'][value='${v}']`,
+        `input[type='checkbox'][value='${v}']`,
+        `input[id='input_check3_${v}']`,
+        `input.input_check3[value='${v}']`,
+        `label[for='${v}'] input[type='checkbox']`,
+        `input[type='checkbox'][id='${v}']`,
+    ];
+};
+const mark = (cb) => {
+    if (cb.checked) return;
+    // 실제 클릭과 같이 click/input/change 이벤트가 발생하도록 click() 사용
+    cb.click();
+    if (!cb.checked) {
+        // 클릭 핸들러가 막은 경우 기존 방식과 같이 강제로 체크
+        cb.checked = true;
+        cb.dispatchEvent(new Event('input', {bubbles: true}));
+        cb.dispatchEvent(new Event('change', {bubbles: true}));
+    }
+};
+const result = {};
+if (ids === null) {
+    document.querySelectorAll("input[type='checkbox'][name='item[]']").forEach((cb, i) => {
+        mark(cb);
+        result[cb.value || String(i)] = cb;
+    });
+} else {
+    for (const id of ids) {
+        let cb = null;
+        for (const sel of selectorsFor(String(id))) {
+            try { cb = document.querySelector(sel); } catch (e) { cb = null; }
+            if (cb) break;
+        }
+        if (cb) mark(cb);
+        result[String(id)] = cb;
+    }
+}
+// 이벤트 핸들러가 상태를 되돌렸을 수 있으므로 모두 처리된 뒤 다시 확인
+const checked = {};
+for (const [id, cb] of Object.entries(result)) {
+    checked[id] = !!(cb && cb.checked);
+}
+return checked;
+"""
+
+
+def select_product_checkboxes(driver, product_ids):
+    """
+    상품 체크박스를 스크립트 한 번으로 일괄 선택
+    
+    상품 수와 관계없이 WebDriver 왕복이 한 번이므로 100개를 선택해도 1개와 거의 같은 시간이 걸린다.
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        product_ids: 선택할 상품번호 리스트 (None이면 페이지의 모든 상품)
+    
+    Returns:
+        {상품번호: 선택 성공 여부} 딕셔너리
+    """
+    ids = None if product_ids is None else [str(pid) for pid in product_ids]
+    checked = driver.execute_script(BATCH_SELECT_JS, ids)
+    if not isinstance(checked, dict):
+        raise RuntimeError(f"예상하지 못한 스크립트 결과: {checked!r}")
+    return {pid: bool(ok) for pid, ok in checked.items()}
+
+
+def select_product_checkboxes_legacy(driver, product_ids):
+    """
+    상품별로 체크박스를 찾아 클릭하는 기존 선택 방식 (일괄 선택이 실패했을 때 사용)
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        product_ids: 선택할 상품번호 리스트
+    
+    Returns:
+        {상품번호: 선택 성공 여부} 딕셔너리
+    """
+    results = {}
+    for product_id in product_ids:
+        results[product_id] = False
+        try:
+            # 체크박스 찾기 (여러 방법 시도)
+            checkbox_selectors = [
+                "input[type='checkbox'][value='{product_id}']",
+                "input[type='checkbox'][name='item[]'][value='{product_id}']",
+                "input[type='checkbox'][id='{product_id}']",
+                "label[for='{product_id}'] input[type='checkbox']",
+                "#input_check3_{product_id}",
+                "input.input_check3[value='{product_id}']",
+            ]
+            
+            checkbox = SELECTOR_REGISTRY.find(
+                driver, 'mybox_product_checkbox', checkbox_selectors, product_id=product_id
+            )
+            
+            if checkbox:
+                # 체크박스가 보이도록 스크롤
+                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkbox)
+                
+                # 현재 선택 상태 확인
+                is_selected_before = checkbox.is_selected()
+                print(f"  상품 {product_id}: 선택 전 상태 = {is_selected_before}")
+                
+                if not is_selected_before:
+                    # 체크박스 클릭 (여러 방법 시도)
+                    clicked = False
+                    
+                    # 방법 1: label을 통해 클릭 (가장 안정적)
+                    try:
+                        label = driver.find_element(By.CSS_SELECTOR, f"label[for='{product_id}']")
+                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", label)
+                        label.click()
+                        clicked = True
+                        print(f"    → label 클릭 시도")
+                    except Exception as e:
+                        print(f"    → label 클릭 실패: {e}")
+                    
+                    # 방법 2: 체크박스 직접 클릭
+                    if not clicked:
+                        try:
+                            checkbox.click()
+                            clicked = True
+                            print(f"    → 체크박스 직접 클릭 시도")
+                        except Exception as e:
+                            print(f"    → 체크박스 직접 클릭 실패: {e}")
+                    
+                    # 방법 3: JavaScript로 강제 클릭
+                    if not clicked:
+                        try:
+                            driver.execute_script("arguments[0].click();", checkbox)
+                            clicked = True
+                            print(f"    → JavaScript 클릭 시도")
+                        except Exception as e:
+                            print(f"    → JavaScript 클릭 실패: {e}")
+                    
+                    # 클릭 후 체크 상태가 바뀔 때까지 대기
+                    wait_until(driver, checkbox_checked(checkbox), timeout=2, label="checkbox_checked")
+                    
+                    # 클릭 후 선택 상태 확인
+                    is_selected_after = checkbox.is_selected()
+                    print(f"  상품 {product_id}: 선택 후 상태 = {is_selected_after}")
+                    
+                    if is_selected_after:
+                        results[product_id] = True
+                        print(f"✓ 상품 {product_id} 선택 성공!")
+                    else:
+                        # 강제로 체크 상태 변경 시도
+                        try:
+                            driver.execute_script("arguments[0].checked = true;", checkbox)
+                            driver.execute_script("arguments[0].dispatchEvent(new Event('change'));", checkbox)
+                            is_selected_final = checkbox.is_selected()
+                            if is_selected_final:
+                                results[product_id] = True
+                                print(f"✓ 상품 {product_id} 강제 선택 성공!")
+                            else:
+                                print(f"✗ 상품 {product_id} 선택 실패 (강제 시도 후에도 실패)")
+                        except Exception as e:
+                            print(f"✗ 상품 {product_id} 강제 선택 실패: {e}")
+                else:
+                    results[product_id] = True
+                    print(f"✓ 상품 {product_id} 이미 선택됨")
+            else:
+                print(f"✗ 상품 {product_id} 체크박스를 찾을 수 없음")
+        except Exception as e:
+            print(f"✗ 상품 {product_id} 선택 실패: {e}")
+            continue
+    
+    return results
+
+
+def send_mybox_to_speedgo(driver, stages):
+    """
+    스피드고 사이트로 이동해 마이박스 전체 선택 → 스피드고전송 → 팝업의 두 번째 전송 버튼 클릭
+    
+    add_products_to_mybox()가 마이박스담기 뒤에 call_with_retries()로 호출한다.
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        stages: add_products_to_mybox()의 단계 기록 (StageSequence)
+    
+    Returns:
+        성공 여부 (bool)
+    
+    Raises:
+        PopupNotFoundError: 스피드고전송 팝업과 팝업 안의 전송 버튼이 모두 나타나지 않은 경우 (재시도 대상)
+    """
+    try:
+        # 스피드고 사이트로 이동
+        stages.enter('speedgo_nav')
+        print("\n스피드고 사이트로 이동 중...")
+        speedgo_url = f"{SPEEDGO_URL}/"
+        driver.get(speedgo_url)
+        
+        # 마이박스 메뉴 링크가 나타날 때까지 대기
+        mybox_selectors = [
+            "a[href*='mybox/mb_saveList.php']",
+            "a.cur[href*='mybox']",
+            "a:contains('마이박스')",
+        ]
+        wait_until(driver, any_element_present(mybox_selectors[:2]), timeout=10, label="speedgo_ready")
+        print(f"✓ 스피드고 사이트 접속 완료: {driver.current_url}")
+        
+        # 마이박스 메뉴 클릭
+        print("\n마이박스 메뉴 클릭 중...")
+        
+        mybox_link = SELECTOR_REGISTRY.find(driver, 'speedgo_mybox_link', mybox_selectors[:2])
+        if mybox_link:
+            link_text = mybox_link.text.strip()
+            link_href = mybox_link.get_attribute('href') or ''
+            print("✓ 마이박스 링크 찾음")
+            print(f"  링크 텍스트: '{link_text}'")
+            print(f"  링크 주소: '{link_href}'")
+        
+        if not mybox_link:
+            # 텍스트로 찾기 시도
+            try:
+                links = driver.find_elements(By.TAG_NAME, "a")
+                for link in links:
+                    link_text = link.text.strip()
+                    link_href = link.get_attribute('href') or ''
+                    if "마이박스" in link_text and "mybox" in link_href:
+                        mybox_link = link
+                        print(f"✓ 마이박스 링크 찾음 (텍스트 검색)")
+                        print(f"  링크 텍스트: '{link_text}'")
+                        print(f"  링크 주소: '{link_href}'")
+                        break
+            except Exception as e:
+                print(f"  텍스트 검색 중 오류: {e}")
+        
+        if not mybox_link:
+            print("✗ 마이박스 링크를 찾을 수 없습니다.")
+            stages.retry()
+            # 직접 URL로 이동한 뒤 아래의 전체 선택/스피드고전송 단계를 그대로 진행
+            try:
+                mybox_url = f"{SPEEDGO_URL}/mybox/mb_saveList.php"
+                driver.get(mybox_url)
+                print(f"✓ 마이박스 페이지로 직접 이동: {mybox_url}")
+                wait_until(driver, document_ready(), timeout=10, label="mybox_page")
+            except Exception as e:
+                print(f"✗ 마이박스 페이지 이동 실패: {e}")
+                return False
+        
+        # 링크 클릭 (링크를 찾지 못했으면 위에서 이미 직접 이동함)
+        if mybox_link:
+            try:
+                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", mybox_link)
+                mybox_link.click()
+                print("✓ 마이박스 메뉴 클릭 완료")
+                wait_until(driver, lambda d: "mybox" in d.current_url.lower(), timeout=10, label="mybox_page")
+                
+                # 페이지 이동 확인
+                current_url = driver.current_url
+                if "mybox" in current_url.lower():
+                    print(f"✓ 마이박스 페이지 이동 완료: {current_url}")
+                else:
+                    print(f"⚠ 현재 URL: {current_url} (마이박스 페이지가 아닐 수 있음)")
+            except Exception as e:
+                print(f"✗ 마이박스 메뉴 클릭 실패: {e}")
+                stages.retry()
+                # 직접 URL로 이동 시도
+                try:
+                    mybox_url = f"{SPEEDGO_URL}/mybox/mb_saveList.php"
+                    driver.get(mybox_url)
+                    print(f"✓ 마이박스 페이지로 직접 이동: {mybox_url}")
+                except:
+                    pass
+        
+        # 마이박스 페이지에서 전체 선택 및 스피드고전송
+        stages.enter('speedgo_popup')
+        print("\n마이박스 페이지에서 전체 선택 및 스피드고전송 준비 중...")
+        wait_until(
+            driver,
+            any_element_present(["#selectAll", "input[name='selectAll']", "button[onclick*='speedGoSend']"]),
+            timeout=10,
+            label="mybox_list_ready",
+        )
+        
+        # 전체 선택 체크박스 찾기 및 선택
+        print("\n전체 선택 체크박스 찾는 중...")
+        select_all_checkbox = SELECTOR_REGISTRY.find(driver, 'mybox_select_all', [
+            (By.ID, "selectAll"),
+            "input[name='selectAll']",
+            "input.checkbox1#selectAll",
+        ])
+        if select_all_checkbox:
+            print("✓ 전체 선택 체크박스 찾음")
+        
+        if select_all_checkbox:
+            # 체크박스 선택 상태 확인
+            is_selected = select_all_checkbox.is_selected()
+            print(f"  전체 선택 체크박스 현재 상태: {is_selected}")
+            
+            if not is_selected:
+                # 체크박스가 보이도록 스크롤
+                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", select_all_checkbox)
+                
+                # 체크박스 클릭 시도
+                clicked = False
+                
+                # 방법 1: label을 통해 클릭
+                try:
+                    label = driver.find_element(By.CSS_SELECTOR, "label[for='selectAll']")
+                    label.click()
+                    clicked = True
+                    print("✓ 전체 선택 체크박스 클릭 (label 클릭)")
+                except:
+                    pass
+                
+                # 방법 2: 체크박스 직접 클릭
+                if not clicked:
+                    try:
+                        select_all_checkbox.click()
+                        clicked = True
+                        print("✓ 전체 선택 체크박스 클릭 (직접 클릭)")
+                    except:
+                        pass
+                
+                # 방법 3: JavaScript로 클릭
+                if not clicked:
+                    try:
+                        driver.execute_script("arguments[0].click();", select_all_checkbox)
+                        clicked = True
+                        print("✓ 전체 선택 체크박스 클릭 (JavaScript)")
+                    except:
+                        pass
+                
+                # 방법 4: 강제로 체크 상태 변경
+                if not clicked:
+                    try:
+                        driver.execute_script("arguments[0].checked = true;", select_all_checkbox)
+                        driver.execute_script("arguments[0].dispatchEvent(new Event('change'));", select_all_checkbox)
+                        print("✓ 전체 선택 체크박스 강제 선택")
+                    except:
+                        pass
+                
+                wait_until(driver, checkbox_checked(select_all_checkbox), timeout=3, label="select_all_checked")
+                
+                # 선택 상태 확인
+                is_selected_after = select_all_checkbox.is_selected()
+                print(f"  전체 선택 체크박스 선택 후 상태: {is_selected_after}")
+                
+                if is_selected_after:
+                    print("✓ 전체 선택 완료!")
+                else:
+                    print("⚠ 전체 선택이 완료되지 않았을 수 있습니다.")
+            else:
+                print("✓ 전체 선택 체크박스가 이미 선택되어 있습니다.")
+        else:
+            print("✗ 전체 선택 체크박스를 찾을 수 없습니다.")
+        
+        # 스피드고전송 버튼 찾기 및 클릭
+        print("\n스피드고전송 버튼 찾는 중...")
+        speedgo_button = None
+        
+        # 방법 1: onclick="speedGoSend()" 속성으로 찾기
+        try:
+            buttons = driver.find_elements(By.CSS_SELECTOR, "button[onclick*='speedGoSend']")
+            for btn in buttons:
+                onclick_attr = btn.get_attribute('onclick') or ''
+                if 'speedGoSend' in onclick_attr:
+                    speedgo_button = btn
+                    print("✓ 스피드고전송 버튼 찾음 (onclick='speedGoSend')")
+                    break
+        except Exception as e:
+            print(f"  onclick 검색 중 오류: {e}")
+        
+        # 방법 2: 텍스트로 찾기
+        if not speedgo_button:
+            try:
+                buttons = driver.find_elements(By.TAG_NAME, "button")
+                for btn in buttons:
+                    btn_text = btn.text.strip()
+                    btn_onclick = btn.get_attribute('onclick') or ''
+                    if ("스피드고전송" in btn_text or "스피드고" in btn_text) and "speedGoSend" in btn_onclick:
+                        speedgo_button = btn
+                        print("✓ 스피드고전송 버튼 찾음 (텍스트 검색)")
+                        break
+            except Exception as e:
+                print(f"  텍스트 검색 중 오류: {e}")
+        
+        # 방법 3: 클래스로 찾기
+        if not speedgo_button:
+            try:
+                buttons = driver.find_elements(By.CSS_SELECTOR, "button.button2")
+                for btn in buttons:
+                    btn_onclick = btn.get_attribute('onclick') or ''
+                    if 'speedGoSend' in btn_onclick:
+                        speedgo_button = btn
+                        print("✓ 스피드고전송 버튼 찾음 (class='button2')")
+                        break
+            except Exception as e:
+                print(f"  클래스 검색 중 오류: {e}")
+        
+        if not speedgo_button:
+            snapshot_id = DIAGNOSTICS.capture('speedgo_button_missing', driver=driver)
+            print(f"✗ 스피드고전송 버튼을 찾을 수 없습니다. (진단 스냅샷 #{snapshot_id})")
+            return False
+        
+        # 버튼 정보 출력
+        button_text = speedgo_button.text.strip()
+        button_onclick = speedgo_button.get_attribute('onclick') or ''
+        print(f"  버튼 텍스트: '{button_text}'")
+        print(f"  onclick 속성: '{button_onclick}'")
+        
+        # 버튼이 보이도록 스크롤
+        print("\n스피드고전송 버튼 클릭 시도...")
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", speedgo_button)
+        
+        # 버튼 클릭
+        clicked = False
+        
+        # 방법 1: 직접 클릭
+        try:
+            speedgo_button.click()
+            clicked = True
+            print("✓ 스피드고전송 버튼 클릭 (직접 클릭)")
+        except Exception as e:
+            print(f"  직접 클릭 실패: {e}")
+        
+        # 방법 2: JavaScript로 클릭
+        if not clicked:
+            stages.retry()
+            try:
+                driver.execute_script("arguments[0].click();", speedgo_button)
+                clicked = True
+                print("✓ 스피드고전송 버튼 클릭 (JavaScript)")
+            except Exception as e:
+                print(f"  JavaScript 클릭 실패: {e}")
+        
+        # 방법 3: onclick 함수 직접 실행
+        if not clicked:
+            stages.retry()
+            try:
+                if button_onclick:
+                    driver.execute_script(button_onclick)
+                    clicked = True
+                    print("✓ 스피드고전송 버튼 클릭 (onclick 함수 직접 실행)")
+            except Exception as e:
+                print(f"  onclick 함수 실행 실패: {e}")
+        
+        if not clicked:
+            print("✗ 스피드고전송 버튼 클릭 실패")
+            return False
+        
+        # 처리 완료 대기 (팝업 창이 뜰 때까지 대기)
+        print("\n스피드고전송 팝업 창 대기 중...")
+        
+        # 팝업 레이어, 팝업 iframe, 팝업 폼 중 하나라도 나타나면 로드된 것으로 판단
+        popup_selectors = [
+            "iframe[id*='layui-layer-iframe']",
+            "iframe[src*='popup_setBulkProduct']",
+            "div[style*='background:#2c303b']",
+            "#mkForm",
+            "div.pup_images_tit",
+        ]
+        popup_element = wait_until(driver, any_element_present(popup_selectors), timeout=10, label="speedgo_popup")
+        popup_loaded = popup_element is not None
+        
+        if popup_loaded:
+            print("✓ 팝업 창이 열렸습니다.")
+        else:
+            print("⚠ 팝업 창이 감지되지 않았지만 계속 진행합니다...")
+        
+        # iframe으로 전환 (팝업 내부에 iframe이 있을 수 있음)
+        iframe_switched = False
+        try:
+            # iframe 찾기 (여러 방법 시도)
+            iframe_selectors = [
+                "iframe[id*='layui-layer-iframe']",
+                "iframe[name*='layui-layer-iframe']",
+                "iframe[src*='popup_setBulkProduct']",
+                "iframe"
+            ]
+            
+            for selector in iframe_selectors:
+                try:
+                    iframes = driver.find_elements(By.CSS_SELECTOR, selector)
+                    for iframe in iframes:
+                        iframe_src = iframe.get_attribute('src') or ''
+                        if 'popup_setBulkProduct' in iframe_src or 'layui-layer-iframe' in (iframe.get_attribute('id') or ''):
+                            print(f"✓ iframe 발견: {iframe.get_attribute('id')} (src: {iframe_src[:80]}...)")
+                            driver.switch_to.frame(iframe)
+                            iframe_switched = True
+                            print("✓ iframe으로 전환 완료")
+                            # iframe 내부 폼 버튼이 준비될 때까지 대기
+                            wait_until(driver, any_element_present(["#mkForm button", "button[onclick*='goProduct']"]),
+                                       timeout=10, label="popup_iframe_ready")
+                            break
+                    if iframe_switched:
+                        break
+                except Exception as e:
+                    continue
+        except Exception as e:
+            print(f"  iframe 전환 시도 중 오류 (계속 진행): {e}")
+        
+        # 팝업 창 내부에서 두 번째 스피드고전송 버튼 찾기
+        stages.enter('speedgo_send2')
+        print("\n팝업 창 내부에서 두 번째 스피드고전송 버튼 찾는 중...")
+        # 방법 1~3: XPath / CSS 선택자 (지난번에 맞았던 선택자부터 시도)
+        speedgo_button2 = SELECTOR_REGISTRY.find(driver, 'speedgo_send_button', [
+            (By.XPATH, "//*[@id='mkForm']/div/div[3]/div[11]/button[1]"),
+            "#mkForm > div > div.fr > div.cb.t50 > button:nth-child(1)",
+            "#mkForm button",
+        ])
+        if speedgo_button2:
+            print("✓ 두 번째 스피드고전송 버튼 찾음 (선택자)")
+        else:
+            # 방법 4: onclick="goProduct()" 속성으로 찾기
+            try:
+                buttons = driver.find_elements(By.CSS_SELECTOR, "button[onclick*='goProduct']")
+                for btn in buttons:
+                    onclick_attr = btn.get_attribute('onclick') or ''
+                    if 'goProduct' in onclick_attr:
+                        speedgo_button2 = btn
+                        print("✓ 두 번째 스피드고전송 버튼 찾음 (onclick='goProduct')")
+                        break
+            except Exception as e:
+                print(f"  onclick 검색 중 오류: {e}")
+        
+        # 방법 4: 텍스트와 onclick 조합으로 찾기
+        if not speedgo_button2:
+            try:
+                buttons = driver.find_elements(By.TAG_NAME, "button")
+                for btn in buttons:
+                    btn_text = btn.text.strip()
+                    btn_onclick = btn.get_attribute('onclick') or ''
+                    if ("스피드고전송" in btn_text or "스피드고" in btn_text) and "goProduct" in btn_onclick:
+                        speedgo_button2 = btn
+                        print("✓ 두 번째 스피드고전송 버튼 찾음 (텍스트 + onclick 검색)")
+                        break
+            except Exception as e:
+                print(f"  텍스트 검색 중 오류: {e}")
+        
+        # 방법 5: 클래스로 찾기
+        if not speedgo_button2:
+            try:
+                buttons = driver.find_elements(By.CSS_SELECTOR, "button.cont_btn1")
+                for btn in buttons:
+                    btn_onclick = btn.get_attribute('onclick') or ''
+                    btn_text = btn.text.strip()
+                    if 'goProduct' in btn_onclick:
+                        speedgo_button2 = btn
+                        print("✓ 두 번째 스피드고전송 버튼 찾음 (class='cont_btn1')")
+                        break
+            except Exception as e:
+                print(f"  클래스 검색 중 오류: {e}")
+        
+        if not speedgo_button2:
+            snapshot_id = DIAGNOSTICS.capture('speedgo_popup_button_missing', driver=driver,
+                                              iframe=iframe_switched)
+            print(f"✗ 두 번째 스피드고전송 버튼을 찾을 수 없습니다. (진단 스냅샷 #{snapshot_id})")
+            if not popup_loaded:
+                stages.finish('fail')
+                raise PopupNotFoundError(f"스피드고전송 팝업이 열리지 않았습니다 (진단 스냅샷 #{snapshot_id})")
+            return False
+        
+        # 버튼 정보 출력
+        button_text2 = speedgo_button2.text.strip()
+        button_onclick2 = speedgo_button2.get_attribute('onclick') or ''
+        print(f"  버튼 텍스트: '{button_text2}'")
+        print(f"  onclick 속성: '{button_onclick2}'")
+        
+        # 버튼이 보이도록 스크롤
+        print("\n두 번째 스피드고전송 버튼 클릭 시도...")
+        try:
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", speedgo_button2)
+        except:
+            pass
+        
+        # 버튼 클릭
+        clicked2 = False
+        
+        # 방법 1: 직접 클릭
+        try:
+            speedgo_button2.click()
+            clicked2 = True
+            print("✓ 두 번째 스피드고전송 버튼 클릭 (직접 클릭)")
+        except Exception as e:
+            print(f"  직접 클릭 실패: {e}")
+        
+        # 방법 2: JavaScript로 클릭
+        if not clicked2:
+            stages.retry()
+            try:
+                driver.execute_script("arguments[0].click();", speedgo_button2)
+                clicked2 = True
+                print("✓ 두 번째 스피드고전송 버튼 클릭 (JavaScript)")
+            except Exception as e:
+                print(f"  JavaScript 클릭 실패: {e}")
+        
+        # 방법 3: onclick 함수 직접 실행
+        if not clicked2:
+            stages.retry()
+            try:
+                if button_onclick2:
+                    driver.execute_script(button_onclick2)
+                    clicked2 = True
+                    print("✓ 두 번째 스피드고전송 버튼 클릭 (onclick 함수 직접 실행)")
+            except Exception as e:
+                print(f"  onclick 함수 실행 실패: {e}")
+        
+        if not clicked2:
+            print("✗ 두 번째 스피드고전송 버튼 클릭 실패")
+            return False
+        
+        # 처리 완료 대기 (폼 제출로 팝업이 다시 로드되거나, 알림창이 뜨거나, 전송 요청이 끝날 때까지)
+        print("\n두 번째 스피드고전송 처리 대기 중...")
+        wait_until(
+            driver,
+            EC.any_of(EC.staleness_of(speedgo_button2), EC.alert_is_present(), ajax_idle(min_wait=1.0)),
+            timeout=10,
+            label="speedgo_send",
+        )
+        
+        # iframe에서 나오기 (기본 컨텍스트로 복귀)
+        if iframe_switched:
+            try:
+                driver.switch_to.default_content()
+                print("✓ 기본 컨텍스트로 복귀")
+            except:
+                pass
+        
+        print("✓ 스피드고전송 완료!")
+        return True
+    finally:
+        # 팝업 iframe 안에서 끝났으면 기본 컨텍스트로 복귀 (재시도는 스피드고 이동부터 다시 시작)
+        try:
+            driver.switch_to.default_content()
+        except Exception:
+            pass
+
+
+def add_products_to_mybox(driver, product_ids=None, select_all=False, batch=True):
+    """
+    검색 결과에서 상품을 선택하고 마이박스에 담기
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        product_ids: 선택할 상품번호 리스트 (None이면 모든 상품 선택)
+        select_all: True면 모든 상품 선택
+        batch: True면 스크립트 한 번으로 체크박스를 일괄 선택 (실패 시 상품별 클릭으로 대체)
+    
+    Returns:
+        실제로 선택해 전송한 상품번호 리스트 (product_ids가 없고 상품별 클릭으로 선택했으면 빈 리스트),
+        실패하면 None
+    """
+    # 선택 → 마이박스담기 → 스피드고 이동 → 팝업 → 두 번째 전송을 단계별 구간으로 기록
+    stages = TRACER.sequence()
+    try:
+        stages.enter('mybox_select', products=len(product_ids) if product_ids else None)
+        print("\n마이박스에 상품 추가 중...")
+        
+        if select_all:
             # 전체 선택 버튼 찾기 (있는 경우)
             try:
                 select_all_btn = driver.find_element(By.CSS_SELECTOR, "input[type='checkbox'][onclick*='all'], input[type='checkbox'][id*='all'], input[type='checkbox'][name*='all']")
                 if not select_all_btn.is_selected():
                     select_all_btn.click()
                     print("✓ 전체 선택")
-                    time.sleep(0.5)
+                    wait_until(driver, checkbox_checked(select_all_btn), timeout=2, label="select_all_checked")
             except:
                 pass
         
         # 개별 상품 체크박스 선택
         if product_ids:
-            selected_count = 0
-            for product_id in product_ids:
+            selection = None
+            if batch:
                 try:
-                    # 체크박스 찾기 (여러 방법 시도)
-                    checkbox_selectors = [
-                        f"input[type='checkbox'][value='{product_id}']",
-                        f"input[type='checkbox'][name='item[]'][value='{product_id}']",
-                        f"input[type='checkbox'][id='{product_id}']",
-                        f"label[for='{product_id}'] input[type='checkbox']",
-                        f"#input_check3_{product_id}",
-                        f"input.input_check3[value='{product_id}']",
-                    ]
-                    
-                    checkbox = None
-                    for selector in checkbox_selectors:
-                        try:
-                            checkbox = driver.find_element(By.CSS_SELECTOR, selector)
-                            break
-                        except NoSuchElementException:
-                            continue
-                    
-                    if checkbox:
-                        # 체크박스가 보이도록 스크롤
-                        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", checkbox)
-                        time.sleep(0.3)
-                        
-                        # 현재 선택 상태 확인
-                        is_selected_before = checkbox.is_selected()
-                        print(f"  상품 {product_id}: 선택 전 상태 = {is_selected_before}")
-                        
-                        if not is_selected_before:
-                            # 체크박스 클릭 (여러 방법 시도)
-                            clicked = False
-                            
-                            # 방법 1: label을 통해 클릭 (가장 안정적)
-                            try:
-                                label = driver.find_element(By.CSS_SELECTOR, f"label[for='{product_id}']")
-                                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", label)
-                                time.sleep(0.2)
-                                label.click()
-                                clicked = True
-                                print(f"    → label 클릭 시도")
-                            except Exception as e:
-                                print(f"    → label 클릭 실패: {e}")
-                            
-                            # 방법 2: 체크박스 직접 클릭
-                            if not clicked:
-                                try:
-                                    checkbox.click()
-                                    clicked = True
-                                    print(f"    → 체크박스 직접 클릭 시도")
-                                except Exception as e:
-                                    print(f"    → 체크박스 직접 클릭 실패: {e}")
-                            
-                            # 방법 3: JavaScript로 강제 클릭
-                            if not clicked:
-                                try:
-                                    driver.execute_script("arguments[0].click();", checkbox)
-                                    clicked = True
-                                    print(f"    → JavaScript 클릭 시도")
-                                except Exception as e:
-                                    print(f"    → JavaScript 클릭 실패: {e}")
-                            
-                            time.sleep(0.5)
-                            
-                            # 클릭 후 선택 상태 확인
-                            is_selected_after = checkbox.is_selected()
-                            print(f"  상품 {product_id}: 선택 후 상태 = {is_selected_after}")
-                            
-                            if is_selected_after:
-                                selected_count += 1
-                                print(f"✓ 상품 {product_id} 선택 성공!")
-                            else:
-                                # 강제로 체크 상태 변경 시도
-                                try:
-                                    driver.execute_script("arguments[0].checked = true;", checkbox)
-                                    driver.execute_script("arguments[0].dispatchEvent(new Event('change'));", checkbox)
-                                    time.sleep(0.3)
-                                    is_selected_final = checkbox.is_selected()
-                                    if is_selected_final:
-                                        selected_count += 1
-                                        print(f"✓ 상품 {product_id} 강제 선택 성공!")
-                                    else:
-                                        print(f"✗ 상품 {product_id} 선택 실패 (강제 시도 후에도 실패)")
-                                except Exception as e:
-                                    print(f"✗ 상품 {product_id} 강제 선택 실패: {e}")
-                        else:
-                            selected_count += 1
-                            print(f"✓ 상품 {product_id} 이미 선택됨")
-                    else:
-                        print(f"✗ 상품 {product_id} 체크박스를 찾을 수 없음")
+                    selection = select_product_checkboxes(driver, product_ids)
                 except Exception as e:
-                    print(f"✗ 상품 {product_id} 선택 실패: {e}")
-                    continue
+                    print(f"⚠ 일괄 선택 실패, 상품별 선택으로 전환: {e}")
+            if selection is None:
+                if batch:
+                    stages.retry()
+                selection = select_product_checkboxes_legacy(driver, product_ids)
+            
+            selected = {str(pid) for pid, ok in selection.items() if ok}
+            selected_ids = [pid for pid in product_ids if str(pid) in selected]
+            selected_count = len(selected_ids)
+            failed_ids = [pid for pid in product_ids if str(pid) not in selected]
+            print(f"✓ {selected_count}/{len(selection)}개 상품 선택")
+            if failed_ids:
+                print(f"✗ 선택하지 못한 상품: {', '.join(str(pid) for pid in failed_ids)}")
             
             if selected_count == 0:
                 print("✗ 선택된 상품이 없습니다.")
-                return False
+                return None
         else:
             # product_ids가 없으면 모든 체크박스 선택 시도
             try:
-                checkboxes = driver.find_elements(By.CSS_SELECTOR, "input[type='checkbox'][name='item[]']")
-                selected_count = 0
-                for checkbox in checkboxes:
-                    if not checkbox.is_selected():
-                        try:
-                            driver.execute_script("arguments[0].scrollIntoView(true);", checkbox)
-                            time.sleep(0.1)
-                            checkbox.click()
-                            selected_count += 1
-                        except:
-                            pass
+                if batch:
+                    selection = select_product_checkboxes(driver, None)
+                    selected_ids = [pid for pid, ok in selection.items() if ok]
+                    selected_count = len(selected_ids)
+                else:
+                    # 상품별 클릭으로는 상품번호를 알 수 없음
+                    selected_ids = []
+                    checkboxes = driver.find_elements(By.CSS_SELECTOR, "input[type='checkbox'][name='item[]']")
+                    selected_count = 0
+                    for checkbox in checkboxes:
+                        if not checkbox.is_selected():
+                            try:
+                                driver.execute_script("arguments[0].scrollIntoView(true);", checkbox)
+                                checkbox.click()
+                                selected_count += 1
+                            except:
+                                pass
                 print(f"✓ {selected_count}개 상품 선택")
             except Exception as e:
                 print(f"✗ 체크박스 선택 중 오류: {e}")
-                return False
+                return None
         
         # 선택된 체크박스 개수 확인
         try:
@@ -437,13 +2615,12 @@ def add_products_to_mybox(driver, product_ids=None, select_all=False):
             print(f"\n✓ 현재 선택된 체크박스 개수: {len(selected_checkboxes)}개")
             if len(selected_checkboxes) == 0:
                 print("⚠ 경고: 선택된 체크박스가 없습니다!")
-                return False
+                return None
         except Exception as e:
             print(f"⚠ 체크박스 확인 중 오류: {e}")
         
-        time.sleep(1)
-        
         # 마이박스담기 버튼 찾기 및 클릭
+        stages.enter('mybox_click')
         print("\n마이박스담기 버튼 찾는 중...")
         
         # 중요: onclick="hashTagAdd()"를 가진 버튼만 찾기 (선택상품DB담기는 onclick="itemSave()")
@@ -501,21 +2678,13 @@ def add_products_to_mybox(driver, product_ids=None, select_all=False):
                 print(f"  클래스 검색 중 오류: {e}")
         
         if not mybox_button:
-            print("✗ 마이박스담기 버튼을 찾을 수 없습니다.")
-            # 디버깅: 모든 버튼 출력
-            try:
-                all_buttons = driver.find_elements(By.TAG_NAME, "button")
-                print(f"  페이지의 모든 버튼 ({len(all_buttons)}개):")
-                for i, btn in enumerate(all_buttons[:10], 1):  # 처음 10개만
-                    print(f"    {i}. 텍스트: '{btn.text.strip()}', onclick: '{btn.get_attribute('onclick') or ''}'")
-            except:
-                pass
-            return False
+            snapshot_id = DIAGNOSTICS.capture('mybox_button_missing', driver=driver)
+            print(f"✗ 마이박스담기 버튼을 찾을 수 없습니다. (진단 스냅샷 #{snapshot_id})")
+            return None
         
         # 버튼이 보이도록 스크롤
         print("\n마이박스담기 버튼 클릭 시도...")
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", mybox_button)
-        time.sleep(0.5)
         
         # 버튼이 보이는지 확인
         is_displayed = mybox_button.is_displayed()
@@ -536,6 +2705,7 @@ def add_products_to_mybox(driver, product_ids=None, select_all=False):
         
         # 방법 2: JavaScript로 클릭
         if not clicked:
+            stages.retry()
             try:
                 driver.execute_script("arguments[0].click();", mybox_button)
                 clicked = True
@@ -545,6 +2715,7 @@ def add_products_to_mybox(driver, product_ids=None, select_all=False):
         
         # 방법 3: onclick 함수 직접 실행
         if not clicked:
+            stages.retry()
             try:
                 onclick_attr = mybox_button.get_attribute('onclick')
                 if onclick_attr:
@@ -556,11 +2727,11 @@ def add_products_to_mybox(driver, product_ids=None, select_all=False):
         
         if not clicked:
             print("✗ 마이박스담기 버튼 클릭 실패")
-            return False
+            return None
         
-        # 처리 완료 대기
+        # 처리 완료 대기 (마이박스담기 요청이 끝날 때까지)
         print("\n마이박스담기 처리 대기 중...")
-        time.sleep(3)
+        wait_until(driver, ajax_idle(min_wait=0.5), timeout=10, label="mybox_add")
         
         # 성공 메시지 확인 (있는 경우)
         try:
@@ -569,1097 +2740,2812 @@ def add_products_to_mybox(driver, product_ids=None, select_all=False):
         except:
             pass
         
-        print("✓ 마이박스에 상품 추가 완료!")
+        print("✓ 마이박스에 상품 추가 완료!")
+        
+        # 스피드고 이동 → 전체 선택 → 스피드고전송 (팝업이 나타나지 않으면 스피드고 이동부터 재시도)
+        if not call_with_retries(send_mybox_to_speedgo, driver, stages, description="스피드고전송"):
+            return None
+        
+        stages.finish('ok')
+        return selected_ids
+        
+    except CircuitOpenError:
+        stages.finish('error')
+        raise
+    except Exception as e:
+        stages.finish('error')
+        # 예외 발생 시에도 iframe에서 나오기
+        try:
+            driver.switch_to.default_content()
+        except:
+            pass
+        print(f"✗ 마이박스담기 중 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+    finally:
+        # return None로 중간에 끝난 단계
+        stages.finish('fail')
+
+
+def wait_for_search_results(driver, timeout=10):
+    """
+    검색 결과 카드가 나타나고, 스크롤 후 카드 수가 더 이상 늘지 않을 때까지 대기
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        timeout: 각 대기 단계의 최대 시간 (초)
+    
+    Returns:
+        검색 결과 페이지가 로드되었는지 여부 (bool, 필터 때문에 카드가 0개인 결과 페이지도 True)
+    """
+    result_selectors = [".sub_cont_bane1", ".sub_cont_bane1_SetListGallery"]
+    page_selectors = result_selectors + [f"[onclick*='{SEARCH_PAGE_MARKER}']"]
+    with TRACER.span('wait_results') as span:
+        found = wait_until(driver, any_element_present(page_selectors), timeout=timeout, label="results_present")
+        if not found:
+            span.outcome = 'timeout'
+            print("⚠ 검색 결과 요소를 찾지 못했지만 계속 진행합니다...")
+            return False
+    print("✓ 검색 결과 요소 로드 완료")
+    
+    # 카드 없이 마이박스담기 버튼만 있는 결과 페이지(필터에 맞는 상품 없음)는 카드 수를 기다리지 않음
+    if not driver.find_elements(By.CSS_SELECTOR, ", ".join(result_selectors)):
+        return True
+    
+    # 페이지 스크롤하여 동적 콘텐츠 로드 후 카드 수가 안정될 때까지 대기
+    with TRACER.span('scroll') as span:
+        try:
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            if not wait_until(driver, element_count_stable(", ".join(result_selectors)), timeout=timeout,
+                              label="results_stable"):
+                span.outcome = 'timeout'
+            driver.execute_script("window.scrollTo(0, 0);")
+        except Exception:
+            span.outcome = 'error'
+    return True
+
+
+def search_products(search_keyword, headless=True, max_results=None, use_direct_url=False, min_price=None, username=None, password=None, return_driver=False,
+                    fast_delivery=None, min_grade=None):
+    """
+    도매꾹 사이트에서 상품 검색
+    
+    Args:
+        search_keyword: 검색할 키워드
+        headless: 헤드리스 모드 사용 여부
+        max_results: 가져올 최대 결과 수 (None이면 모두 가져옴)
+        use_direct_url: True면 검색 폼 대신 직접 URL로 접근
+        min_price: 최소 가격 (이 가격 이상인 상품만 필터링, 예: 12000)
+        username: 로그인 아이디 (None이면 사용자 입력 요청)
+        password: 비밀번호 (None이면 사용자 입력 요청)
+        fast_delivery: True면 빠른배송 상품만
+        min_grade: 최소 판매자 등급
+    
+    Returns:
+        검색 결과 리스트 (딕셔너리 형태)
+    
+    직접 URL 접근 방식에서는 필터를 검색 URL에 넣어 서버에서 먼저 거르고, 이동/대기/파싱을
+    실패 종류별로 재시도한다 (search_with_driver 참고). 재시도 후에도 실패하면 빈 리스트를 반환한다.
+    여러 페이지에 걸쳐 필터링된 상품을 필요한 만큼만 가져오려면 iter_search_products()를 사용한다.
+    """
+    driver = None
+    
+    # 직접 URL 접근 방식
+    if use_direct_url:
+        try:
+            print(f"\n검색어 '{search_keyword}'로 직접 URL 접근...")
+            driver = get_chrome_driver(headless=headless)
+            
+            # 먼저 로그인 (저장된 세션이 유효하면 로그인 폼 생략)
+            if not ensure_login(driver, username=username, password=password):
+                print("✗ 로그인 실패로 검색을 중단합니다.")
+                if driver:
+                    driver.quit()
+                return []
+            
+            # 검색 페이지로 이동 → 대기 → 파싱 (실패 종류별 재시도 포함)
+            results = search_with_driver(driver, search_keyword, max_results=max_results, min_price=min_price,
+                                         fast_delivery=fast_delivery, min_grade=min_grade)
+            if min_price:
+                print(f"\n✓ 검색 완료! {min_price:,}원 이상 상품 {len(results)}개 발견")
+            else:
+                print(f"\n✓ 검색 완료! 총 {len(results)}개 결과 발견")
+            
+            if return_driver:
+                return results, driver
+            return results
+        
+        except CircuitOpenError:
+            # 사이트 실패가 계속되어 실행 전체를 끝내는 경우이므로 빈 결과로 바꾸지 않음
+            if driver:
+                driver.quit()
+            raise
+        except Exception as e:
+            print(f"✗ 직접 URL 접근 실패 (재시도 후): {e}")
+            import traceback
+            traceback.print_exc()
+            if return_driver:
+                return [], driver if driver else None
+            if driver:
+                driver.quit()
+            return []
+    
+    # 검색 폼 사용 방식 (기존 방식)
+    url = f"{DOMEMEDB_URL}/index/?mainChannel=aihome"
+    
+    try:
+        print(f"\n검색어 '{search_keyword}'로 검색 시작...")
+        driver = get_chrome_driver(headless=headless)
+        
+        # 먼저 로그인 (저장된 세션이 유효하면 로그인 폼 생략)
+        if not ensure_login(driver, username=username, password=password):
+            print("✗ 로그인 실패로 검색을 중단합니다.")
+            if driver:
+                driver.quit()
+            return []
+        
+        # 메인 페이지로 이동
+        driver.get(url)
+        
+        # 페이지 로딩 대기
+        wait_until(driver, document_ready(), timeout=10, label="main_page")
+        
+        # 검색창 찾기 (여러 가능한 선택자 시도)
+        # name="sw"가 가장 정확한 선택자이므로 우선 시도
+        search_selectors = [
+            "input[name='sw']",  # 정확한 name 속성으로 검색
+            "input[type='text'][name='sw']",  # type과 name 조합
+            "input[title='검색'][name='sw']",  # title과 name 조합
+            "input[type='text'][name*='search']",
+            "input[type='text'][id*='search']",
+            "input[type='text'][class*='search']",
+            "input[placeholder*='상품명']",
+            "input[placeholder*='검색']",
+            "#searchKeyword",
+            ".search-input",
+            "input.form-control",
+        ]
+        
+        # 선택자마다 3초씩 기다리지 않고, 어느 하나라도 나타나면 바로 사용
+        search_input = SELECTOR_REGISTRY.wait_find(driver, 'search_input', search_selectors, timeout=5)
+        if search_input:
+            print("✓ 검색창 찾음")
+        
+        if not search_input:
+            # name 속성으로 직접 찾기 시도
+            try:
+                search_input = driver.find_element(By.NAME, "sw")
+                print("✓ 검색창 찾음: name='sw'")
+            except NoSuchElementException:
+                pass
+        
+        if not search_input:
+            # 모든 input 요소 확인
+            inputs = driver.find_elements(By.TAG_NAME, "input")
+            for inp in inputs:
+                inp_name = inp.get_attribute("name") or ""
+                inp_type = inp.get_attribute("type")
+                inp_title = inp.get_attribute("title") or ""
+                if inp_name == "sw" or (inp_type == "text" and "검색" in inp_title):
+                    search_input = inp
+                    print(f"✓ 검색창 찾음 (name={inp_name}, title={inp_title})")
+                    break
+        
+        if not search_input:
+            raise Exception("검색창을 찾을 수 없습니다.")
+        
+        # 검색어 입력
+        search_input.clear()
+        search_input.send_keys(search_keyword)
+        
+        # 검색 버튼 찾기 및 클릭 또는 Enter 키 입력
+        search_button_selectors = [
+            "button[type='submit']",
+            "button.btn-search",
+            "button[class*='search']",
+            "input[type='submit']",
+            ".search-btn",
+            "#searchBtn",
+        ]
+        
+        search_button = SELECTOR_REGISTRY.find(driver, 'search_button', search_button_selectors)
+        if search_button:
+            print("✓ 검색 버튼 찾음")
+        
+        # 현재 URL 저장 (검색 전)
+        initial_url = driver.current_url
+        print(f"검색 전 URL: {initial_url}")
+        
+        if search_button:
+            search_button.click()
+        else:
+            # 검색 버튼을 찾지 못하면 Enter 키 입력
+            search_input.send_keys(Keys.RETURN)
+            print("✓ Enter 키로 검색 실행")
+        
+        # 검색 결과 페이지 로딩 대기
+        print("검색 결과 페이지 로딩 대기 중...")
+        
+        # URL 변경 확인 (supplyList.php로 이동하는지 확인)
+        try:
+            # URL이 변경되고 supplyList.php를 포함하는지 확인
+            WebDriverWait(driver, 15).until(
+                lambda d: (
+                    "supplyList.php" in d.current_url or 
+                    "search" in d.current_url.lower() or
+                    d.current_url != initial_url
+                )
+            )
+            print(f"✓ 검색 결과 페이지로 이동: {driver.current_url}")
+            
+            # URL에서 검색어 확인
+            parsed_url = urlparse(driver.current_url)
+            query_params = parse_qs(parsed_url.query)
+            if 'sw' in query_params:
+                decoded_keyword = query_params['sw'][0]
+                print(f"✓ URL에서 검색어 확인: {decoded_keyword}")
+            
+        except TimeoutException:
+            print("⚠ URL 변경이 감지되지 않았지만 계속 진행합니다...")
+        
+        # 검색 결과 카드가 모두 로드될 때까지 대기
+        wait_for_search_results(driver)
         
-        # 스피드고 사이트로 이동
-        print("\n스피드고 사이트로 이동 중...")
-        speedgo_url = "https://speedgo.domeggook.com/"
-        driver.get(speedgo_url)
+        # 검색 결과 파싱
+        results = parse_search_results(driver, max_results, min_price=min_price, fast_delivery=fast_delivery,
+                                       min_grade=min_grade)
         
-        # 페이지 로딩 대기
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        time.sleep(2)
-        print(f"✓ 스피드고 사이트 접속 완료: {driver.current_url}")
+        if min_price:
+            print(f"\n✓ 검색 완료! {min_price:,}원 이상 상품 {len(results)}개 발견")
+        else:
+            print(f"\n✓ 검색 완료! 총 {len(results)}개 결과 발견")
         
-        # 마이박스 메뉴 클릭
-        print("\n마이박스 메뉴 클릭 중...")
-        mybox_selectors = [
-            "a[href*='mybox/mb_saveList.php']",
-            "a.cur[href*='mybox']",
-            "a:contains('마이박스')",
-        ]
+        if return_driver:
+            return results, driver
+        return results
         
-        mybox_link = None
-        for selector in mybox_selectors:
-            try:
-                mybox_link = driver.find_element(By.CSS_SELECTOR, selector)
-                link_text = mybox_link.text.strip()
-                link_href = mybox_link.get_attribute('href') or ''
-                print(f"✓ 마이박스 링크 찾음: {selector}")
-                print(f"  링크 텍스트: '{link_text}'")
-                print(f"  링크 주소: '{link_href}'")
+    except Exception as e:
+        print(f"✗ 검색 실패: {e}")
+        import traceback
+        traceback.print_exc()
+        if return_driver:
+            return [], driver if driver else None
+        if driver and not return_driver:
+            driver.quit()
+        return []
+
+
+def extract_price_number(price_text):
+    """
+    가격 텍스트에서 숫자만 추출
+    
+    Args:
+        price_text: 가격 텍스트 (예: "29,530원", "12,000원")
+    
+    Returns:
+        가격 숫자 (int), 파싱 실패시 None
+    """
+    if not price_text:
+        return None
+    
+    # 콤마, 원, 공백 제거 후 숫자만 추출
+    cleaned = price_text.replace(',', '').replace('원', '').replace(' ', '').strip()
+    
+    # 숫자만 추출 (정규식 사용)
+    numbers = re.findall(r'\d+', cleaned)
+    if numbers:
+        try:
+            return int(''.join(numbers))
+        except ValueError:
+            return None
+    return None
+
+
+# 상품 카드(.sub_cont_bane1)를 브라우저 안에서 한 번에 순회하며 원시 값을 수집하는 스크립트
+# parse_search_results_legacy()와 같은 선택자/우선순위를 사용하고,
+# 값의 해석(가격 숫자 변환, 등급 추출 등)은 build_product_info()에서 Python으로 처리한다.
+BULK_EXTRACT_JS = r"""
+var limit = arguments[0];
+var containerSelectors = ['.sub_cont_bane1', '.sub_cont_bane1_SetListGallery'];
+var cards = [];
+var usedSelector = null;
+for (var i = 0; i < containerSelectors.length; i++) {
+    cards = document.querySelectorAll(containerSelectors[i]);
+    if (cards.length > 0) {
+        usedSelector = containerSelectors[i];
+        break;
+    }
+}
+
+// Selenium의 .text와 같이 화면에 보이지 않는 요소는 빈 문자열로 처리
+function textOf(el) {
+    if (!el) return null;
+    if (!el.getClientRects().length) return '';
+    return (el.innerText || '').trim();
+}
+function first(root, selector) {
+    return root.querySelector(selector);
+}
+function all(root, selector) {
+    return Array.prototype.slice.call(root.querySelectorAll(selector));
+}
+
+var priceSelectors = [
+    ['.main_cont_text1.priceLg strong', true],
+    ['.priceLg strong', true],
+    ['.main_cont_text1.priceLg', false],
+    ['.priceLg', false]
+];
+
+var out = [];
+var count = limit ? Math.min(limit, cards.length) : cards.length;
+for (var c = 0; c < count; c++) {
+    var card = cards[c];
+
+    var checkbox = first(card, "input[name='item[]']");
+
+    var priceTexts = priceSelectors.map(function (entry) {
+        var el = first(card, entry[0]);
+        if (!el) return null;
+        if (entry[1]) return textOf(el);
+        var strong = first(el, 'strong');
+        return strong ? textOf(strong) : textOf(el);
+    });
+
+    var baneImg = first(card, '.bane_brd1 img');
+
+    var seller = first(card, "a[onclick*='supplyList']");
+
+    out.push({
+        checkbox_value: checkbox ? checkbox.value : null,
+        txt8_texts: all(card, 'span.txt8').map(textOf),
+        item_name: textOf(first(card, '.itemName')),
+        alt_name: textOf(first(card, '.main_cont_text1.b')),
+        price_texts: priceTexts,
+        strong_texts: all(card, 'strong').map(textOf),
+        bane_image: baneImg ? (baneImg.src || baneImg.getAttribute('data-src') || '') : null,
+        image_srcs: baneImg ? [] : all(card, 'img').map(function (img) { return img.src || ''; }),
+        seller: seller ? textOf(seller) : null,
+        grade_blocks: all(card, '.main_cont_text3').map(function (el) {
+            var strong = first(el, 'strong');
+            return {text: textOf(el), strong: strong ? textOf(strong) : null};
+        }),
+        fast_delivery: !!first(card, '.main_cont_bu9')
+    });
+}
+return {selector: usedSelector, total: cards.length, cards: out};
+"""
+
+
+def build_product_info(raw):
+    """
+    BULK_EXTRACT_JS가 수집한 상품 카드 원시 값을 결과 딕셔너리로 변환
+    
+    parse_search_results_legacy()의 판단 규칙을 그대로 따르므로
+    두 방식의 결과 스키마(키 순서 포함)는 동일하다.
+    
+    Args:
+        raw: 상품 카드 하나의 원시 값 (딕셔너리)
+    
+    Returns:
+        상품 정보 딕셔너리
+    """
+    product_info = {}
+    
+    # 상품번호 (우선순위: input value > span.txt8)
+    product_id = raw.get('checkbox_value')
+    if not product_id:
+        for text in raw.get('txt8_texts') or []:
+            text = (text or '').strip()
+            if text.isdigit() and len(text) >= 6:
+                product_id = text
                 break
-            except NoSuchElementException:
+    product_info['product_id'] = product_id or ''
+    
+    # 상품명 (.itemName > .main_cont_text1.b)
+    if raw.get('item_name') is not None:
+        product_info['name'] = raw['item_name']
+    else:
+        product_info['name'] = raw.get('alt_name') or ''
+    
+    # 가격 (선택자 우선순위대로, 100원 이상인 첫 값)
+    price_value = None
+    price_display = ''
+    for price_text in raw.get('price_texts') or []:
+        if not price_text:
+            continue
+        price_value = extract_price_number(price_text)
+        if price_value is not None and price_value >= 100:
+            price_display = f"{price_value:,}원"
+            break
+    
+    # 위 방법들이 모두 실패하면 모든 strong 태그에서 찾기
+    if price_value is None:
+        for text in raw.get('strong_texts') or []:
+            if not text:
                 continue
-        
-        if not mybox_link:
-            # 텍스트로 찾기 시도
-            try:
-                links = driver.find_elements(By.TAG_NAME, "a")
-                for link in links:
-                    link_text = link.text.strip()
-                    link_href = link.get_attribute('href') or ''
-                    if "마이박스" in link_text and "mybox" in link_href:
-                        mybox_link = link
-                        print(f"✓ 마이박스 링크 찾음 (텍스트 검색)")
-                        print(f"  링크 텍스트: '{link_text}'")
-                        print(f"  링크 주소: '{link_href}'")
-                        break
-            except Exception as e:
-                print(f"  텍스트 검색 중 오류: {e}")
-        
-        if not mybox_link:
-            print("✗ 마이박스 링크를 찾을 수 없습니다.")
-            # 직접 URL로 이동 시도
+            temp_value = extract_price_number(text)
+            if temp_value is not None and 100 <= temp_value <= 10000000:
+                price_value = temp_value
+                price_display = f"{price_value:,}원"
+                break
+    
+    product_info['price'] = price_display
+    product_info['price_value'] = price_value
+    
+    # 이미지 (.bane_brd1 img > 상품 업로드 이미지)
+    if raw.get('bane_image') is not None:
+        product_info['image'] = raw['bane_image']
+    else:
+        for src in raw.get('image_srcs') or []:
+            if 'domeggook.com' in src and 'upload/item' in src:
+                product_info['image'] = src
+                break
+    
+    # 판매자
+    product_info['seller'] = raw.get('seller') or ''
+    
+    # 상품 상세 링크
+    if product_id:
+        product_info['link'] = f"{DOMEMEDB_URL}/index/item/itemView.php?itemNo={product_id}"
+    else:
+        product_info['link'] = ''
+    
+    # 등급
+    for block in raw.get('grade_blocks') or []:
+        text = block.get('text') or ''
+        if '등급' in text:
+            if block.get('strong') is not None:
+                product_info['grade'] = block['strong']
+                break
+            match = re.search(r'(\d+)등급', text)
+            if match:
+                product_info['grade'] = match.group(1)
+                break
+    
+    # 빠른배송 여부
+    product_info['fast_delivery'] = bool(raw.get('fast_delivery'))
+    
+    return product_info
+
+
+def grade_number(grade):
+    """등급 문자열('9')을 비교 가능한 정수로 변환 (없으면 None)"""
+    if grade is None:
+        return None
+    text = str(grade).strip()
+    return int(text) if text.isdigit() else None
+
+
+def passes_product_filters(product_info, idx, min_price=None, fast_delivery=None, min_grade=None):
+    """
+    파싱된 상품이 결과에 포함될 조건(최소 가격, 빠른배송, 판매자 등급, 상품명 존재)을 만족하는지 확인
+    
+    검색 URL에 넣은 필터를 서버가 적용하지 않았을 때를 대비한 안전장치이기도 하다.
+    
+    Args:
+        product_info: 상품 정보 딕셔너리
+        idx: 페이지 내 상품 순번 (0부터 시작, 로그 출력용)
+        min_price: 최소 가격 (None이면 가격 필터링 안 함)
+        fast_delivery: True면 빠른배송 상품만 통과
+        min_grade: 최소 판매자 등급 (None이면 등급 필터링 안 함)
+    
+    Returns:
+        결과에 포함할지 여부 (bool)
+    """
+    if min_price is not None:
+        if product_info.get('price_value') is None:
+            print(f"상품 {idx+1}: 가격을 파싱할 수 없어 건너뜀")
+            return False
+        if product_info['price_value'] < min_price:
+            print(f"상품 {idx+1}: 가격 {product_info.get('price', 'N/A')}이(가) 최소 가격 {min_price:,}원 미만이어서 건너뜀")
+            return False
+    
+    if fast_delivery and not product_info.get('fast_delivery'):
+        print(f"상품 {idx+1}: 빠른배송 상품이 아니어서 건너뜀")
+        return False
+    
+    if min_grade is not None:
+        grade = grade_number(product_info.get('grade'))
+        if grade is None or grade < min_grade:
+            print(f"상품 {idx+1}: 판매자 등급 {product_info.get('grade') or '없음'}이(가) 최소 등급 {min_grade} 미만이어서 건너뜀")
+            return False
+    
+    if not product_info.get('name'):
+        print(f"상품 {idx+1}: 상품명을 찾을 수 없어 건너뜀")
+        return False
+    
+    return True
+
+
+def parse_search_results(driver, max_results=None, min_price=None, bulk=True, fast_delivery=None, min_grade=None):
+    """
+    검색 결과 페이지에서 상품 정보 파싱
+    
+    기본적으로 execute_script 한 번으로 모든 상품 카드를 읽는 일괄 추출 방식을 사용하고,
+    실패하면 상품 카드마다 WebElement를 조회하는 기존 방식으로 다시 파싱한다.
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        max_results: 가져올 최대 결과 수 (가격 필터링을 통과한 상품 기준)
+        min_price: 최소 가격 (이 가격 이상인 상품만 필터링)
+        bulk: True면 일괄 추출 방식 사용, False면 기존 방식만 사용
+        fast_delivery: True면 빠른배송 상품만
+        min_grade: 최소 판매자 등급
+    
+    Returns:
+        상품 정보 리스트
+    """
+    with TRACER.span('parse', method='bulk' if bulk else 'legacy') as span:
+        if bulk:
             try:
-                mybox_url = "https://speedgo.domeggook.com/mybox/mb_saveList.php"
-                driver.get(mybox_url)
-                print(f"✓ 마이박스 페이지로 직접 이동: {mybox_url}")
-                time.sleep(2)
-                return True
+                results = parse_search_results_bulk(driver, max_results, min_price=min_price,
+                                                    fast_delivery=fast_delivery, min_grade=min_grade)
+                if results is not None:
+                    span.attrs['products'] = len(results)
+                    return results
             except Exception as e:
-                print(f"✗ 마이박스 페이지 이동 실패: {e}")
-                return False
+                print(f"⚠ 일괄 추출 실패, 기존 방식으로 다시 파싱합니다: {e}")
+            span.attrs['method'] = 'legacy'
+            span.retry()
         
-        # 링크 클릭
+        results = parse_search_results_legacy(driver, max_results, min_price=min_price,
+                                              fast_delivery=fast_delivery, min_grade=min_grade)
+        span.attrs['products'] = len(results)
+        return results
+
+
+def parse_search_results_bulk(driver, max_results=None, min_price=None, fast_delivery=None, min_grade=None):
+    """
+    execute_script 한 번으로 검색 결과 페이지의 모든 상품 카드를 파싱
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        max_results: 가져올 최대 결과 수
+        min_price: 최소 가격 (이 가격 이상인 상품만 필터링)
+    
+    Returns:
+        상품 정보 리스트, 상품 카드를 찾지 못하면 None
+    """
+    # max_results는 필터링 후 개수 기준이므로 카드는 모두 읽음
+    extracted = driver.execute_script(BULK_EXTRACT_JS, None)
+    if not extracted or not extracted.get('selector'):
+        return None
+    
+    print(f"✓ 상품 요소 찾음: {extracted['selector']} ({extracted['total']}개, 일괄 추출)")
+    
+    notes = []
+    results = build_results_from_raw_cards(extracted.get('cards') or [], min_price=min_price, max_results=max_results,
+                                           notes=notes, fast_delivery=fast_delivery, min_grade=min_grade)
+    if notes:
+        snapshot_id = DIAGNOSTICS.capture('price_missing', driver=driver, notes=notes)
+        print(f"⚠ 가격을 찾지 못한 상품 {len(notes)}개 (진단 스냅샷 #{snapshot_id})")
+    return results
+
+
+def build_results_from_raw_cards(raw_cards, min_price=None, max_results=None, notes=None, fast_delivery=None,
+                                 min_grade=None):
+    """
+    상품 카드 원시 값 리스트를 필터링된 상품 정보 리스트로 변환
+    
+    Args:
+        raw_cards: 상품 카드 원시 값 리스트 (BULK_EXTRACT_JS 또는 extract_raw_cards_from_html 결과)
+        min_price: 최소 가격 (이 가격 이상인 상품만 필터링)
+        max_results: 필터링을 통과한 상품을 이 개수만큼 모으면 중단 (None이면 모두)
+        notes: 리스트를 넘기면 가격을 찾지 못한 카드의 번호와 가격 후보를 추가 (DIAGNOSTICS 스냅샷용)
+        fast_delivery: True면 빠른배송 상품만
+        min_grade: 최소 판매자 등급
+    
+    Returns:
+        상품 정보 리스트
+    """
+    results = []
+    for idx, raw in enumerate(raw_cards):
+        if max_results and len(results) >= max_results:
+            break
         try:
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", mybox_link)
-            time.sleep(0.5)
-            mybox_link.click()
-            print("✓ 마이박스 메뉴 클릭 완료")
-            time.sleep(2)
+            product_info = build_product_info(raw)
             
-            # 페이지 이동 확인
-            current_url = driver.current_url
-            if "mybox" in current_url.lower():
-                print(f"✓ 마이박스 페이지 이동 완료: {current_url}")
-            else:
-                print(f"⚠ 현재 URL: {current_url} (마이박스 페이지가 아닐 수 있음)")
+            if product_info['price_value'] is None and notes is not None:
+                notes.append({'card': idx + 1, 'reason': 'price_missing', 'price_texts': raw.get('price_texts')})
+            
+            if passes_product_filters(product_info, idx, min_price=min_price, fast_delivery=fast_delivery,
+                                      min_grade=min_grade):
+                results.append(product_info)
         except Exception as e:
-            print(f"✗ 마이박스 메뉴 클릭 실패: {e}")
-            # 직접 URL로 이동 시도
+            print(f"상품 {idx+1} 파싱 중 오류: {e}")
+            continue
+    
+    return results
+
+
+def parse_search_results_legacy(driver, max_results=None, min_price=None, fast_delivery=None, min_grade=None):
+    """
+    검색 결과 페이지에서 상품 정보 파싱 (상품 카드마다 WebElement를 조회하는 기존 방식)
+    
+    Args:
+        driver: Selenium WebDriver 객체
+        max_results: 가져올 최대 결과 수
+        min_price: 최소 가격 (이 가격 이상인 상품만 필터링)
+    
+    Returns:
+        상품 정보 리스트
+    """
+    results = []
+    notes = []
+    
+    try:
+        # 도매꾹 사이트의 실제 상품 컨테이너 선택자
+        product_selectors = [
+            ".sub_cont_bane1",  # 메인 상품 컨테이너
+            ".sub_cont_bane1_SetListGallery",  # 갤러리 뷰 상품 컨테이너
+        ]
+        
+        products = []
+        for selector in product_selectors:
             try:
-                mybox_url = "https://speedgo.domeggook.com/mybox/mb_saveList.php"
-                driver.get(mybox_url)
-                print(f"✓ 마이박스 페이지로 직접 이동: {mybox_url}")
-                time.sleep(2)
+                products = driver.find_elements(By.CSS_SELECTOR, selector)
+                if len(products) > 0:
+                    print(f"✓ 상품 요소 찾음: {selector} ({len(products)}개)")
+                    break
             except:
-                pass
-        
-        # 마이박스 페이지에서 전체 선택 및 스피드고전송
-        print("\n마이박스 페이지에서 전체 선택 및 스피드고전송 준비 중...")
-        time.sleep(2)
+                continue
         
-        # 전체 선택 체크박스 찾기 및 선택
-        print("\n전체 선택 체크박스 찾는 중...")
-        select_all_checkbox = None
+        if not products:
+            snapshot_id = DIAGNOSTICS.capture('no_products', driver=driver)
+            print(f"상품 요소를 찾지 못했습니다. (진단 스냅샷 #{snapshot_id})")
+            return results
         
-        try:
-            # id="selectAll" 체크박스 찾기
-            select_all_checkbox = driver.find_element(By.ID, "selectAll")
-            print("✓ 전체 선택 체크박스 찾음 (id='selectAll')")
-        except NoSuchElementException:
-            # 다른 선택자 시도
+        # 각 상품 정보 추출 (max_results는 필터링을 통과한 상품 기준)
+        for idx, product in enumerate(products):
+            if max_results and len(results) >= max_results:
+                break
             try:
-                select_all_checkbox = driver.find_element(By.CSS_SELECTOR, "input[name='selectAll']")
-                print("✓ 전체 선택 체크박스 찾음 (name='selectAll')")
-            except:
-                try:
-                    select_all_checkbox = driver.find_element(By.CSS_SELECTOR, "input.checkbox1#selectAll")
-                    print("✓ 전체 선택 체크박스 찾음 (class='checkbox1' id='selectAll')")
-                except:
-                    pass
-        
-        if select_all_checkbox:
-            # 체크박스 선택 상태 확인
-            is_selected = select_all_checkbox.is_selected()
-            print(f"  전체 선택 체크박스 현재 상태: {is_selected}")
-            
-            if not is_selected:
-                # 체크박스가 보이도록 스크롤
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", select_all_checkbox)
-                time.sleep(0.5)
-                
-                # 체크박스 클릭 시도
-                clicked = False
+                product_info = {}
                 
-                # 방법 1: label을 통해 클릭
+                # 상품번호 추출 (우선순위: input value > span.txt8)
+                product_id = None
                 try:
-                    label = driver.find_element(By.CSS_SELECTOR, "label[for='selectAll']")
-                    label.click()
-                    clicked = True
-                    print("✓ 전체 선택 체크박스 클릭 (label 클릭)")
+                    # checkbox의 value 속성에서 상품번호 추출
+                    checkbox = product.find_element(By.CSS_SELECTOR, "input[name='item[]']")
+                    product_id = checkbox.get_attribute('value')
                 except:
                     pass
                 
-                # 방법 2: 체크박스 직접 클릭
-                if not clicked:
+                if not product_id:
+                    # span.txt8에서 상품번호 추출
                     try:
-                        select_all_checkbox.click()
-                        clicked = True
-                        print("✓ 전체 선택 체크박스 클릭 (직접 클릭)")
+                        product_id_elems = product.find_elements(By.CSS_SELECTOR, "span.txt8")
+                        for elem in product_id_elems:
+                            text = elem.text.strip()
+                            if text.isdigit() and len(text) >= 6:  # 상품번호는 보통 6자리 이상
+                                product_id = text
+                                break
                     except:
                         pass
                 
-                # 방법 3: JavaScript로 클릭
-                if not clicked:
+                product_info['product_id'] = product_id or ''
+                
+                # 상품명 추출 (.itemName 클래스)
+                try:
+                    name_elem = product.find_element(By.CSS_SELECTOR, ".itemName")
+                    product_info['name'] = name_elem.text.strip()
+                except:
+                    # 백업: main_cont_text1에서 추출
                     try:
-                        driver.execute_script("arguments[0].click();", select_all_checkbox)
-                        clicked = True
-                        print("✓ 전체 선택 체크박스 클릭 (JavaScript)")
+                        name_elem = product.find_element(By.CSS_SELECTOR, ".main_cont_text1.b")
+                        product_info['name'] = name_elem.text.strip()
                     except:
-                        pass
+                        product_info['name'] = ''
                 
-                # 방법 4: 강제로 체크 상태 변경
-                if not clicked:
+                # 가격 추출: <div class="main_cont_text1 priceLg"><strong>29,530</strong> 원</div>
+                price_value = None
+                price_display = ''
+                
+                # 다양한 선택자 시도
+                price_selectors = [
+                    (".main_cont_text1.priceLg strong", "방법1: .main_cont_text1.priceLg strong"),
+                    (".priceLg strong", "방법2: .priceLg strong"),
+                    (".main_cont_text1.priceLg", "방법3: .main_cont_text1.priceLg (전체)"),
+                    (".priceLg", "방법4: .priceLg (전체)"),
+                ]
+                
+                for selector, method_name in price_selectors:
                     try:
-                        driver.execute_script("arguments[0].checked = true;", select_all_checkbox)
-                        driver.execute_script("arguments[0].dispatchEvent(new Event('change'));", select_all_checkbox)
-                        print("✓ 전체 선택 체크박스 강제 선택")
-                    except:
+                        if "strong" in selector:
+                            # strong 태그 직접 찾기
+                            price_elem = product.find_element(By.CSS_SELECTOR, selector)
+                            price_text = price_elem.text.strip()
+                        else:
+                            # 컨테이너에서 strong 태그 찾기
+                            price_container = product.find_element(By.CSS_SELECTOR, selector)
+                            try:
+                                price_elem = price_container.find_element(By.CSS_SELECTOR, "strong")
+                                price_text = price_elem.text.strip()
+                            except:
+                                # strong 태그가 없으면 전체 텍스트 사용
+                                price_text = price_container.text.strip()
+                        
+                        if price_text:
+                            price_value = extract_price_number(price_text)
+                            if price_value is not None and price_value >= 100:  # 최소 100원 이상
+                                price_display = f"{price_value:,}원"
+                                break
+                    except (NoSuchElementException, Exception):
+                        continue
+                
+                # 위 방법들이 모두 실패하면 모든 strong 태그에서 찾기
+                if price_value is None:
+                    try:
+                        strong_elems = product.find_elements(By.CSS_SELECTOR, "strong")
+                        for strong in strong_elems:
+                            text = strong.text.strip()
+                            if not text:
+                                continue
+                            temp_value = extract_price_number(text)
+                            # 가격은 보통 100원 이상이고, 너무 큰 숫자(등급 등)는 제외
+                            if temp_value is not None and 100 <= temp_value <= 10000000:
+                                price_value = temp_value
+                                price_display = f"{price_value:,}원"
+                                break
+                    except Exception as e:
                         pass
                 
-                time.sleep(1)
+                # 가격 정보 저장
+                product_info['price'] = price_display  # 표시용 문자열 (예: "29,530원")
+                product_info['price_value'] = price_value  # 정수 값 (예: 29530) - 필터링용
+                
+                # 가격을 찾지 못한 카드는 번호만 적어 두고 페이지 HTML은 루프가 끝난 뒤 한 번만 저장
+                if price_value is None:
+                    notes.append({'card': idx + 1, 'reason': 'price_missing'})
                 
-                # 선택 상태 확인
-                is_selected_after = select_all_checkbox.is_selected()
-                print(f"  전체 선택 체크박스 선택 후 상태: {is_selected_after}")
+                # 이미지 추출 (.bane_brd1 img)
+                try:
+                    img_elem = product.find_element(By.CSS_SELECTOR, ".bane_brd1 img")
+                    product_info['image'] = img_elem.get_attribute('src') or img_elem.get_attribute('data-src') or ''
+                except:
+                    # 백업: 모든 img 태그에서 상품 이미지 찾기
+                    try:
+                        imgs = product.find_elements(By.CSS_SELECTOR, "img")
+                        for img in imgs:
+                            src = img.get_attribute('src') or ''
+                            if 'domeggook.com' in src and 'upload/item' in src:
+                                product_info['image'] = src
+                                break
+                    except:
+                        product_info['image'] = ''
                 
-                if is_selected_after:
-                    print("✓ 전체 선택 완료!")
+                # 판매자 정보 추출
+                try:
+                    seller_elem = product.find_element(By.CSS_SELECTOR, "a[onclick*='supplyList']")
+                    seller_text = seller_elem.text.strip()
+                    product_info['seller'] = seller_text
+                except:
+                    product_info['seller'] = ''
+                
+                # 상품 상세 링크 생성 (onclick에서 상품번호 추출)
+                if product_id:
+                    product_info['link'] = f"{DOMEMEDB_URL}/index/item/itemView.php?itemNo={product_id}"
                 else:
-                    print("⚠ 전체 선택이 완료되지 않았을 수 있습니다.")
-            else:
-                print("✓ 전체 선택 체크박스가 이미 선택되어 있습니다.")
-        else:
-            print("✗ 전체 선택 체크박스를 찾을 수 없습니다.")
-        
-        time.sleep(1)
-        
-        # 스피드고전송 버튼 찾기 및 클릭
-        print("\n스피드고전송 버튼 찾는 중...")
-        speedgo_button = None
-        
-        # 방법 1: onclick="speedGoSend()" 속성으로 찾기
-        try:
-            buttons = driver.find_elements(By.CSS_SELECTOR, "button[onclick*='speedGoSend']")
-            for btn in buttons:
-                onclick_attr = btn.get_attribute('onclick') or ''
-                if 'speedGoSend' in onclick_attr:
-                    speedgo_button = btn
-                    print("✓ 스피드고전송 버튼 찾음 (onclick='speedGoSend')")
-                    break
-        except Exception as e:
-            print(f"  onclick 검색 중 오류: {e}")
-        
-        # 방법 2: 텍스트로 찾기
-        if not speedgo_button:
-            try:
-                buttons = driver.find_elements(By.TAG_NAME, "button")
-                for btn in buttons:
-                    btn_text = btn.text.strip()
-                    btn_onclick = btn.get_attribute('onclick') or ''
-                    if ("스피드고전송" in btn_text or "스피드고" in btn_text) and "speedGoSend" in btn_onclick:
-                        speedgo_button = btn
-                        print("✓ 스피드고전송 버튼 찾음 (텍스트 검색)")
-                        break
-            except Exception as e:
-                print(f"  텍스트 검색 중 오류: {e}")
-        
-        # 방법 3: 클래스로 찾기
-        if not speedgo_button:
-            try:
-                buttons = driver.find_elements(By.CSS_SELECTOR, "button.button2")
-                for btn in buttons:
-                    btn_onclick = btn.get_attribute('onclick') or ''
-                    if 'speedGoSend' in btn_onclick:
-                        speedgo_button = btn
-                        print("✓ 스피드고전송 버튼 찾음 (class='button2')")
-                        break
-            except Exception as e:
-                print(f"  클래스 검색 중 오류: {e}")
-        
-        if not speedgo_button:
-            print("✗ 스피드고전송 버튼을 찾을 수 없습니다.")
-            # 디버깅: 모든 버튼 출력
-            try:
-                all_buttons = driver.find_elements(By.TAG_NAME, "button")
-                print(f"  페이지의 모든 버튼 ({len(all_buttons)}개):")
-                for i, btn in enumerate(all_buttons[:10], 1):
-                    print(f"    {i}. 텍스트: '{btn.text.strip()}', onclick: '{btn.get_attribute('onclick') or ''}'")
-            except:
-                pass
-            return False
-        
-        # 버튼 정보 출력
-        button_text = speedgo_button.text.strip()
-        button_onclick = speedgo_button.get_attribute('onclick') or ''
-        print(f"  버튼 텍스트: '{button_text}'")
-        print(f"  onclick 속성: '{button_onclick}'")
-        
-        # 버튼이 보이도록 스크롤
-        print("\n스피드고전송 버튼 클릭 시도...")
-        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", speedgo_button)
-        time.sleep(0.5)
-        
-        # 버튼 클릭
-        clicked = False
-        
-        # 방법 1: 직접 클릭
-        try:
-            speedgo_button.click()
-            clicked = True
-            print("✓ 스피드고전송 버튼 클릭 (직접 클릭)")
-        except Exception as e:
-            print(f"  직접 클릭 실패: {e}")
-        
-        # 방법 2: JavaScript로 클릭
-        if not clicked:
-            try:
-                driver.execute_script("arguments[0].click();", speedgo_button)
-                clicked = True
-                print("✓ 스피드고전송 버튼 클릭 (JavaScript)")
-            except Exception as e:
-                print(f"  JavaScript 클릭 실패: {e}")
-        
-        # 방법 3: onclick 함수 직접 실행
-        if not clicked:
-            try:
-                if button_onclick:
-                    driver.execute_script(button_onclick)
-                    clicked = True
-                    print("✓ 스피드고전송 버튼 클릭 (onclick 함수 직접 실행)")
-            except Exception as e:
-                print(f"  onclick 함수 실행 실패: {e}")
-        
-        if not clicked:
-            print("✗ 스피드고전송 버튼 클릭 실패")
-            return False
+                    product_info['link'] = ''
+                
+                # 추가 정보: 등급 추출
+                try:
+                    # 등급이 표시된 부분 찾기 (strong 태그 주변에 "등급" 텍스트가 있는 경우)
+                    grade_elems = product.find_elements(By.CSS_SELECTOR, ".main_cont_text3")
+                    for elem in grade_elems:
+                        text = elem.text.strip()
+                        if '등급' in text:
+                            # strong 태그에서 숫자 추출
+                            try:
+                                strong = elem.find_element(By.CSS_SELECTOR, "strong")
+                                product_info['grade'] = strong.text.strip()
+                                break
+                            except:
+                                # strong 태그가 없으면 텍스트에서 숫자 추출
+                                match = re.search(r'(\d+)등급', text)
+                                if match:
+                                    product_info['grade'] = match.group(1)
+                                    break
+                except:
+                    product_info['grade'] = ''
+                
+                # 빠른배송 여부
+                try:
+                    product.find_element(By.CSS_SELECTOR, ".main_cont_bu9")
+                    product_info['fast_delivery'] = True
+                except:
+                    product_info['fast_delivery'] = False
+                
+                # 가격 필터링 및 상품명 확인 후 결과에 추가
+                if passes_product_filters(product_info, idx, min_price=min_price, fast_delivery=fast_delivery,
+                                          min_grade=min_grade):
+                    results.append(product_info)
+                    
+            except Exception as e:
+                print(f"상품 {idx+1} 파싱 중 오류: {e}")
+                import traceback
+                traceback.print_exc()
+                continue
         
-        # 처리 완료 대기 (팝업 창이 뜰 때까지 대기)
-        print("\n스피드고전송 팝업 창 대기 중...")
-        time.sleep(2)
+        if notes:
+            snapshot_id = DIAGNOSTICS.capture('price_missing', driver=driver, notes=notes)
+            print(f"⚠ 가격을 찾지 못한 상품 {len(notes)}개 (진단 스냅샷 #{snapshot_id})")
         
-        # 팝업 창이 나타날 때까지 대기
-        popup_loaded = False
+    except Exception as e:
+        print(f"결과 파싱 중 오류: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    return results
+
+
+# 브라우저의 innerText처럼 줄바꿈으로 취급할 블록 요소
+HTML_BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li',
+    'nav', 'ol', 'p', 'pre', 'section', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul',
+}
+
+
+def xpath_has_class(class_name):
+    """CSS 클래스 선택자(.class_name)에 해당하는 XPath 조건식 반환"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def html_element_text(element):
+    """
+    lxml 요소의 텍스트를 Selenium .text(innerText)와 비슷한 형태로 반환
+    
+    블록 요소 경계와 <br>은 줄바꿈으로, 연속 공백은 공백 하나로 정리한다.
+    
+    Args:
+        element: lxml.html 요소 (None 가능)
+    
+    Returns:
+        정리된 텍스트, 요소가 없으면 None
+    """
+    if element is None:
+        return None
+    
+    parts = []
+    
+    def walk(node):
+        tag = node.tag if isinstance(node.tag, str) else None
+        if tag is None or tag in ('script', 'style'):
+            return
+        style = (node.get('style') or '').replace(' ', '').lower()
+        if 'display:none' in style:
+            return
+        if tag == 'br':
+            parts.append('\n')
+            return
+        is_block = tag in HTML_BLOCK_TAGS
+        if is_block:
+            parts.append('\n')
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if is_block:
+            parts.append('\n')
+    
+    walk(element)
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def extract_raw_cards_from_html(page_html, max_results=None, base_url=DOMEMEDB_URL):
+    """
+    검색 결과 HTML에서 상품 카드 원시 값 추출 (BULK_EXTRACT_JS의 lxml 버전)
+    
+    Args:
+        page_html: supplyList.php 응답 HTML
+        max_results: 가져올 최대 카드 수 (None이면 모두)
+        base_url: 상대 경로 이미지 주소를 절대 주소로 바꿀 기준 URL
+    
+    Returns:
+        (사용된 선택자, 전체 카드 수, 원시 값 리스트) 튜플, 카드가 없으면 선택자는 None
+    """
+    tree = lxml_html.fromstring(page_html)
+    
+    cards = []
+    used_selector = None
+    for class_name in ('sub_cont_bane1', 'sub_cont_bane1_SetListGallery'):
+        cards = tree.xpath(f"//*[{xpath_has_class(class_name)}]")
+        if cards:
+            used_selector = f".{class_name}"
+            break
+    
+    def first(card, xpath):
+        found = card.xpath(xpath)
+        return found[0] if found else None
+    
+    def absolute(src):
+        return urljoin(base_url, src) if src else ''
+    
+    price_container_xpaths = [
+        (f".//*[{xpath_has_class('main_cont_text1')} and {xpath_has_class('priceLg')}]//strong", True),
+        (f".//*[{xpath_has_class('priceLg')}]//strong", True),
+        (f".//*[{xpath_has_class('main_cont_text1')} and {xpath_has_class('priceLg')}]", False),
+        (f".//*[{xpath_has_class('priceLg')}]", False),
+    ]
+    
+    raw_cards = []
+    for card in cards[:max_results] if max_results else cards:
+        checkbox = first(card, ".//input[@name='item[]']")
         
-        # CSS 선택자로 팝업 확인 (표준 CSS만 사용)
-        css_selectors = [
-            "div[style*='background:#2c303b']",
-            "#mkForm",
-            "div.pup_images_tit",
-        ]
+        price_texts = []
+        for xpath, is_strong in price_container_xpaths:
+            elem = first(card, xpath)
+            if elem is None:
+                price_texts.append(None)
+            elif is_strong:
+                price_texts.append(html_element_text(elem))
+            else:
+                strong = first(elem, ".//strong")
+                price_texts.append(html_element_text(strong if strong is not None else elem))
         
-        for selector in css_selectors:
-            try:
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                popup_loaded = True
-                print(f"✓ 팝업 창 로드 확인: {selector}")
-                break
-            except TimeoutException:
-                continue
+        bane_img = first(card, f".//*[{xpath_has_class('bane_brd1')}]//img")
+        seller = first(card, ".//a[contains(@onclick, 'supplyList')]")
         
-        # XPath로 텍스트 확인
-        if not popup_loaded:
-            try:
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, "//div[contains(text(), '스피드고 전송정보설정')]"))
-                )
-                popup_loaded = True
-                print("✓ 팝업 창 로드 확인 (XPath 텍스트 검색)")
-            except:
-                pass
+        grade_blocks = []
+        for block in card.xpath(f".//*[{xpath_has_class('main_cont_text3')}]"):
+            strong = first(block, ".//strong")
+            grade_blocks.append({
+                'text': html_element_text(block),
+                'strong': html_element_text(strong),
+            })
         
-        # 추가 확인: mkForm 요소 확인
-        if not popup_loaded:
-            try:
-                WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.ID, "mkForm"))
-                )
-                popup_loaded = True
-                print("✓ 팝업 창 로드 확인 (mkForm ID)")
-            except:
-                pass
+        raw_cards.append({
+            'checkbox_value': checkbox.get('value') if checkbox is not None else None,
+            'txt8_texts': [html_element_text(e) for e in card.xpath(f".//span[{xpath_has_class('txt8')}]")],
+            'item_name': html_element_text(first(card, f".//*[{xpath_has_class('itemName')}]")),
+            'alt_name': html_element_text(first(card, f".//*[{xpath_has_class('main_cont_text1')} and {xpath_has_class('b')}]")),
+            'price_texts': price_texts,
+            'strong_texts': [html_element_text(e) for e in card.xpath(".//strong")],
+            'bane_image': (absolute(bane_img.get('src')) or bane_img.get('data-src') or '') if bane_img is not None else None,
+            'image_srcs': [] if bane_img is not None else [absolute(img.get('src')) for img in card.xpath(".//img")],
+            'seller': html_element_text(seller),
+            'grade_blocks': grade_blocks,
+            'fast_delivery': first(card, f".//*[{xpath_has_class('main_cont_bu9')}]") is not None,
+        })
+    
+    return used_selector, len(cards), raw_cards
+
+
+def parse_search_results_html(page_html, max_results=None, min_price=None, fast_delivery=None, min_grade=None):
+    """
+    검색 결과 HTML을 lxml로 파싱 (브라우저 없이 parse_search_results와 같은 결과 생성)
+    
+    Args:
+        page_html: supplyList.php 응답 HTML
+        max_results: 가져올 최대 결과 수
+        min_price: 최소 가격 (이 가격 이상인 상품만 필터링)
+    
+    Returns:
+        상품 정보 리스트
+    """
+    with TRACER.span('parse', method='html') as span:
+        used_selector, total, raw_cards = extract_raw_cards_from_html(page_html)
+        if not used_selector:
+            span.outcome = 'fail'
+            print("상품 요소를 찾지 못했습니다.")
+            return []
         
-        if popup_loaded:
-            time.sleep(1)
-            print("✓ 팝업 창이 열렸습니다.")
-        else:
-            print("⚠ 팝업 창이 감지되지 않았지만 계속 진행합니다...")
+        print(f"✓ 상품 요소 찾음: {used_selector} ({total}개, HTTP)")
+        notes = []
+        results = build_results_from_raw_cards(raw_cards, min_price=min_price, max_results=max_results, notes=notes,
+                                               fast_delivery=fast_delivery, min_grade=min_grade)
+        if notes:
+            snapshot_id = DIAGNOSTICS.capture('price_missing', html=page_html, notes=notes)
+            print(f"⚠ 가격을 찾지 못한 상품 {len(notes)}개 (진단 스냅샷 #{snapshot_id})")
+        span.attrs['products'] = len(results)
+        return results
+
+
+class LoginRequiredError(Exception):
+    """검색 요청이 로그인 페이지로 이동된 경우 (세션 만료)"""
+
+
+class EmptyResultsError(Exception):
+    """검색 결과 첫 페이지가 결과 페이지가 아닌 경우 (카드도 마이박스담기 버튼도 없는 깨진/빈 응답, 재시도 대상)"""
+
+
+class PopupNotFoundError(Exception):
+    """스피드고전송 팝업이나 팝업 안의 전송 버튼이 나타나지 않은 경우"""
+
+
+class CircuitOpenError(Exception):
+    """사이트 실패가 계속되어 회로 차단기가 실행을 끝낸 경우"""
+
+
+def failure_kind(error):
+    """
+    예외를 재시도 정책(RETRY_POLICIES)의 실패 종류로 분류
+    
+    Returns:
+        실패 종류 문자열, 재시도 대상이 아니면 None
+    """
+    if isinstance(error, LoginRequiredError):
+        return 'login_redirect'
+    if isinstance(error, EmptyResultsError):
+        return 'empty_results'
+    if isinstance(error, PopupNotFoundError):
+        return 'popup_not_found'
+    if isinstance(error, (TimeoutException, requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return 'navigation_timeout'
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        # 서버 오류와 요청 제한(429)은 잠시 뒤 다시 시도하면 풀리는 경우가 많음
+        if error.response.status_code >= 500 or error.response.status_code == 429:
+            return 'navigation_timeout'
+    return None
+
+
+def backoff_delay(kind, attempt):
+    """
+    attempt번째 실패 뒤 기다릴 시간 (지수 백오프 + 지터)
+    
+    대기 상한의 절반은 고정, 나머지 절반은 무작위로 정해 여러 작업자가 동시에 다시 몰리지 않게 한다.
+    """
+    policy = RETRY_POLICIES[kind]
+    delay = min(policy['max_delay'], policy['base_delay'] * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """
+    사이트가 계속 실패하면 전체 실행을 잠시 멈추는 회로 차단기 (모든 스레드 공유)
+    
+    call_with_retries()의 시도 결과를 최근 window개까지 기억하고, 그중 실패가 threshold개 이상이면
+    회로를 열어 cooldown초 동안 모든 시도를 멈춘다. 쉬고 난 뒤 첫 결과가 실패면 바로 다시 열고,
+    성공이면 기록을 비우고 닫는다. max_trips번 멈춘 뒤에도 다시 열리면 CircuitOpenError로 실행을 끝낸다
+    (남은 검색어를 모두 실패로 소모하지 않도록).
+    """
+    
+    def __init__(self, window=CIRCUIT_WINDOW, threshold=CIRCUIT_FAILURE_THRESHOLD, cooldown=CIRCUIT_COOLDOWN_SECONDS,
+                 max_trips=CIRCUIT_MAX_TRIPS):
+        self.outcomes = deque(maxlen=window)
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_trips = max_trips
+        self.lock = threading.Lock()
+        self.open_until = 0.0
+        self.tripped_at = 0.0
+        self.half_open = False
+        self.trips = 0
+        self.aborted = None  # 실행을 끝낸 이유 (None이면 계속 실행)
+    
+    def before_call(self):
+        """회로가 열려 있으면 닫힐 때까지 대기 (실행을 끝낸 뒤면 CircuitOpenError)"""
+        with self.lock:
+            if self.aborted:
+                raise CircuitOpenError(self.aborted)
+            wait = self.open_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+    
+    def record(self, ok, kind=None, started=None):
+        """
+        시도 결과 기록
         
-        # iframe으로 전환 (팝업 내부에 iframe이 있을 수 있음)
-        iframe_switched = False
+        Args:
+            ok: 성공 여부
+            kind: 실패 종류 (failure_kind)
+            started: 시도를 시작한 time.monotonic() 값 (회로가 열리기 전에 시작한 시도의 실패는 무시)
+        """
+        with self.lock:
+            if ok:
+                if self.half_open:
+                    self.half_open = False
+                    self.outcomes.clear()
+                    print("✓ 사이트 응답이 회복되어 실행을 계속합니다.")
+                self.outcomes.append(True)
+                return
+            if started is not None and started < self.tripped_at:
+                return
+            self.outcomes.append(False)
+            failures = sum(1 for outcome in self.outcomes if not outcome)
+            if self.half_open or failures >= self.threshold:
+                self._trip(kind)
+    
+    def _trip(self, kind):
+        label = RETRY_POLICIES.get(kind, {}).get('label', kind)
+        self.trips += 1
+        self.outcomes.clear()
+        self.tripped_at = time.monotonic()
+        if self.trips > self.max_trips:
+            self.aborted = f"사이트 실패가 계속되어 실행을 중단합니다 (회로 차단 {self.max_trips}회 후에도 실패: {label})"
+            print(f"\n✗ {self.aborted}")
+            return
+        self.half_open = True
+        self.open_until = self.tripped_at + self.cooldown
+        print(f"\n⚠ 최근 실패가 많아 {self.cooldown}초 동안 모든 요청을 멈춥니다 "
+              f"(회로 차단 {self.trips}/{self.max_trips}, 마지막 실패: {label})")
+        DIAGNOSTICS.capture('circuit_open', notes=[f"{kind}: 회로 차단 {self.trips}회"])
+
+
+CIRCUIT_BREAKER = CircuitBreaker()
+
+
+def call_with_retries(func, *args, description="", on_login_redirect=None, **kwargs):
+    """
+    func(*args, **kwargs)를 실패 종류별 재시도 정책(RETRY_POLICIES)에 따라 실행
+    
+    실패 종류(failure_kind)마다 시도 횟수를 따로 세고, 다시 시도하기 전에 지터를 섞은 지수 백오프만큼
+    기다린다 (대기 구간은 'backoff' 단계로 기록). 모든 시도 결과는 CIRCUIT_BREAKER에 기록되며
+    회로가 열려 있으면 시도 전에 기다린다. 재시도 대상이 아닌 예외와 횟수를 다 쓴 실패는 그대로 발생한다.
+    
+    Args:
+        func: 실행할 함수
+        description: 로그에 쓸 작업 이름
+        on_login_redirect: 로그인 페이지로 이동된 뒤 다시 시도하기 전에 호출할 함수 (다시 로그인)
+    
+    Returns:
+        func의 반환값
+    """
+    attempts = {}
+    while True:
+        CIRCUIT_BREAKER.before_call()
+        started = time.monotonic()
         try:
-            # iframe 찾기 (여러 방법 시도)
-            iframe_selectors = [
-                "iframe[id*='layui-layer-iframe']",
-                "iframe[name*='layui-layer-iframe']",
-                "iframe[src*='popup_setBulkProduct']",
-                "iframe"
-            ]
-            
-            for selector in iframe_selectors:
-                try:
-                    iframes = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for iframe in iframes:
-                        iframe_src = iframe.get_attribute('src') or ''
-                        if 'popup_setBulkProduct' in iframe_src or 'layui-layer-iframe' in (iframe.get_attribute('id') or ''):
-                            print(f"✓ iframe 발견: {iframe.get_attribute('id')} (src: {iframe_src[:80]}...)")
-                            driver.switch_to.frame(iframe)
-                            iframe_switched = True
-                            print("✓ iframe으로 전환 완료")
-                            time.sleep(1)  # iframe 내부 로딩 대기
-                            break
-                    if iframe_switched:
-                        break
-                except Exception as e:
-                    continue
+            result = func(*args, **kwargs)
         except Exception as e:
-            print(f"  iframe 전환 시도 중 오류 (계속 진행): {e}")
-        
-        # 팝업 창 내부에서 두 번째 스피드고전송 버튼 찾기
-        print("\n팝업 창 내부에서 두 번째 스피드고전송 버튼 찾는 중...")
-        speedgo_button2 = None
-        
-        # 방법 1: 제공된 XPath 선택자 사용 (가장 정확)
-        try:
-            speedgo_button2 = driver.find_element(By.XPATH, "//*[@id='mkForm']/div/div[3]/div[11]/button[1]")
-            print("✓ 두 번째 스피드고전송 버튼 찾음 (제공된 XPath 선택자)")
-        except NoSuchElementException:
-            # 방법 2: CSS 선택자로 시도
-            try:
-                speedgo_button2 = driver.find_element(By.CSS_SELECTOR, "#mkForm > div > div.fr > div.cb.t50 > button:nth-child(1)")
-                print("✓ 두 번째 스피드고전송 버튼 찾음 (CSS 선택자)")
-            except NoSuchElementException:
-                # 방법 3: 더 간단한 선택자 시도
-                try:
-                    speedgo_button2 = driver.find_element(By.CSS_SELECTOR, "#mkForm button")
-                    print("✓ 두 번째 스피드고전송 버튼 찾음 (#mkForm button)")
-                except:
-                    # 방법 4: onclick="goProduct()" 속성으로 찾기
-                    try:
-                        buttons = driver.find_elements(By.CSS_SELECTOR, "button[onclick*='goProduct']")
-                        for btn in buttons:
-                            onclick_attr = btn.get_attribute('onclick') or ''
-                            if 'goProduct' in onclick_attr:
-                                speedgo_button2 = btn
-                                print("✓ 두 번째 스피드고전송 버튼 찾음 (onclick='goProduct')")
-                                break
-                    except Exception as e:
-                        print(f"  onclick 검색 중 오류: {e}")
-        
-        # 방법 4: 텍스트와 onclick 조합으로 찾기
-        if not speedgo_button2:
-            try:
-                buttons = driver.find_elements(By.TAG_NAME, "button")
-                for btn in buttons:
-                    btn_text = btn.text.strip()
-                    btn_onclick = btn.get_attribute('onclick') or ''
-                    if ("스피드고전송" in btn_text or "스피드고" in btn_text) and "goProduct" in btn_onclick:
-                        speedgo_button2 = btn
-                        print("✓ 두 번째 스피드고전송 버튼 찾음 (텍스트 + onclick 검색)")
-                        break
-            except Exception as e:
-                print(f"  텍스트 검색 중 오류: {e}")
-        
-        # 방법 5: 클래스로 찾기
-        if not speedgo_button2:
-            try:
-                buttons = driver.find_elements(By.CSS_SELECTOR, "button.cont_btn1")
-                for btn in buttons:
-                    btn_onclick = btn.get_attribute('onclick') or ''
-                    btn_text = btn.text.strip()
-                    if 'goProduct' in btn_onclick:
-                        speedgo_button2 = btn
-                        print("✓ 두 번째 스피드고전송 버튼 찾음 (class='cont_btn1')")
-                        break
-            except Exception as e:
-                print(f"  클래스 검색 중 오류: {e}")
-        
-        if not speedgo_button2:
-            print("✗ 두 번째 스피드고전송 버튼을 찾을 수 없습니다.")
-            # 디버깅: 팝업 창 내부의 모든 버튼 출력
-            try:
-                # mkForm 내부의 버튼만 찾기
-                mkform = driver.find_element(By.ID, "mkForm")
-                all_buttons = mkform.find_elements(By.TAG_NAME, "button")
-                print(f"  팝업 창 내부의 모든 버튼 ({len(all_buttons)}개):")
-                for i, btn in enumerate(all_buttons[:15], 1):
-                    btn_text = btn.text.strip()
-                    btn_onclick = btn.get_attribute('onclick') or ''
-                    print(f"    {i}. 텍스트: '{btn_text}', onclick: '{btn_onclick}'")
-            except:
-                # 전체 페이지의 버튼 출력
-                try:
-                    all_buttons = driver.find_elements(By.TAG_NAME, "button")
-                    print(f"  페이지의 모든 버튼 ({len(all_buttons)}개):")
-                    for i, btn in enumerate(all_buttons[:15], 1):
-                        btn_text = btn.text.strip()
-                        btn_onclick = btn.get_attribute('onclick') or ''
-                        print(f"    {i}. 텍스트: '{btn_text}', onclick: '{btn_onclick}'")
-                except:
-                    pass
+            kind = failure_kind(e)
+            if kind is None:
+                raise
+            policy = RETRY_POLICIES[kind]
+            attempts[kind] = attempts.get(kind, 0) + 1
+            exhausted = attempts[kind] >= policy['attempts']
+            # 빈 결과는 서버가 응답은 한 것이므로 회로 차단기에 실패로 기록하지 않음
+            if kind != 'empty_results':
+                CIRCUIT_BREAKER.record(False, kind, started)
+            if exhausted:
+                print(f"✗ {description}: {policy['label']} - {policy['attempts']}번 시도 후 포기")
+                raise
+            delay = backoff_delay(kind, attempts[kind])
+            reason = (str(e).strip().splitlines() or [type(e).__name__])[0][:120]
+            print(f"⚠ {description}: {policy['label']} ({reason}) - {delay:.1f}초 후 다시 시도 "
+                  f"({attempts[kind]}/{policy['attempts'] - 1})")
+            with TRACER.span('backoff', kind=kind, attempt=attempts[kind]):
+                time.sleep(delay)
+            if kind == 'login_redirect' and on_login_redirect is not None:
+                on_login_redirect()
+            continue
+        CIRCUIT_BREAKER.record(True, started=started)
+        return result
+
+
+def relogin(http_session=None, driver=None):
+    """
+    로그인 페이지로 이동된 뒤 다시 로그인 (call_with_retries의 on_login_redirect용)
+    
+    http_session은 저장된 세션(만료되었으면 브라우저 로그인)의 쿠키로 교체하고,
+    driver는 ensure_login()으로 다시 로그인한다.
+    
+    Returns:
+        다시 로그인했는지 여부 (bool)
+    """
+    print("로그인 세션이 만료되어 다시 로그인합니다...")
+    if http_session is not None:
+        fresh = get_logged_in_http_session(username=getattr(http_session, 'cache_user', None))
+        if fresh is None:
             return False
-        
-        # 버튼 정보 출력
-        button_text2 = speedgo_button2.text.strip()
-        button_onclick2 = speedgo_button2.get_attribute('onclick') or ''
-        print(f"  버튼 텍스트: '{button_text2}'")
-        print(f"  onclick 속성: '{button_onclick2}'")
-        
-        # 버튼이 보이도록 스크롤
-        print("\n두 번째 스피드고전송 버튼 클릭 시도...")
+        http_session.cookies.clear()
+        http_session.cookies.update(fresh.cookies)
+        return True
+    if driver is not None:
+        return ensure_login(driver)
+    return False
+
+
+def search_page_failure(driver):
+    """
+    결과 카드가 나타나지 않은 검색 페이지에 맞는 예외
+    
+    Returns:
+        로그인 페이지면 LoginRequiredError, 검색 결과 페이지가 아니면 EmptyResultsError,
+        카드만 없는 정상 결과 페이지(필터에 맞는 상품 없음)면 None
+    """
+    current_url = driver.current_url
+    if "login" in current_url.lower() and "supplyList.php" not in current_url:
+        return LoginRequiredError(f"로그인 페이지로 이동되었습니다: {current_url}")
+    if driver.find_elements(By.CSS_SELECTOR, f"[onclick*='{SEARCH_PAGE_MARKER}']"):
+        return None
+    return EmptyResultsError(f"검색 결과 페이지가 아닙니다: {current_url}")
+
+
+def fetch_search_page_cards(search_keyword, page, page_size=SEARCH_MAX_PAGE_SIZE, http_session=None, driver=None, timeout=10,
+                            **filters):
+    """
+    검색 결과 한 페이지를 가져와 상품 카드 원시 값 리스트로 반환
+    
+    Args:
+        search_keyword: 검색할 키워드
+        page: 페이지 번호 (1부터 시작)
+        page_size: 페이지당 상품 수
+        http_session: 있으면 HTTP로 요청 (lxml 파싱)
+        driver: http_session이 없을 때 사용할 로그인된 WebDriver (BULK_EXTRACT_JS로 추출)
+        timeout: 요청 타임아웃 (초)
+        **filters: 검색 URL에 넣을 필터/정렬 (build_search_url의 min_price, fast_delivery, min_grade, sort)
+    
+    Returns:
+        상품 카드 원시 값 리스트 (상품이 없으면 빈 리스트)
+    
+    Raises:
+        EmptyResultsError: 첫 페이지가 검색 결과 페이지가 아닌 경우 (깨진/빈 응답, 재시도 대상)
+            카드만 없는 정상 결과 페이지와 2페이지부터의 빈 페이지는 빈 리스트
+        LoginRequiredError: 로그인 페이지로 이동된 경우
+    """
+    search_url = build_search_url(search_keyword, page=page, page_size=page_size, **filters)
+    
+    if http_session is not None:
+        with TRACER.span('navigate', backend='http', page=page) as span:
+            response = HTTP_CACHE.get(http_session, search_url, timeout=timeout)
+            span.attrs['cached'] = bool(getattr(response, 'from_cache', False))
+            response.raise_for_status()
+            if "login" in response.url.lower() and "supplyList.php" not in response.url:
+                raise LoginRequiredError(f"로그인 페이지로 이동되었습니다: {response.url}")
+        with TRACER.span('parse', method='html', page=page) as span:
+            used_selector, _, raw_cards = extract_raw_cards_from_html(response.text)
+            span.attrs['products'] = len(raw_cards)
+        if page == 1 and not used_selector and SEARCH_PAGE_MARKER not in response.text and not HTTP_CACHE.offline:
+            # 깨진 응답을 캐시에서 다시 받지 않도록 지우고 재시도에 맡김
+            HTTP_CACHE.invalidate(http_session, search_url)
+            raise EmptyResultsError(f"검색 결과 페이지가 아닙니다: {search_url}")
+        return raw_cards
+    
+    with TRACER.span('navigate', backend='driver', page=page):
+        driver.get(search_url)
+    with TRACER.span('wait_results', page=page) as span:
+        try:
+            WebDriverWait(driver, 5).until(EC.presence_of_element_located(
+                (By.CSS_SELECTOR, f".sub_cont_bane1, .sub_cont_bane1_SetListGallery, [onclick*='{SEARCH_PAGE_MARKER}']")
+            ))
+        except TimeoutException:
+            span.outcome = 'timeout'
+            failure = search_page_failure(driver) if page == 1 else None
+            if failure is not None:
+                raise failure
+            return []
+    with TRACER.span('parse', method='bulk', page=page) as span:
+        extracted = driver.execute_script(BULK_EXTRACT_JS, None)
+        raw_cards = (extracted or {}).get('cards') or []
+        span.attrs['products'] = len(raw_cards)
+    return raw_cards
+
+
+def fetch_search_page_cards_with_retries(search_keyword, page, page_size=SEARCH_MAX_PAGE_SIZE, http_session=None,
+                                         driver=None, **filters):
+    """
+    fetch_search_page_cards()를 재시도 정책(call_with_retries)에 따라 실행
+    
+    로그인 페이지로 이동되면 다시 로그인한 뒤 재시도한다.
+    """
+    return call_with_retries(
+        fetch_search_page_cards, search_keyword, page, page_size, http_session=http_session, driver=driver,
+        description=f"'{search_keyword}' {page}페이지",
+        on_login_redirect=lambda: relogin(http_session=http_session, driver=driver),
+        **filters,
+    )
+
+
+def find_price_threshold_page(search_keyword, min_price, page_size=SEARCH_MAX_PAGE_SIZE, http_session=None,
+                              driver=None, max_pages=None, fetched=None, **filters):
+    """
+    낮은 가격순으로 정렬한 검색 결과에서 min_price 이상인 상품이 처음 나오는 페이지를 이진 탐색
+    
+    마지막 페이지를 모르므로 1, 2, 4, 8... 페이지를 먼저 확인해 범위를 잡은 뒤(갤로핑)
+    그 범위 안에서 이진 탐색한다. 상품이 수천 개인 검색어도 O(log 페이지 수)개 페이지만 요청한다.
+    비었거나, 앞에서 확인한 페이지와 상품이 같거나, 1페이지보다 상품이 적은 페이지는
+    마지막 이후 페이지로 본다 (실제 사이트는 마지막 이후 페이지 번호에 마지막 페이지를 다시 돌려줌).
+    가격을 알 수 없는 페이지는 기준을 넘은 것으로 보고(앞쪽으로 탐색), 페이지 안의 가격이
+    오름차순이 아니면 사이트가 정렬을 적용하지 않은 것으로 보고 1페이지를 반환한다.
+    
+    Args:
+        search_keyword: 검색할 키워드
+        min_price: 최소 가격
+        page_size: 페이지당 상품 수
+        http_session: 있으면 HTTP로 검색, 없으면 driver 사용
+        driver: 로그인된 Selenium WebDriver 객체
+        max_pages: 탐색할 최대 페이지 번호 (None이면 PRICE_SEARCH_MAX_PAGES)
+        fetched: 딕셔너리를 넘기면 탐색 중 가져온 {페이지 번호: 카드 리스트}를 저장 (다시 요청하지 않도록)
+        **filters: 검색 URL에 넣을 나머지 필터 (fast_delivery, min_grade)
+    
+    Returns:
+        시작 페이지 번호 (min_price 이상인 상품이 없으면 None)
+    """
+    fetched = {} if fetched is None else fetched
+    filters.update(min_price=min_price, sort=SEARCH_SORT_PRICE_ASC)
+    sorted_ok = True
+    
+    def page_prices(page):
+        nonlocal sorted_ok
+        if page not in fetched:
+            fetched[page] = fetch_search_page_cards_with_retries(search_keyword, page, page_size,
+                                                                 http_session=http_session, driver=driver, **filters)
+        prices = [build_product_info(raw)['price_value'] for raw in fetched[page]]
+        prices = [price for price in prices if price is not None]
+        if prices != sorted(prices):
+            sorted_ok = False
+        return fetched[page], prices
+    
+    def page_ids(page):
+        return tuple(build_product_info(raw)['product_id'] for raw in fetched[page])
+    
+    def repeats_earlier(page):
+        """앞에서 확인한 페이지와 상품이 같으면 True (마지막 페이지가 반복된 경우)"""
+        ids = page_ids(page)
+        return any(other < page and page_ids(other) == ids for other in fetched)
+    
+    def past_end(page):
+        """마지막 이후 페이지(또는 상품이 덜 찬 마지막 페이지)면 True"""
+        cards = fetched[page]
+        if not cards:
+            return True
+        if page > 1 and 1 in fetched and len(cards) < len(fetched[1]):
+            return True
+        return repeats_earlier(page)
+    
+    def reaches_threshold(page):
+        """마지막 이후 페이지이거나 가장 비싼 상품이 min_price 이상이면 True"""
+        cards, prices = page_prices(page)
+        return past_end(page) or not prices or prices[-1] >= min_price
+    
+    # 갤로핑: lo는 기준 미만으로 확인된 마지막 페이지, hi는 기준에 닿은 첫 후보 페이지
+    limit = PRICE_SEARCH_MAX_PAGES if max_pages is None else max_pages
+    lo, hi = 0, 1
+    while not reaches_threshold(hi):
+        if not sorted_ok or hi >= limit:
+            break
+        lo = hi
+        hi = min(hi * 2, limit)
+    
+    if sorted_ok:
+        while lo + 1 < hi:
+            mid = (lo + hi) // 2
+            if reaches_threshold(mid):
+                hi = mid
+            else:
+                lo = mid
+    
+    if not sorted_ok:
+        print(f"⚠ '{search_keyword}': 가격순 정렬이 적용되지 않아 1페이지부터 확인합니다.")
+        return 1
+    
+    cards, prices = page_prices(hi)
+    if not cards or (prices and prices[-1] < min_price) or repeats_earlier(hi):
+        print(f"✓ '{search_keyword}': {min_price:,}원 이상 상품 없음 (페이지 {len(fetched)}개 확인)")
+        return None
+    print(f"✓ '{search_keyword}': {min_price:,}원 이상 상품은 {hi}페이지부터 (페이지 {len(fetched)}개 확인)")
+    return hi
+
+
+def iter_search_products(search_keyword, http_session=None, driver=None, min_price=None, max_results=None,
+                         page_size=SEARCH_MAX_PAGE_SIZE, max_pages=None, product_pages=None, fast_delivery=None,
+                         min_grade=None, price_search=False):
+    """
+    검색 결과를 페이지 단위로 가져오며 필터링된 상품을 하나씩 반환하는 제너레이터
+    
+    필터링을 통과한 상품이 max_results개가 되면 다음 페이지를 요청하지 않고 멈춘다.
+    필터는 검색 URL에 넣어 서버에서 먼저 거르고, 받은 카드도 다시 거른다.
+    price_search=True면 낮은 가격순으로 정렬하고 find_price_threshold_page()로 찾은
+    페이지부터 가져온다 (min_price가 높아 앞쪽 페이지가 대부분 버려지는 검색어용).
+    
+    Args:
+        search_keyword: 검색할 키워드
+        http_session: 있으면 HTTP로 검색, 없으면 driver 사용
+        driver: 로그인된 Selenium WebDriver 객체
+        min_price: 최소 가격 (이 가격 이상인 상품만 반환)
+        max_results: 반환할 최대 상품 수 (None이면 마지막 페이지까지)
+        page_size: 페이지당 상품 수 (기본값: 사이트 최대값)
+        max_pages: 요청할 최대 페이지 수 (None이면 제한 없음)
+        product_pages: 딕셔너리를 넘기면 {상품번호: 상품이 있던 검색 결과 페이지 URL}을 기록 (마이박스 전송 시 페이지 이동용)
+        fast_delivery: True면 빠른배송 상품만
+        min_grade: 최소 판매자 등급
+        price_search: True면 가격순 이진 탐색으로 시작 페이지를 찾음 (min_price가 있을 때만)
+    
+    Yields:
+        상품 정보 딕셔너리 (parse_search_results와 같은 형식)
+    """
+    produced = 0
+    seen_ids = set()
+    first_page_count = None
+    page = 1
+    filters = {'min_price': min_price, 'fast_delivery': fast_delivery, 'min_grade': min_grade}
+    url_params = dict(filters)
+    fetched = {}
+    
+    if price_search and min_price:
+        url_params['sort'] = SEARCH_SORT_PRICE_ASC
         try:
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", speedgo_button2)
-            time.sleep(0.5)
-        except:
-            pass
+            page = find_price_threshold_page(search_keyword, min_price, page_size, http_session=http_session,
+                                             driver=driver, max_pages=max_pages, fetched=fetched,
+                                             fast_delivery=fast_delivery, min_grade=min_grade)
+        except OfflineCacheMiss:
+            print(f"⚠ 오프라인 모드: '{search_keyword}' 가격순 페이지가 캐시에 없어 탐색을 중단합니다.")
+            return
+        except EmptyResultsError:
+            print(f"✓ '{search_keyword}': 검색 결과가 없습니다.")
+            return
+        if page is None:
+            return
+    
+    while max_pages is None or page <= max_pages:
+        try:
+            raw_cards = fetched.pop(page, None)
+            if raw_cards is None:
+                raw_cards = fetch_search_page_cards_with_retries(search_keyword, page, page_size,
+                                                                 http_session=http_session, driver=driver, **url_params)
+        except OfflineCacheMiss:
+            print(f"⚠ 오프라인 모드: '{search_keyword}' {page}페이지가 캐시에 없어 여기까지만 반환합니다.")
+            break
+        except EmptyResultsError:
+            print(f"✓ '{search_keyword}': 검색 결과가 없습니다.")
+            break
+        if not raw_cards:
+            break
         
-        # 버튼 클릭
-        clicked2 = False
+        new_cards = 0
+        for idx, raw in enumerate(raw_cards):
+            product_info = build_product_info(raw)
+            product_id = product_info['product_id']
+            if product_id:
+                if product_id in seen_ids:
+                    continue
+                seen_ids.add(product_id)
+            new_cards += 1
+            
+            if not passes_product_filters(product_info, idx, **filters):
+                continue
+            
+            if product_pages is not None and product_id:
+                product_pages[product_id] = build_search_url(search_keyword, page=page, page_size=page_size, **url_params)
+            yield product_info
+            produced += 1
+            if max_results and produced >= max_results:
+                return
         
-        # 방법 1: 직접 클릭
-        try:
-            speedgo_button2.click()
-            clicked2 = True
-            print("✓ 두 번째 스피드고전송 버튼 클릭 (직접 클릭)")
-        except Exception as e:
-            print(f"  직접 클릭 실패: {e}")
+        print(f"✓ '{search_keyword}' {page}페이지: 상품 {len(raw_cards)}개 확인, 누적 {produced}개")
         
-        # 방법 2: JavaScript로 클릭
-        if not clicked2:
-            try:
-                driver.execute_script("arguments[0].click();", speedgo_button2)
-                clicked2 = True
-                print("✓ 두 번째 스피드고전송 버튼 클릭 (JavaScript)")
-            except Exception as e:
-                print(f"  JavaScript 클릭 실패: {e}")
+        # 마지막 페이지 이후 같은 페이지가 반복되거나 페이지가 덜 찼으면 종료
+        if new_cards == 0:
+            break
+        if first_page_count is None:
+            first_page_count = len(raw_cards)
+        elif len(raw_cards) < first_page_count:
+            break
+        page += 1
+
+
+def search_products_http(search_keyword, session, max_results=None, min_price=None, timeout=10,
+                         max_pages=None, product_pages=None, fast_delivery=None, min_grade=None, price_search=False):
+    """
+    브라우저 없이 requests.Session으로 상품 검색
+    
+    Args:
+        search_keyword: 검색할 키워드
+        session: 로그인 쿠키가 담긴 requests.Session 객체 (create_http_session 참고)
+        max_results: 가져올 최대 결과 수 (가격 필터링을 통과한 상품 기준, None이면 첫 페이지의 모든 결과)
+        min_price: 최소 가격 (이 가격 이상인 상품만 필터링)
+        timeout: 요청 타임아웃 (초)
+        max_pages: 요청할 최대 페이지 수 (None이면 max_results를 채울 때까지)
+        product_pages: 딕셔너리를 넘기면 {상품번호: 검색 결과 페이지 URL}을 기록
+        fast_delivery: True면 빠른배송 상품만
+        min_grade: 최소 판매자 등급
+        price_search: True면 가격순 이진 탐색으로 min_price를 넘는 페이지부터 검색 (iter_search_products 참고)
+    
+    Returns:
+        검색 결과 리스트 (딕셔너리 형태)
+    """
+    if max_pages is None and not max_results:
+        max_pages = 1
+    
+    try:
+        print(f"\n검색어 '{search_keyword}'로 HTTP 검색...")
+        results = list(iter_search_products(
+            search_keyword,
+            http_session=session,
+            min_price=min_price,
+            max_results=max_results,
+            max_pages=max_pages,
+            product_pages=product_pages,
+            fast_delivery=fast_delivery,
+            min_grade=min_grade,
+            price_search=price_search,
+        ))
+        if min_price:
+            print(f"\n✓ 검색 완료! {min_price:,}원 이상 상품 {len(results)}개 발견")
+        else:
+            print(f"\n✓ 검색 완료! 총 {len(results)}개 결과 발견")
+        return results
         
-        # 방법 3: onclick 함수 직접 실행
-        if not clicked2:
-            try:
-                if button_onclick2:
-                    driver.execute_script(button_onclick2)
-                    clicked2 = True
-                    print("✓ 두 번째 스피드고전송 버튼 클릭 (onclick 함수 직접 실행)")
-            except Exception as e:
-                print(f"  onclick 함수 실행 실패: {e}")
+    except LoginRequiredError as e:
+        print(f"✗ 다시 로그인해도 검색할 수 없습니다: {e}")
+        return []
+    except requests.exceptions.RequestException as e:
+        print(f"✗ HTTP 검색 실패 (재시도 후): {e}")
+        return []
+
+
+def playwright_cookies_from_session(cookies):
+    """저장된 로그인 쿠키(Selenium 형식)를 Playwright storage_state 쿠키 형식으로 변환"""
+    converted = []
+    for cookie in cookies:
+        converted.append({
+            'name': cookie['name'],
+            'value': cookie['value'],
+            'domain': cookie.get('domain') or '',
+            'path': cookie.get('path', '/'),
+            'expires': cookie.get('expiry', -1),
+            'httpOnly': cookie.get('httpOnly', False),
+            'secure': cookie.get('secure', False),
+            'sameSite': 'Lax',
+        })
+    return converted
+
+
+def session_cookies_from_playwright(cookies):
+    """Playwright 쿠키를 저장용 로그인 쿠키(Selenium 형식)로 변환"""
+    converted = []
+    for cookie in cookies:
+        if not (cookie.get('domain') or '').lstrip('.').endswith(COOKIE_DOMAIN):
+            continue
+        item = {
+            'name': cookie['name'],
+            'value': cookie['value'],
+            'domain': cookie.get('domain'),
+            'path': cookie.get('path', '/'),
+            'secure': cookie.get('secure', False),
+            'httpOnly': cookie.get('httpOnly', False),
+        }
+        if cookie.get('expires', -1) > 0:
+            item['expiry'] = int(cookie['expires'])
+        converted.append(item)
+    return converted
+
+
+async def login_with_playwright(browser, username=None, password=None):
+    """
+    Playwright로 도매꾹에 로그인하고 storage_state 반환 (login_to_domeggook과 같은 선택자 사용)
+    
+    Args:
+        browser: Playwright Browser 객체
+        username: 로그인 아이디 (None이면 환경변수 DOMEID 또는 사용자 입력)
+        password: 비밀번호 (None이면 환경변수 DOMPWD 또는 사용자 입력)
+    
+    Returns:
+        storage_state 딕셔너리, 로그인 실패 시 None
+    """
+    username = username or os.getenv('DOMEID') or input("아이디를 입력하세요: ").strip()
+    if not password:
+        import getpass
+        password = os.getenv('DOMPWD') or getpass.getpass("비밀번호를 입력하세요: ").strip()
+    
+    context = await browser.new_context(user_agent=USER_AGENT)
+    try:
+        page = await context.new_page()
+        print(f"\n로그인 페이지로 이동: {LOGIN_URL}")
+        await RATE_LIMITER.acquire_async(LOGIN_URL)
+        await page.goto(LOGIN_URL, wait_until='domcontentloaded')
         
-        if not clicked2:
-            print("✗ 두 번째 스피드고전송 버튼 클릭 실패")
-            return False
+        async def find_first(selectors):
+            for selector in selectors:
+                try:
+                    element = await page.query_selector(selector)
+                except Exception:
+                    # :contains() 같은 비표준 선택자는 건너뜀
+                    continue
+                if element:
+                    return element
+            return None
         
-        # 처리 완료 대기
-        print("\n두 번째 스피드고전송 처리 대기 중...")
-        time.sleep(3)
+        user_id_input = await find_first(LOGIN_USER_ID_SELECTORS)
+        password_input = await find_first(LOGIN_PASSWORD_SELECTORS)
+        if not user_id_input or not password_input:
+            print("✗ 로그인 폼을 찾을 수 없습니다.")
+            return None
         
-        # iframe에서 나오기 (기본 컨텍스트로 복귀)
-        if iframe_switched:
-            try:
-                driver.switch_to.default_content()
-                print("✓ 기본 컨텍스트로 복귀")
-            except:
-                pass
+        await user_id_input.fill(username)
+        await password_input.fill(password)
         
-        print("✓ 스피드고전송 완료!")
-        return True
+        login_button = await find_first(LOGIN_BUTTON_SELECTORS)
+        if login_button:
+            await login_button.click()
+        else:
+            await password_input.press('Enter')
         
-    except Exception as e:
-        # 예외 발생 시에도 iframe에서 나오기
         try:
-            driver.switch_to.default_content()
-        except:
-            pass
-        print(f"✗ 마이박스담기 중 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+            await page.wait_for_url(lambda url: 'login' not in url.lower() or 'domemedb' in url.lower(), timeout=10000)
+        except Exception:
+            print(f"✗ 로그인 실패: 로그인 상태를 확인할 수 없습니다. (현재 URL: {page.url})")
+            return None
+        
+        print("✓ 로그인 성공! (Playwright)")
+        return await context.storage_state()
+    finally:
+        await context.close()
 
 
-def search_products(search_keyword, headless=True, max_results=None, use_direct_url=False, min_price=None, username=None, password=None, return_driver=False):
+async def get_playwright_storage_state(browser, username=None, password=None, session_path=SESSION_STORE_PATH):
     """
-    도매꾹 사이트에서 상품 검색
+    모든 브라우저 컨텍스트가 공유할 로그인 storage_state 준비
+    
+    저장된 로그인 세션이 유효하면 그대로 사용하고, 아니면 한 번만 로그인한 뒤 세션 파일에도 저장한다.
+    
+    Returns:
+        storage_state 딕셔너리, 로그인 실패 시 None
+    """
+    cookies = load_login_session(session_path)
+    if cookies and is_session_logged_in(create_http_session(cookies)):
+        print(f"✓ 저장된 로그인 세션 사용 ({len(cookies)}개 쿠키)")
+        return {'cookies': playwright_cookies_from_session(cookies), 'origins': []}
+    
+    # 세션 파일에 함께 저장할 수 있도록 입력받을 아이디를 여기서 정함
+    username = username or os.getenv('DOMEID') or input("아이디를 입력하세요: ").strip()
+    storage_state = await login_with_playwright(browser, username=username, password=password)
+    if storage_state and session_path:
+        save_login_session(session_cookies_from_playwright(storage_state.get('cookies', [])), session_path,
+                           user=username)
+    return storage_state
+
+
+async def search_products_playwright_async(search_keywords, max_results=None, min_price=None, concurrency=8,
+                                           headless=True, username=None, password=None, timeout=15,
+                                           fast_delivery=None, min_grade=None):
+    """
+    Playwright 비동기 API로 여러 검색어를 동시에 검색
+    
+    Chromium 프로세스 하나에서 검색어마다 독립된 브라우저 컨텍스트를 만들고,
+    한 번 로그인한 storage_state를 모든 컨텍스트가 공유한다.
+    동시에 열리는 컨텍스트 수는 concurrency로 제한한다.
     
     Args:
-        search_keyword: 검색할 키워드
+        search_keywords: 검색어 리스트
+        max_results: 검색어별 최대 결과 수
+        min_price: 최소 가격 (이 가격 이상인 상품만 필터링)
+        concurrency: 동시에 검색할 최대 컨텍스트 수
         headless: 헤드리스 모드 사용 여부
-        max_results: 가져올 최대 결과 수 (None이면 모두 가져옴)
-        use_direct_url: True면 검색 폼 대신 직접 URL로 접근
-        min_price: 최소 가격 (이 가격 이상인 상품만 필터링, 예: 12000)
-        username: 로그인 아이디 (None이면 사용자 입력 요청)
-        password: 비밀번호 (None이면 사용자 입력 요청)
+        username: 로그인 아이디
+        password: 비밀번호
+        timeout: 페이지 이동/결과 대기 타임아웃 (초)
+        fast_delivery: True면 빠른배송 상품만
+        min_grade: 최소 판매자 등급
     
     Returns:
-        검색 결과 리스트 (딕셔너리 형태)
+        검색어 순서와 같은 순서의 검색 결과 리스트의 리스트
     """
-    driver = None
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
     
-    # 직접 URL 접근 방식
-    if use_direct_url:
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=headless)
         try:
-            print(f"\n검색어 '{search_keyword}'로 직접 URL 접근...")
-            # URL 인코딩
-            encoded_keyword = quote(search_keyword, safe='')
-            search_url = f"https://domemedb.domeggook.com/index/item/supplyList.php?sf=subject&enc=utf8&fromOversea=0&mode=search&sw={encoded_keyword}"
-            
-            driver = get_chrome_driver(headless=headless)
-            
-            # 먼저 로그인
-            if not login_to_domeggook(driver, username=username, password=password):
+            storage_state = await get_playwright_storage_state(browser, username=username, password=password)
+            if storage_state is None:
                 print("✗ 로그인 실패로 검색을 중단합니다.")
-                if driver:
-                    driver.quit()
-                return []
-            
-            # 검색 페이지로 이동
-            driver.get(search_url)
-            print(f"✓ 검색 URL로 직접 접근: {search_url}")
+                return [[] for _ in search_keywords]
             
-            # 페이지 로딩 대기
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            semaphore = asyncio.Semaphore(concurrency)
             
-            # 검색 결과 요소가 로드될 때까지 대기
-            try:
-                # 여러 선택자를 순차적으로 시도
-                result_loaded = False
-                selectors = [
-                    ".sub_cont_bane1",
-                    ".sub_cont_bane1_SetListGallery",
-                    "[class*='item']"
-                ]
-                for selector in selectors:
+            async def search_one(search_keyword):
+                async with semaphore:
+                    context = await browser.new_context(storage_state=storage_state, user_agent=USER_AGENT)
                     try:
-                        WebDriverWait(driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                        page = await context.new_page()
+                        search_url = build_search_url(search_keyword, min_price=min_price,
+                                                      fast_delivery=fast_delivery, min_grade=min_grade)
+                        await RATE_LIMITER.acquire_async(search_url)
+                        await page.goto(search_url, wait_until='domcontentloaded', timeout=timeout * 1000)
+                        
+                        card_selector = '.sub_cont_bane1, .sub_cont_bane1_SetListGallery'
+                        try:
+                            await page.wait_for_selector(f"{card_selector}, [onclick*='{SEARCH_PAGE_MARKER}']",
+                                                         timeout=timeout * 1000)
+                        except PlaywrightTimeoutError:
+                            print(f"⚠ '{search_keyword}': 검색 결과 요소를 찾지 못했습니다.")
+                            return []
+                        if not await page.query_selector(card_selector):
+                            print(f"✓ '{search_keyword}': 0개 결과 (Playwright)")
+                            return []
+                        
+                        # 동적 콘텐츠 로드를 위해 페이지 끝까지 스크롤한 뒤 카드 수가 안정될 때까지 대기
+                        # (Selenium 경로의 wait_for_search_results와 같은 조건)
+                        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                        try:
+                            await page.wait_for_function(ELEMENT_COUNT_STABLE_JS, arg=[card_selector, 500],
+                                                         polling=100, timeout=timeout * 1000)
+                        except PlaywrightTimeoutError:
+                            print(f"⚠ '{search_keyword}': 결과 카드 수가 안정되지 않았지만 계속 진행합니다...")
+                        
+                        # Selenium 일괄 추출과 같은 스크립트를 함수로 감싸 실행 (arguments[0] = 카드 수 제한 없음)
+                        extracted = await page.evaluate("function () {" + BULK_EXTRACT_JS + "}", None)
+                        if not extracted or not extracted.get('selector'):
+                            return []
+                        
+                        notes = []
+                        results = build_results_from_raw_cards(
+                            extracted.get('cards') or [], min_price=min_price, max_results=max_results, notes=notes,
+                            fast_delivery=fast_delivery, min_grade=min_grade,
                         )
-                        print(f"✓ 검색 결과 요소 로드 완료: {selector}")
-                        result_loaded = True
-                        break
-                    except TimeoutException:
-                        continue
-                if not result_loaded:
-                    print("⚠ 검색 결과 요소를 찾지 못했지만 계속 진행합니다...")
-            except Exception as e:
-                print(f"⚠ 검색 결과 요소 대기 중 오류: {e}")
-            
-            # 페이지 스크롤하여 동적 콘텐츠 로드
-            try:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1)
-                driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(1)
-            except:
-                pass
-            
-            time.sleep(2)
-            
-            # 검색 결과 파싱
-            results = parse_search_results(driver, max_results, min_price=min_price)
-            if min_price:
-                print(f"\n✓ 검색 완료! {min_price:,}원 이상 상품 {len(results)}개 발견")
-            else:
-                print(f"\n✓ 검색 완료! 총 {len(results)}개 결과 발견")
-            
-            if return_driver:
-                return results, driver
-            return results
+                        if notes:
+                            DIAGNOSTICS.capture('price_missing', html=await page.content(), url=page.url, notes=notes,
+                                                keyword=search_keyword)
+                        print(f"✓ '{search_keyword}': {len(results)}개 결과 (Playwright)")
+                        return results
+                    except Exception as e:
+                        print(f"✗ '{search_keyword}' 검색 실패: {e}")
+                        return []
+                    finally:
+                        await context.close()
             
-        except Exception as e:
-            print(f"✗ 직접 URL 접근 실패: {e}")
-            import traceback
-            traceback.print_exc()
-            if return_driver:
-                return [], driver if driver else None
-            if driver:
-                driver.quit()
+            return await asyncio.gather(*(search_one(keyword) for keyword in search_keywords))
+        finally:
+            await browser.close()
+
+
+def search_products_playwright(search_keywords, **kwargs):
+    """
+    search_products_playwright_async()의 동기 실행 래퍼
+    
+    Returns:
+        {검색어: 검색 결과 리스트} 딕셔너리 (입력 순서 유지)
+    """
+    results = asyncio.run(search_products_playwright_async(search_keywords, **kwargs))
+    return dict(zip(search_keywords, results))
+
+
+def start_logged_in_driver(headless=True, username=None, password=None, fast=False):
+    """
+    Chrome driver를 시작하고 로그인 (저장된 세션이 유효하면 로그인 폼 생략)
+    
+    Args:
+        headless: 헤드리스 모드 사용 여부
+        username: 로그인 아이디 (login_to_domeggook 참고)
+        password: 비밀번호 (login_to_domeggook 참고)
+        fast: 빠른 프로필 사용 여부 (get_chrome_driver 참고)
+    
+    Returns:
+        로그인된 WebDriver 객체, 실패 시 None
+    """
+    with TRACER.span('driver_start', fast=fast):
+        driver = get_chrome_driver(headless=headless, fast=fast)
+    try:
+        if ensure_login(driver, username=username, password=password):
+            return driver
+        print("✗ 브라우저 로그인 실패")
+    except Exception as e:
+        print(f"✗ 브라우저 로그인 중 오류 발생: {e}")
+    driver.quit()
+    return None
+
+
+def search_with_driver(driver, search_keyword, max_results=20, min_price=12000, fast_delivery=None, min_grade=None):
+    """
+    이미 로그인된 driver로 검색 결과 페이지에 직접 이동하여 파싱
+    
+    이동/대기/파싱은 call_with_retries()로 실행한다. 검색 결과 페이지가 나타나지 않으면 로그인 페이지인지
+    깨진 응답인지 구분해 재시도하고(로그인 페이지면 다시 로그인), 재시도 후에도 결과 페이지가 아니면 빈 리스트를 반환한다.
+    카드만 없는 결과 페이지(필터에 맞는 상품 없음)는 재시도하지 않는다.
+    
+    Args:
+        driver: 로그인된 Selenium WebDriver 객체
+        search_keyword: 검색할 키워드
+        max_results: 가져올 최대 결과 수
+        min_price: 최소 가격 (이 가격 이상인 상품만 필터링)
+        fast_delivery: True면 빠른배송 상품만
+        min_grade: 최소 판매자 등급
+    
+    Returns:
+        검색 결과 리스트
+    """
+    search_url = build_search_url(search_keyword, min_price=min_price, fast_delivery=fast_delivery, min_grade=min_grade)
+    
+    def load_and_parse():
+        with TRACER.span('navigate', backend='driver'):
+            driver.get(search_url)
+        print(f"✓ 검색 URL로 이동: {search_url}")
+        
+        # 검색 결과 카드가 모두 로드될 때까지 대기
+        if not wait_for_search_results(driver):
+            failure = search_page_failure(driver)
+            if failure is not None:
+                raise failure
             return []
+        
+        # 검색 결과 파싱
+        return parse_search_results(driver, max_results=max_results, min_price=min_price, fast_delivery=fast_delivery,
+                                    min_grade=min_grade)
+    
+    try:
+        return call_with_retries(load_and_parse, description=f"'{search_keyword}' 검색",
+                                 on_login_redirect=lambda: relogin(driver=driver))
+    except EmptyResultsError:
+        print(f"✓ '{search_keyword}': 검색 결과가 없습니다.")
+        return []
+
+
+def run_keyword_search(driver, search_keyword, http_session=None, max_results=20, min_price=12000,
+                       fast_delivery=None, min_grade=None, price_search=False):
+    """
+    검색어 하나를 검색 (http_session이 있으면 HTTP, 없으면 driver 사용)
+    
+    price_search=True면 가격순 이진 탐색(find_price_threshold_page)으로 min_price를 넘는 페이지부터 검색한다.
+    
+    Returns:
+        (검색 결과 리스트, {상품번호: 검색 결과 페이지 URL}) 튜플
+        driver로 검색하여 driver가 이미 결과 페이지에 있으면 페이지 정보는 None
+    """
+    if http_session is not None:
+        product_pages = {}
+        results = search_products_http(
+            search_keyword, http_session, max_results=max_results, min_price=min_price, product_pages=product_pages,
+            fast_delivery=fast_delivery, min_grade=min_grade, price_search=price_search,
+        )
+        return results, product_pages
+    if price_search and min_price:
+        product_pages = {}
+        results = list(iter_search_products(
+            search_keyword, driver=driver, min_price=min_price, max_results=max_results, product_pages=product_pages,
+            fast_delivery=fast_delivery, min_grade=min_grade, price_search=True,
+        ))
+        return results, product_pages
+    results = search_with_driver(driver, search_keyword, max_results=max_results, min_price=min_price,
+                                 fast_delivery=fast_delivery, min_grade=min_grade)
+    return results, None
+
+
+def print_search_results(results):
+    """검색 결과를 콘솔에 출력"""
+    print(f"\n검색 결과: {len(results)}개 상품 발견")
+    
+    for idx, product in enumerate(results, 1):
+        print(f"\n[{idx}] {product.get('name', 'N/A')}")
+        if product.get('product_id'):
+            print(f"    상품번호: {product['product_id']}")
+        if product.get('price'):
+            print(f"    가격: {product['price']}")
+        if product.get('seller'):
+            print(f"    판매자: {product['seller']}")
+        if product.get('grade'):
+            print(f"    등급: {product['grade']}등급")
+        if product.get('fast_delivery'):
+            print(f"    빠른배송: 가능")
+
+
+def save_search_results(search_keyword, results, result_dir="result"):
+    """
+    검색 결과를 result 폴더에 JSON 파일로 저장
+    
+    Returns:
+        저장한 파일 경로
+    """
+    safe_keyword = search_keyword.replace(' ', '_').replace('/', '_')
+    output_file = os.path.join(result_dir, f"search_results_{safe_keyword}.json")
+    # 저장 도중 중단되어도 이전 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_file = output_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, output_file)
+    print(f"\n✓ 결과가 '{output_file}' 파일에 저장되었습니다.")
+    return output_file
+
+
+def keyword_from_result_path(path):
+    """
+    save_search_results()가 만든 파일 이름에서 검색어 복원 (search_results_양말_목.json → '양말 목')
+    
+    저장할 때 공백과 '/'를 모두 '_'로 바꾸므로 '_'는 공백으로 되돌린다.
+    
+    Returns:
+        검색어, 결과 파일 이름 형식이 아니면 None
+    """
+    name = os.path.basename(path)
+    prefix, suffix = "search_results_", ".json"
+    if not (name.startswith(prefix) and name.endswith(suffix)) or len(name) <= len(prefix) + len(suffix):
+        return None
+    return name[len(prefix):-len(suffix)].replace('_', ' ')
+
+
+def tokenize_product_name(text):
+    """
+    상품명을 색인용 토큰으로 분리 (대소문자 무시)
+    
+    공백/기호로 나눈 단어 전체와, 각 단어 안의 글자 2-gram을 모두 토큰으로 쓴다.
+    한국어 상품명은 띄어쓰기가 일정하지 않아 ('겨울잠옷' / '겨울 잠옷') 2-gram으로 부분 일치를 잡는다.
+    
+    Returns:
+        {토큰: 등장 횟수} Counter
+    """
+    tokens = Counter()
+    for word in re.findall(r'\w+', (text or '').casefold()):
+        tokens[word] += 1
+        if len(word) > 2:
+            tokens.update(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class ProductStore:
+    """
+    검색 결과를 모아 두는 SQLite 상품 저장소
+    
+    상품은 product_id 기준으로 upsert되어 최신 정보로 갱신되고 (처음 발견한 시각은 유지),
+    어떤 검색어로 언제 발견되었는지는 product_keywords 테이블에 따로 기록된다.
+    price_value, grade, fast_delivery에 인덱스가 있어 모든 검색어에 걸친 조건 조회가 빠르다.
+    상품명은 name_tokens 역색인(tokenize_product_name)으로도 저장되어 사이트에 접속하지 않고
+    search_names()로 검색할 수 있다.
     
-    # 검색 폼 사용 방식 (기존 방식)
-    url = "https://domemedb.domeggook.com/index/?mainChannel=aihome"
+    사용 예:
+        with ProductStore() as store:
+            store.upsert_results("양말", results)
+            items = store.query(max_price=20000, fast_delivery=True)
+    """
     
-    try:
-        print(f"\n검색어 '{search_keyword}'로 검색 시작...")
-        driver = get_chrome_driver(headless=headless)
-        
-        # 먼저 로그인
-        if not login_to_domeggook(driver, username=username, password=password):
-            print("✗ 로그인 실패로 검색을 중단합니다.")
-            if driver:
-                driver.quit()
-            return []
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS products (
+            product_id TEXT PRIMARY KEY,
+            name TEXT,
+            price TEXT,
+            price_value INTEGER,
+            image TEXT,
+            seller TEXT,
+            link TEXT,
+            grade INTEGER,
+            fast_delivery INTEGER NOT NULL DEFAULT 0,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS product_keywords (
+            product_id TEXT NOT NULL REFERENCES products(product_id),
+            keyword TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            times_seen INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (product_id, keyword)
+        );
+        CREATE INDEX IF NOT EXISTS idx_products_price_value ON products(price_value);
+        CREATE INDEX IF NOT EXISTS idx_products_grade ON products(grade);
+        CREATE INDEX IF NOT EXISTS idx_products_fast_delivery ON products(fast_delivery, price_value);
+        CREATE INDEX IF NOT EXISTS idx_product_keywords_keyword ON product_keywords(keyword);
+        CREATE TABLE IF NOT EXISTS transfers (
+            product_id TEXT PRIMARY KEY,
+            keyword TEXT,
+            transferred_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS name_tokens (
+            token TEXT NOT NULL,
+            product_id TEXT NOT NULL,
+            tf INTEGER NOT NULL,
+            PRIMARY KEY (token, product_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_name_tokens_product ON name_tokens(product_id);
+        CREATE TABLE IF NOT EXISTS imported_files (
+            path TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            products INTEGER NOT NULL,
+            imported_at TEXT NOT NULL
+        );
+    """
+    
+    PRODUCT_COLUMNS = ('product_id', 'name', 'price', 'price_value', 'image', 'seller', 'link', 'grade', 'fast_delivery')
+    
+    def __init__(self, path=PRODUCT_DB_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        # DriverPool의 여러 스레드에서 같은 연결을 쓰므로 lock으로 직렬화
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
         
-        # 메인 페이지로 이동
-        driver.get(url)
+        # 역색인이 생기기 전에 만든 저장소면 한 번 전체 색인
+        if (self.conn.execute("SELECT 1 FROM products LIMIT 1").fetchone()
+                and not self.conn.execute("SELECT 1 FROM name_tokens LIMIT 1").fetchone()):
+            with self.conn:
+                self._index_names(None)
+    
+    def _index_names(self, product_ids):
+        """
+        저장된 상품명으로 name_tokens 역색인 갱신 (lock과 트랜잭션 안에서 호출)
         
-        # 페이지 로딩 대기
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        Args:
+            product_ids: 다시 색인할 상품번호 리스트 (None이면 전체)
+        """
+        if product_ids is None:
+            self.conn.execute("DELETE FROM name_tokens")
+            rows = self.conn.execute("SELECT product_id, name FROM products").fetchall()
+        else:
+            ids_json = json.dumps(list(product_ids))
+            self.conn.execute("DELETE FROM name_tokens WHERE product_id IN (SELECT value FROM json_each(?))", (ids_json,))
+            rows = self.conn.execute(
+                "SELECT product_id, name FROM products WHERE product_id IN (SELECT value FROM json_each(?))", (ids_json,)
+            ).fetchall()
+        self.conn.executemany(
+            "INSERT INTO name_tokens (token, product_id, tf) VALUES (?, ?, ?)",
+            [(token, row[0], tf) for row in rows for token, tf in tokenize_product_name(row[1]).items()],
         )
-        time.sleep(2)  # 추가 로딩 대기
+    
+    def upsert_results(self, search_keyword, results, seen_at=None):
+        """
+        검색 결과를 저장 (이미 있는 상품은 최신 정보로 갱신)
         
-        # 검색창 찾기 (여러 가능한 선택자 시도)
-        # name="sw"가 가장 정확한 선택자이므로 우선 시도
-        search_selectors = [
-            "input[name='sw']",  # 정확한 name 속성으로 검색
-            "input[type='text'][name='sw']",  # type과 name 조합
-            "input[title='검색'][name='sw']",  # title과 name 조합
-            "input[type='text'][name*='search']",
-            "input[type='text'][id*='search']",
-            "input[type='text'][class*='search']",
-            "input[placeholder*='상품명']",
-            "input[placeholder*='검색']",
-            "#searchKeyword",
-            ".search-input",
-            "input.form-control",
-        ]
+        Args:
+            search_keyword: 결과를 찾은 검색어
+            results: build_product_info() 형식의 상품 딕셔너리 리스트
+            seen_at: 발견 시각 (ISO 문자열, None이면 현재 시각)
         
-        search_input = None
-        for selector in search_selectors:
-            try:
-                search_input = WebDriverWait(driver, 3).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                print(f"✓ 검색창 찾음: {selector}")
-                break
-            except TimeoutException:
+        Returns:
+            저장한 상품 수
+        """
+        seen_at = seen_at or datetime.now().isoformat(timespec='seconds')
+        rows = []
+        for product in results:
+            product_id = product.get('product_id')
+            if not product_id:
                 continue
+            rows.append((
+                str(product_id), product.get('name'), product.get('price'), product.get('price_value'),
+                product.get('image'), product.get('seller'), product.get('link'),
+                grade_number(product.get('grade')), 1 if product.get('fast_delivery') else 0,
+                seen_at, seen_at,
+            ))
+        if not rows:
+            return 0
         
-        if not search_input:
-            # name 속성으로 직접 찾기 시도
-            try:
-                search_input = driver.find_element(By.NAME, "sw")
-                print("✓ 검색창 찾음: name='sw'")
-            except NoSuchElementException:
-                pass
-        
-        if not search_input:
-            # 모든 input 요소 확인
-            inputs = driver.find_elements(By.TAG_NAME, "input")
-            for inp in inputs:
-                inp_name = inp.get_attribute("name") or ""
-                inp_type = inp.get_attribute("type")
-                inp_title = inp.get_attribute("title") or ""
-                if inp_name == "sw" or (inp_type == "text" and "검색" in inp_title):
-                    search_input = inp
-                    print(f"✓ 검색창 찾음 (name={inp_name}, title={inp_title})")
-                    break
-        
-        if not search_input:
-            raise Exception("검색창을 찾을 수 없습니다.")
-        
-        # 검색어 입력
-        search_input.clear()
-        search_input.send_keys(search_keyword)
-        time.sleep(0.5)
-        
-        # 검색 버튼 찾기 및 클릭 또는 Enter 키 입력
-        search_button_selectors = [
-            "button[type='submit']",
-            "button.btn-search",
-            "button[class*='search']",
-            "input[type='submit']",
-            ".search-btn",
-            "#searchBtn",
-        ]
-        
-        search_button = None
-        for selector in search_button_selectors:
-            try:
-                search_button = driver.find_element(By.CSS_SELECTOR, selector)
-                print(f"✓ 검색 버튼 찾음: {selector}")
-                break
-            except NoSuchElementException:
-                continue
+        with self.lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO products (product_id, name, price, price_value, image, seller, link, grade,
+                                      fast_delivery, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(product_id) DO UPDATE SET
+                    name = excluded.name,
+                    price = excluded.price,
+                    price_value = excluded.price_value,
+                    image = COALESCE(excluded.image, products.image),
+                    seller = excluded.seller,
+                    link = excluded.link,
+                    grade = COALESCE(excluded.grade, products.grade),
+                    fast_delivery = excluded.fast_delivery,
+                    last_seen = excluded.last_seen
+                WHERE excluded.last_seen >= products.last_seen
+            """, rows)
+            # 예전 결과(import_results.py)를 나중에 넣는 경우: 상품 정보는 그대로 두고 처음 발견 시각만 앞당김
+            self.conn.executemany("""
+                UPDATE products SET first_seen = ? WHERE product_id = ? AND first_seen > ?
+            """, [(seen_at, row[0], seen_at) for row in rows])
+            self.conn.executemany("""
+                INSERT INTO product_keywords (product_id, keyword, first_seen, last_seen)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(product_id, keyword) DO UPDATE SET
+                    first_seen = MIN(product_keywords.first_seen, excluded.first_seen),
+                    last_seen = MAX(product_keywords.last_seen, excluded.last_seen),
+                    times_seen = product_keywords.times_seen + 1
+            """, [(row[0], search_keyword, seen_at, seen_at) for row in rows])
+            # 상품명이 바뀌었을 수 있으므로 저장된 이름 기준으로 역색인 갱신
+            self._index_names([row[0] for row in rows])
+        return len(rows)
+    
+    def search_names(self, query, min_price=None, max_price=None, fast_delivery=None, min_score=0.0, limit=20):
+        """
+        상품명 역색인으로 저장된 상품 검색 (사이트 접속 없음)
         
-        # 현재 URL 저장 (검색 전)
-        initial_url = driver.current_url
-        print(f"검색 전 URL: {initial_url}")
+        검색어 토큰마다 희소할수록 큰 가중치(idf)를 주고, 상품이 포함한 토큰의 가중치 합으로 정렬한다.
+        점수가 같으면 가격이 낮은 상품이 먼저 온다.
         
-        if search_button:
-            search_button.click()
-        else:
-            # 검색 버튼을 찾지 못하면 Enter 키 입력
-            search_input.send_keys(Keys.RETURN)
-            print("✓ Enter 키로 검색 실행")
+        Args:
+            query: 검색어
+            min_price: 최소 가격 (이상)
+            max_price: 최대 가격 (이하)
+            fast_delivery: True/False면 빠른배송 여부로 필터링
+            min_score: 이 점수 이상인 상품만 (1.0이면 검색어 토큰을 모두 포함한 상품)
+            limit: 최대 결과 수 (None이면 제한 없음)
         
-        # 검색 결과 페이지 로딩 대기
-        print("검색 결과 페이지 로딩 대기 중...")
+        Returns:
+            상품 딕셔너리 리스트 (score: 0~1, 검색어 토큰 가중치 중 일치한 비율)
+        """
+        query_tokens = list(tokenize_product_name(query))
+        if not query_tokens:
+            return []
         
-        # URL 변경 확인 (supplyList.php로 이동하는지 확인)
-        try:
-            # URL이 변경되고 supplyList.php를 포함하는지 확인
-            WebDriverWait(driver, 15).until(
-                lambda d: (
-                    "supplyList.php" in d.current_url or 
-                    "search" in d.current_url.lower() or
-                    d.current_url != initial_url
-                )
-            )
-            print(f"✓ 검색 결과 페이지로 이동: {driver.current_url}")
+        with self.lock:
+            total = self.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+            placeholders = ", ".join("?" for _ in query_tokens)
+            doc_freq = dict(self.conn.execute(
+                f"SELECT token, COUNT(*) FROM name_tokens WHERE token IN ({placeholders}) GROUP BY token", query_tokens
+            ).fetchall())
+            weights = {token: math.log(1 + total / doc_freq[token]) for token in query_tokens if token in doc_freq}
+            if not weights:
+                return []
+            # 저장소에 없는 토큰은 가장 희소한 토큰으로 보고 만점에 포함
+            max_score = sum(weights.get(token, math.log(1 + total)) for token in query_tokens)
             
-            # URL에서 검색어 확인
-            parsed_url = urlparse(driver.current_url)
-            query_params = parse_qs(parsed_url.query)
-            if 'sw' in query_params:
-                decoded_keyword = query_params['sw'][0]
-                print(f"✓ URL에서 검색어 확인: {decoded_keyword}")
+            conditions = []
+            params = [json.dumps(weights)]
+            if min_price is not None:
+                conditions.append("p.price_value >= ?")
+                params.append(min_price)
+            if max_price is not None:
+                conditions.append("p.price_value <= ?")
+                params.append(max_price)
+            if fast_delivery is not None:
+                conditions.append("p.fast_delivery = ?")
+                params.append(1 if fast_delivery else 0)
+            # 부동소수점 합 오차로 만점이 1.0보다 약간 작게 계산되는 경우를 허용
+            params.append(min_score * max_score - 1e-9)
+            params.append(-1 if limit is None else limit)
             
-        except TimeoutException:
-            print("⚠ URL 변경이 감지되지 않았지만 계속 진행합니다...")
+            rows = self.conn.execute(f"""
+                SELECT p.*, SUM(q.value) AS score
+                FROM json_each(?) q
+                JOIN name_tokens t ON t.token = q.key
+                JOIN products p ON p.product_id = t.product_id
+                {"WHERE " + " AND ".join(conditions) if conditions else ""}
+                GROUP BY p.product_id
+                HAVING score >= ?
+                ORDER BY score DESC, p.price_value
+                LIMIT ?
+            """, params).fetchall()
         
-        # 검색 결과 요소가 로드될 때까지 대기
-        try:
-            # 여러 선택자를 순차적으로 시도
-            result_loaded = False
-            selectors = [
-                ".sub_cont_bane1",
-                ".sub_cont_bane1_SetListGallery",
-                "[class*='item']"
-            ]
-            for selector in selectors:
-                try:
-                    WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    print(f"✓ 검색 결과 요소 로드 완료: {selector}")
-                    result_loaded = True
-                    break
-                except TimeoutException:
-                    continue
-            if not result_loaded:
-                print("⚠ 검색 결과 요소를 찾지 못했지만 계속 진행합니다...")
-        except Exception as e:
-            print(f"⚠ 검색 결과 요소 대기 중 오류: {e}")
+        products = []
+        for row in rows:
+            product = dict(row)
+            product['fast_delivery'] = bool(product['fast_delivery'])
+            product['score'] = min(1.0, round(product['score'] / max_score, 3))
+            products.append(product)
+        return products
+    
+    def query(self, min_price=None, max_price=None, fast_delivery=None, min_grade=None, keyword=None, limit=None):
+        """
+        조건에 맞는 상품 조회 (가격 오름차순)
         
-        # 페이지 스크롤하여 동적 콘텐츠 로드
-        try:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
-            driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
-        except:
-            pass
+        Args:
+            min_price: 최소 가격 (이상)
+            max_price: 최대 가격 (이하)
+            fast_delivery: True/False면 빠른배송 여부로 필터링
+            min_grade: 최소 판매자 등급
+            keyword: 이 검색어로 발견된 상품만
+            limit: 최대 결과 수
         
-        # 추가 로딩 대기 (동적 콘텐츠 로딩)
-        time.sleep(2)
+        Returns:
+            상품 딕셔너리 리스트 (keywords: 발견된 검색어 리스트 포함)
+        """
+        conditions = []
+        params = []
+        if min_price is not None:
+            conditions.append("p.price_value >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            conditions.append("p.price_value <= ?")
+            params.append(max_price)
+        if fast_delivery is not None:
+            conditions.append("p.fast_delivery = ?")
+            params.append(1 if fast_delivery else 0)
+        if min_grade is not None:
+            conditions.append("p.grade >= ?")
+            params.append(min_grade)
+        if keyword is not None:
+            conditions.append("p.product_id IN (SELECT product_id FROM product_keywords WHERE keyword = ?)")
+            params.append(keyword)
         
-        # 검색 결과 파싱
-        results = parse_search_results(driver, max_results, min_price=min_price)
+        sql = f"""
+            SELECT p.*, (SELECT group_concat(keyword, char(31)) FROM product_keywords k
+                         WHERE k.product_id = p.product_id) AS keywords
+            FROM products p
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            ORDER BY p.price_value
+        """
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
         
-        if min_price:
-            print(f"\n✓ 검색 완료! {min_price:,}원 이상 상품 {len(results)}개 발견")
-        else:
-            print(f"\n✓ 검색 완료! 총 {len(results)}개 결과 발견")
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
         
-        if return_driver:
-            return results, driver
-        return results
+        products = []
+        for row in rows:
+            product = dict(row)
+            product['fast_delivery'] = bool(product['fast_delivery'])
+            product['keywords'] = product['keywords'].split('\x1f') if product['keywords'] else []
+            products.append(product)
+        return products
+    
+    def filter_untransferred(self, product_ids, max_age_seconds=TRANSFER_TTL_SECONDS):
+        """
+        이미 스피드고로 전송한 상품을 걸러냄
         
-    except Exception as e:
-        print(f"✗ 검색 실패: {e}")
-        import traceback
-        traceback.print_exc()
-        if return_driver:
-            return [], driver if driver else None
-        if driver and not return_driver:
-            driver.quit()
-        return []
+        Args:
+            product_ids: 상품번호 리스트
+            max_age_seconds: 이 시간보다 오래전에 전송한 상품은 다시 전송 대상으로 봄 (None이면 만료 없음)
+        
+        Returns:
+            (전송할 상품번호 리스트, 건너뛴 상품번호 리스트) - 입력 순서 유지
+        """
+        ids = [str(pid) for pid in product_ids]
+        if not ids:
+            return [], []
+        sql = "SELECT product_id FROM transfers WHERE product_id IN (SELECT value FROM json_each(?))"
+        params = [json.dumps(ids)]
+        if max_age_seconds is not None:
+            sql += " AND transferred_at >= ?"
+            params.append((datetime.now() - timedelta(seconds=max_age_seconds)).isoformat(timespec='seconds'))
+        with self.lock:
+            done = {row[0] for row in self.conn.execute(sql, params)}
+        pending = [pid for pid in ids if pid not in done]
+        skipped = [pid for pid in ids if pid in done]
+        return pending, skipped
+    
+    def mark_transferred(self, product_ids, search_keyword=None, transferred_at=None):
+        """상품을 스피드고로 전송했다고 기록"""
+        transferred_at = transferred_at or datetime.now().isoformat(timespec='seconds')
+        with self.lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO transfers (product_id, keyword, transferred_at) VALUES (?, ?, ?)
+                ON CONFLICT(product_id) DO UPDATE SET
+                    keyword = excluded.keyword,
+                    transferred_at = excluded.transferred_at
+            """, [(str(pid), search_keyword, transferred_at) for pid in product_ids])
+    
+    def get_imported_file(self, path):
+        """
+        import_results.py로 가져온 결과 파일의 기록 반환
+        
+        Returns:
+            {'path', 'mtime', 'size', 'sha256', 'products', 'imported_at'} 딕셔너리, 없으면 None
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM imported_files WHERE path = ?", (path,)).fetchone()
+        return dict(row) if row else None
+    
+    def record_imported_file(self, path, mtime, size, sha256, products):
+        """결과 파일을 가져왔다고 기록 (같은 파일은 다음 가져오기에서 건너뜀)"""
+        with self.lock, self.conn:
+            self.conn.execute("""
+                INSERT INTO imported_files (path, mtime, size, sha256, products, imported_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    mtime = excluded.mtime, size = excluded.size, sha256 = excluded.sha256,
+                    products = excluded.products, imported_at = excluded.imported_at
+            """, (path, mtime, size, sha256, products, datetime.now().isoformat(timespec='seconds')))
+    
+    def count(self):
+        """저장된 상품 수"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
 
 
-def extract_price_number(price_text):
+# 실행 중 마이박스 전송 집계 {'transferred': 전송한 상품 수, 'skipped': 이미 전송해서 건너뛴 상품 수}
+TRANSFER_STATS = {'transferred': 0, 'skipped': 0}
+TRANSFER_STATS_LOCK = threading.Lock()
+
+
+def print_transfer_stats():
+    """이번 실행의 마이박스 전송/중복 건너뜀 요약 출력"""
+    with TRANSFER_STATS_LOCK:
+        stats = dict(TRANSFER_STATS)
+    if not stats['transferred'] and not stats['skipped']:
+        return
+    print(f"\n마이박스 전송: {stats['transferred']}개 전송, {stats['skipped']}개 중복으로 건너뜀")
+
+
+def transfer_results_to_mybox(driver, search_keyword, results, product_pages=None, mybox_lock=None,
+                              product_store=None):
     """
-    가격 텍스트에서 숫자만 추출
+    검색 결과 상품을 마이박스에 담고 스피드고로 전송
     
     Args:
-        price_text: 가격 텍스트 (예: "29,530원", "12,000원")
+        driver: 로그인된 Selenium WebDriver 객체
+        search_keyword: 검색어 (검색 결과 페이지 이동 및 로그용)
+        results: 검색 결과 리스트
+        product_pages: {상품번호: 검색 결과 페이지 URL} (None이면 driver가 이미 결과 페이지에 있다고 보고 그대로 진행)
+        mybox_lock: 여러 driver가 같은 계정의 마이박스를 동시에 전송하지 않도록 잡을 Lock (선택)
+        product_store: 있으면 이미 전송한 상품(다른 검색어/이전 실행 포함)을 건너뛰고 전송 기록을 남김
     
     Returns:
-        가격 숫자 (int), 파싱 실패시 None
+        전송 성공 여부 (bool), 전송할 상품이 없으면 None
     """
-    if not price_text:
+    # 검색 결과에서 상품번호 추출
+    product_ids = [p.get('product_id') for p in results if p.get('product_id')]
+    
+    if not product_ids:
+        print(f"\n⚠ 검색어 '{search_keyword}': 상품번호를 찾을 수 없어 마이박스담기를 건너뜁니다.")
         return None
     
-    # 콤마, 원, 공백 제거 후 숫자만 추출
-    cleaned = price_text.replace(',', '').replace('원', '').replace(' ', '').strip()
+    # 마이박스 페이지의 "전체 선택 → 스피드고전송"은 계정 단위로 동작하므로 한 번에 하나의 driver만 실행
+    # (중복 확인도 lock 안에서 해야 병렬 처리 중인 다른 검색어와 같은 상품을 두 번 보내지 않음)
+    success = True
+    with mybox_lock or threading.Lock():
+        if product_store is not None:
+            product_ids, skipped_ids = product_store.filter_untransferred(product_ids)
+            if skipped_ids:
+                with TRANSFER_STATS_LOCK:
+                    TRANSFER_STATS['skipped'] += len(skipped_ids)
+                print(f"\n검색어 '{search_keyword}': 이미 전송한 상품 {len(skipped_ids)}개 건너뜀")
+            if not product_ids:
+                print(f"✓ 검색어 '{search_keyword}': 새로 전송할 상품이 없습니다.")
+                return None
+        
+        # 체크박스는 상품이 있는 결과 페이지에서만 선택할 수 있으므로 페이지별로 묶어서 전송
+        if product_pages is None:
+            page_groups = {None: product_ids}
+        else:
+            page_groups = {}
+            default_url = build_search_url(search_keyword, page=1, page_size=SEARCH_MAX_PAGE_SIZE)
+            for product_id in product_ids:
+                page_groups.setdefault(product_pages.get(product_id, default_url), []).append(product_id)
+        
+        for page_url, page_product_ids in page_groups.items():
+            print(f"\n{'=' * 60}")
+            print(f"마이박스에 {len(page_product_ids)}개 상품 추가 및 스피드고 전송 시도")
+            print(f"{'=' * 60}")
+            
+            # HTTP로 검색한 경우 체크박스 선택을 위해 해당 검색 결과 페이지로 이동
+            if page_url is not None:
+                with TRACER.span('navigate', backend='driver', purpose='mybox'):
+                    driver.get(page_url)
+                    WebDriverWait(driver, 10).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='item[]']"))
+                    )
+            
+            # 마이박스담기 및 스피드고 전송 실행 (선택하지 못한 상품은 전송되지 않았으므로 기록하지 않음)
+            sent_ids = add_products_to_mybox(driver, product_ids=page_product_ids, select_all=False)
+            if sent_ids is None:
+                success = False
+                continue
+            if len(sent_ids) < len(page_product_ids):
+                success = False
+            
+            with TRANSFER_STATS_LOCK:
+                TRANSFER_STATS['transferred'] += len(sent_ids)
+            if product_store is not None and sent_ids:
+                product_store.mark_transferred(sent_ids, search_keyword)
     
-    # 숫자만 추출 (정규식 사용)
-    numbers = re.findall(r'\d+', cleaned)
-    if numbers:
+    if success:
+        print(f"\n✓ 검색어 '{search_keyword}' 처리 완료!")
+    else:
+        print(f"\n✗ 검색어 '{search_keyword}' 처리 실패")
+        DIAGNOSTICS.mark_failed(f"'{search_keyword}' 마이박스담기/스피드고 전송 실패")
+    return success
+
+
+def print_local_coverage(product_store, search_keyword, min_price=None):
+    """검색 전에 상품 저장소에 이미 있는 관련 상품 수 출력 (상품명에 검색어 토큰을 모두 포함한 상품)"""
+    start = time.perf_counter()
+    matches = product_store.search_names(search_keyword, min_price=min_price, min_score=1.0, limit=None)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"로컬 저장소: '{search_keyword}' 관련 상품 {len(matches)}개 ({elapsed_ms:.1f}ms)")
+    return matches
+
+
+class RunJournal:
+    """
+    검색어 묶음 실행의 진행 기록 (JSON Lines, --resume으로 중단된 단계부터 이어서 실행)
+    
+    검색어마다 searched(검색) → saved(결과 파일 저장) → transferred(마이박스/스피드고 전송) 단계를
+    끝낼 때 한 줄씩 추가한다. 한 줄은 O_APPEND로 연 파일에 write 한 번으로 쓰고 fsync하므로
+    브라우저나 프로세스가 중간에 죽어도 앞선 줄은 온전하고, 쓰는 도중 잘린 마지막 줄은 읽을 때 건너뛴다.
+    
+    이어서 실행하면 transferred까지 끝난 검색어는 건너뛰고, saved까지 끝난 검색어는 저장된 결과
+    파일과 페이지 정보로 전송부터 다시 한다. 검색만 끝난 검색어는 결과가 파일에 없으므로 다시 검색한다.
+    전송 도중 중단된 경우 이미 보낸 상품은 상품 저장소(ProductStore) 기록으로 다시 보내지 않는다.
+    
+    사용 예:
+        journal = RunJournal()
+        resumed = journal.load_last()          # --resume일 때 마지막 실행 상태 읽기
+        journal.begin(search_keywords, resume=resumed)
+        journal.record(keyword, 'searched', count=len(results))
+    """
+    
+    STEPS = ('searched', 'saved', 'transferred')
+    
+    def __init__(self, path=RUN_JOURNAL_PATH):
+        self.path = path
+        self.run_id = None
+        self.keywords = []
+        self.state = {}  # {검색어: {단계: 기록}}
+        self.lock = threading.Lock()
+        self.fd = None
+    
+    def _write(self, record):
+        """기록 한 줄 추가 (self.lock 안에서 호출)"""
+        if self.fd is None:
+            flags = os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+            self.fd = os.open(self.path, flags, 0o644)
+            # 이전 실행이 줄을 쓰다가 중단되었으면 잘린 줄 뒤에 이어 쓰지 않도록 줄을 바꿈
+            size = os.fstat(self.fd).st_size
+            if size:
+                os.lseek(self.fd, size - 1, os.SEEK_SET)
+                if os.read(self.fd, 1) != b"\n":
+                    os.write(self.fd, b"\n")
+        os.write(self.fd, (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+        os.fsync(self.fd)
+    
+    def read_records(self):
+        """기록 파일의 모든 줄 (잘린 줄은 건너뜀)"""
+        records = []
         try:
-            return int(''.join(numbers))
-        except ValueError:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return records
+    
+    def load_last(self):
+        """
+        마지막 실행의 검색어와 검색어별 진행 상태 읽기
+        
+        Returns:
+            이어갈 실행이 있으면 True
+        """
+        records = self.read_records()
+        starts = [record for record in records if record.get('step') == 'run_start']
+        if not starts:
+            return False
+        self.run_id = starts[-1]['run']
+        self.keywords = list(starts[-1].get('keywords') or [])
+        self.state = {}
+        for record in records:
+            if record.get('run') == self.run_id and record.get('step') in self.STEPS:
+                self.state.setdefault(record['keyword'], {})[record['step']] = record
+        return True
+    
+    def begin(self, keywords, resume=False):
+        """새 실행 시작 (resume=True면 load_last()로 읽은 실행을 이어서 기록)"""
+        with self.lock:
+            if not resume:
+                self.run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+                self.state = {}
+            self.keywords = list(keywords)
+            self._write({
+                'run': self.run_id, 'ts': datetime.now().isoformat(timespec='seconds'),
+                'step': 'run_resume' if resume else 'run_start', 'keywords': self.keywords,
+            })
+    
+    def record(self, search_keyword, step, **data):
+        """검색어의 단계 완료 기록"""
+        record = {'run': self.run_id, 'ts': datetime.now().isoformat(timespec='seconds'),
+                  'keyword': search_keyword, 'step': step, **data}
+        with self.lock:
+            self.state.setdefault(search_keyword, {})[step] = record
+            self._write(record)
+    
+    def record_saved(self, search_keyword, path, results, product_pages=None, driver=None):
+        """
+        saved 단계 기록 (이어서 실행할 때 전송할 결과 파일과 상품별 페이지 URL)
+        
+        product_pages가 None이면(브라우저로 검색) driver가 있는 검색 결과 페이지 URL을 대신 기록한다.
+        """
+        page_url = None
+        if product_pages is None and driver is not None:
+            try:
+                page_url = driver.current_url
+            except Exception:
+                pass
+        self.record(search_keyword, 'saved', path=path, count=len(results), product_pages=product_pages,
+                    page_url=page_url)
+    
+    def completed(self, search_keyword):
+        """
+        전송까지 끝난 검색어인지
+        
+        검색 결과가 없었던 검색어는 재시도 후에도 실패한 검색과 구분할 수 없으므로 다시 검색한다.
+        """
+        return 'transferred' in self.state.get(search_keyword, {})
+    
+    def load_saved(self, search_keyword):
+        """
+        saved 단계까지 끝난 검색어의 저장된 결과 읽기
+        
+        Returns:
+            (검색 결과 리스트, {상품번호: 검색 결과 페이지 URL}) 튜플, 저장된 결과가 없거나 읽을 수 없으면 None
+        """
+        saved = self.state.get(search_keyword, {}).get('saved')
+        if not saved:
             return None
-    return None
+        try:
+            with open(saved['path'], 'r', encoding='utf-8') as f:
+                results = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ 검색어 '{search_keyword}': 저장된 결과를 읽을 수 없어 다시 검색합니다 ({e})")
+            return None
+        product_pages = saved.get('product_pages')
+        if product_pages is None:
+            # 브라우저로 검색한 결과는 검색했던 결과 페이지에서 다시 선택
+            page_url = saved.get('page_url') or build_search_url(search_keyword, page=1, page_size=SEARCH_MAX_PAGE_SIZE)
+            product_pages = {p['product_id']: page_url for p in results if p.get('product_id')}
+        return results, product_pages
+    
+    def print_resume_summary(self):
+        """이어서 실행할 때 검색어별 남은 단계 요약 출력"""
+        done = sum(1 for keyword in self.keywords if self.completed(keyword))
+        transfer_only = sum(1 for keyword in self.keywords
+                            if not self.completed(keyword) and 'saved' in self.state.get(keyword, {}))
+        print(f"↺ 실행 {self.run_id} 이어서 진행: 검색어 {len(self.keywords)}개 중 완료 {done}개, "
+              f"전송만 남음 {transfer_only}개, 검색부터 {len(self.keywords) - done - transfer_only}개")
+    
+    def close(self):
+        with self.lock:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
 
 
-def parse_search_results(driver, max_results=None, min_price=None):
+def process_keyword(driver, search_keyword, http_session=None, result_dir="result",
+                    max_results=20, min_price=12000, mybox_lock=None, product_store=None, fast_delivery=None,
+                    min_grade=None, price_search=False, journal=None, transfer=True, get_driver=None):
     """
-    검색 결과 페이지에서 상품 정보 파싱
+    검색어 하나를 검색 → 결과 저장 → 마이박스담기/스피드고 전송까지 처리
+    
+    journal(RunJournal)이 있으면 단계마다 진행을 기록하고, 이전 실행에서 끝난 단계는 건너뛴다.
     
     Args:
-        driver: Selenium WebDriver 객체
+        driver: 로그인된 Selenium WebDriver 객체 (None이면 get_driver로 받음)
+        search_keyword: 검색할 키워드
+        http_session: 있으면 검색은 HTTP로 수행 (search_products_http 참고)
+        result_dir: JSON 결과 저장 폴더
         max_results: 가져올 최대 결과 수
-        min_price: 최소 가격 (이 가격 이상인 상품만 필터링)
+        min_price: 최소 가격
+        mybox_lock: 마이박스 전송 구간을 직렬화할 Lock (DriverPool에서 공유)
+        product_store: 있으면 결과를 SQLite 상품 저장소에도 저장하고, 이미 전송한 상품은 다시 전송하지 않음
+        fast_delivery: True면 빠른배송 상품만
+        min_grade: 최소 판매자 등급
+        price_search: True면 가격순 이진 탐색으로 min_price를 넘는 페이지부터 검색
+        journal: 진행 기록 (RunJournal, 선택)
+        transfer: False면 검색/저장까지만 하고 마이박스 전송은 건너뜀 (오프라인 모드)
+        get_driver: driver가 None일 때 브라우저가 처음 필요해지면 호출해 driver를 받을 함수
+            (HTTP 검색이면 전송할 결과가 있을 때만 브라우저를 시작, 실패하면 None 반환)
     
     Returns:
-        상품 정보 리스트
+        검색 결과 리스트 (이전 실행에서 끝난 검색어나 driver가 없어 검색하지 못한 검색어면 None)
     """
-    results = []
+    def browser():
+        nonlocal driver
+        if driver is None and get_driver is not None:
+            driver = get_driver()
+        return driver
+    
+    TRACER.set_keyword(search_keyword)
+    if journal is not None and journal.completed(search_keyword):
+        print(f"\n↺ 검색어 '{search_keyword}': 이전 실행에서 처리를 마쳐 건너뜁니다.")
+        return None
+    
+    saved = journal.load_saved(search_keyword) if journal is not None else None
+    if saved is not None:
+        results, product_pages = saved
+        print(f"\n↺ 검색어 '{search_keyword}': 저장된 결과 {len(results)}개로 마이박스 전송부터 이어갑니다.")
+    else:
+        if http_session is None and browser() is None:
+            print(f"\n✗ 검색어 '{search_keyword}': driver가 없어 검색하지 못했습니다.")
+            return None
+        if product_store is not None:
+            print_local_coverage(product_store, search_keyword, min_price=min_price)
+        
+        results, product_pages = run_keyword_search(
+            driver, search_keyword, http_session=http_session, max_results=max_results, min_price=min_price,
+            fast_delivery=fast_delivery, min_grade=min_grade, price_search=price_search,
+        )
+        if journal is not None:
+            journal.record(search_keyword, 'searched', count=len(results))
+        
+        if not results:
+            print(f"\n검색어 '{search_keyword}': 검색 결과가 없습니다.")
+            return results
+        
+        print_search_results(results)
+        path = save_search_results(search_keyword, results, result_dir)
+        if product_store is not None:
+            product_store.upsert_results(search_keyword, results)
+        if journal is not None:
+            journal.record_saved(search_keyword, path, results, product_pages, driver=driver)
+    
+    if not transfer:
+        return results
+    if browser() is None:
+        print(f"\n⚠ 검색어 '{search_keyword}': driver가 없어 마이박스담기를 건너뜁니다.")
+        return results
+    
+    success = transfer_results_to_mybox(driver, search_keyword, results, product_pages=product_pages,
+                                        mybox_lock=mybox_lock, product_store=product_store)
+    if journal is not None and success is not False:
+        journal.record(search_keyword, 'transferred', success=success)
+    return results
+
+
+class DriverPool:
+    """
+    미리 로그인해 둔 Chrome driver 여러 개로 검색어를 병렬 처리하는 풀
+    
+    사용 예:
+        with DriverPool(size=4) as pool:
+            all_results = pool.map(process_keyword, keywords)
+    
+    각 검색어는 그 시점에 쉬고 있는 driver에 배정되고, 결과는 입력 순서대로 반환된다.
+    마이박스 전송은 계정 단위로 동작하므로 pool.mybox_lock으로 한 번에 하나씩만 실행된다.
+    """
+    
+    def __init__(self, size=2, headless=True, username=None, password=None, fast=False):
+        self.size = max(1, size)
+        self.headless = headless
+        self.fast = fast
+        self.username = username
+        self.password = password
+        self.mybox_lock = threading.Lock()
+        self._drivers = []
+        self._idle = queue.Queue()
+        self._executor = None
+    
+    def start(self):
+        """driver를 size개 띄우고 로그인 (첫 driver의 로그인 세션을 나머지가 재사용)"""
+        print(f"\n브라우저 {self.size}개를 시작하고 로그인합니다...")
+        
+        try:
+            # 첫 번째 driver가 로그인하여 세션 파일을 만든 뒤 나머지는 저장된 세션으로 병렬 시작
+            first = start_logged_in_driver(
+                headless=self.headless, username=self.username, password=self.password, fast=self.fast
+            )
+            if first is None:
+                raise RuntimeError("브라우저 로그인에 실패하여 driver 풀을 시작할 수 없습니다.")
+            self._add_driver(first)
+            
+            if self.size > 1:
+                with ThreadPoolExecutor(max_workers=self.size - 1) as starter:
+                    futures = [
+                        starter.submit(start_logged_in_driver, self.headless, self.username, self.password, self.fast)
+                        for _ in range(self.size - 1)
+                    ]
+                    for future in futures:
+                        driver = future.result()
+                        if driver is not None:
+                            self._add_driver(driver)
+        except BaseException:
+            # 시작 도중 실패하거나 Ctrl-C를 받으면 이미 띄운 브라우저를 정리
+            self.close()
+            raise
+        
+        print(f"✓ 로그인된 브라우저 {len(self._drivers)}개 준비 완료")
+        self._executor = ThreadPoolExecutor(max_workers=len(self._drivers))
+        return self
     
-    try:
-        # 도매꾹 사이트의 실제 상품 컨테이너 선택자
-        product_selectors = [
-            ".sub_cont_bane1",  # 메인 상품 컨테이너
-            ".sub_cont_bane1_SetListGallery",  # 갤러리 뷰 상품 컨테이너
-        ]
+    def _add_driver(self, driver):
+        self._drivers.append(driver)
+        self._idle.put(driver)
+    
+    def _run_with_driver(self, func, item, kwargs):
+        driver = self._idle.get()
+        try:
+            return func(driver, item, mybox_lock=self.mybox_lock, **kwargs)
+        finally:
+            self._idle.put(driver)
+    
+    def map(self, func, items, **kwargs):
+        """
+        items의 각 항목에 func(driver, item, mybox_lock=..., **kwargs)를 병렬 실행
         
-        products = []
-        for selector in product_selectors:
-            try:
-                products = driver.find_elements(By.CSS_SELECTOR, selector)
-                if len(products) > 0:
-                    print(f"✓ 상품 요소 찾음: {selector} ({len(products)}개)")
-                    break
-            except:
-                continue
+        Returns:
+            입력 순서대로 정렬된 결과 리스트 (예외가 난 항목은 None)
         
-        if not products:
-            # 페이지 소스를 확인하여 구조 파악
-            print("상품 요소를 찾지 못했습니다. 페이지 구조 확인 중...")
-            page_source = driver.page_source[:5000]  # 처음 5000자만 확인
-            print(f"페이지 소스 샘플:\n{page_source}")
-            return results
+        Raises:
+            CircuitOpenError: 회로 차단기가 실행 중단을 결정한 경우 (남은 검색어는 취소)
+        """
+        if self._executor is None:
+            self.start()
+        
+        futures = [self._executor.submit(self._run_with_driver, func, item, kwargs) for item in items]
+        pending = set(futures)
+        try:
+            # 메인 스레드가 Ctrl-C를 받을 수 있도록 짧은 간격으로 대기
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if isinstance(future.exception(), CircuitOpenError):
+                        raise future.exception()
+        except KeyboardInterrupt:
+            print("\n⚠ 중단 요청을 받아 남은 검색어를 취소합니다...")
+            for future in futures:
+                future.cancel()
+            raise
+        except CircuitOpenError:
+            for future in futures:
+                future.cancel()
+            raise
         
-        # 각 상품 정보 추출
-        product_list = products[:max_results] if max_results else products
-        for idx, product in enumerate(product_list):
+        results = []
+        for item, future in zip(items, futures):
             try:
-                product_info = {}
-                
-                # 상품번호 추출 (우선순위: input value > span.txt8)
-                product_id = None
-                try:
-                    # checkbox의 value 속성에서 상품번호 추출
-                    checkbox = product.find_element(By.CSS_SELECTOR, "input[name='item[]']")
-                    product_id = checkbox.get_attribute('value')
-                except:
-                    pass
-                
-                if not product_id:
-                    # span.txt8에서 상품번호 추출
-                    try:
-                        product_id_elems = product.find_elements(By.CSS_SELECTOR, "span.txt8")
-                        for elem in product_id_elems:
-                            text = elem.text.strip()
-                            if text.isdigit() and len(text) >= 6:  # 상품번호는 보통 6자리 이상
-                                product_id = text
-                                break
-                    except:
-                        pass
-                
-                product_info['product_id'] = product_id or ''
-                
-                # 상품명 추출 (.itemName 클래스)
-                try:
-                    name_elem = product.find_element(By.CSS_SELECTOR, ".itemName")
-                    product_info['name'] = name_elem.text.strip()
-                except:
-                    # 백업: main_cont_text1에서 추출
-                    try:
-                        name_elem = product.find_element(By.CSS_SELECTOR, ".main_cont_text1.b")
-                        product_info['name'] = name_elem.text.strip()
-                    except:
-                        product_info['name'] = ''
-                
-                # 가격 추출: <div class="main_cont_text1 priceLg"><strong>29,530</strong> 원</div>
-                price_value = None
-                price_display = ''
-                
-                # 다양한 선택자 시도
-                price_selectors = [
-                    (".main_cont_text1.priceLg strong", "방법1: .main_cont_text1.priceLg strong"),
-                    (".priceLg strong", "방법2: .priceLg strong"),
-                    (".main_cont_text1.priceLg", "방법3: .main_cont_text1.priceLg (전체)"),
-                    (".priceLg", "방법4: .priceLg (전체)"),
-                ]
-                
-                for selector, method_name in price_selectors:
-                    try:
-                        if "strong" in selector:
-                            # strong 태그 직접 찾기
-                            price_elem = product.find_element(By.CSS_SELECTOR, selector)
-                            price_text = price_elem.text.strip()
-                        else:
-                            # 컨테이너에서 strong 태그 찾기
-                            price_container = product.find_element(By.CSS_SELECTOR, selector)
-                            try:
-                                price_elem = price_container.find_element(By.CSS_SELECTOR, "strong")
-                                price_text = price_elem.text.strip()
-                            except:
-                                # strong 태그가 없으면 전체 텍스트 사용
-                                price_text = price_container.text.strip()
-                        
-                        if price_text:
-                            price_value = extract_price_number(price_text)
-                            if price_value is not None and price_value >= 100:  # 최소 100원 이상
-                                price_display = f"{price_value:,}원"
-                                break
-                    except (NoSuchElementException, Exception):
-                        continue
-                
-                # 위 방법들이 모두 실패하면 모든 strong 태그에서 찾기
-                if price_value is None:
-                    try:
-                        strong_elems = product.find_elements(By.CSS_SELECTOR, "strong")
-                        for strong in strong_elems:
-                            text = strong.text.strip()
-                            if not text:
-                                continue
-                            temp_value = extract_price_number(text)
-                            # 가격은 보통 100원 이상이고, 너무 큰 숫자(등급 등)는 제외
-                            if temp_value is not None and 100 <= temp_value <= 10000000:
-                                price_value = temp_value
-                                price_display = f"{price_value:,}원"
-                                break
-                    except Exception as e:
-                        pass
-                
-                # 가격 정보 저장
-                product_info['price'] = price_display  # 표시용 문자열 (예: "29,530원")
-                product_info['price_value'] = price_value  # 정수 값 (예: 29530) - 필터링용
-                
-                # 디버깅: 가격을 찾지 못한 경우 상세 정보 출력
-                if price_value is None:
-                    try:
-                        # 모든 priceLg 요소 찾기 시도
-                        price_containers = product.find_elements(By.CSS_SELECTOR, ".priceLg, .main_cont_text1.priceLg")
-                        if price_containers:
-                            for i, container in enumerate(price_containers):
-                                container_text = container.text.strip()
-                                print(f"상품 {idx+1} 디버깅: priceLg 요소 {i+1} 발견 - 텍스트: '{container_text}'")
-                        else:
-                            # 상품의 일부 HTML을 확인 (디버깅용)
-                            product_html = product.get_attribute('outerHTML')[:800]
-                            print(f"상품 {idx+1} 디버깅: priceLg 요소를 찾지 못함")
-                            print(f"  HTML 샘플: {product_html[:400]}...")
-                    except Exception as e:
-                        print(f"상품 {idx+1} 디버깅 중 오류: {e}")
-                
-                # 이미지 추출 (.bane_brd1 img)
-                try:
-                    img_elem = product.find_element(By.CSS_SELECTOR, ".bane_brd1 img")
-                    product_info['image'] = img_elem.get_attribute('src') or img_elem.get_attribute('data-src') or ''
-                except:
-                    # 백업: 모든 img 태그에서 상품 이미지 찾기
-                    try:
-                        imgs = product.find_elements(By.CSS_SELECTOR, "img")
-                        for img in imgs:
-                            src = img.get_attribute('src') or ''
-                            if 'domeggook.com' in src and 'upload/item' in src:
-                                product_info['image'] = src
-                                break
-                    except:
-                        product_info['image'] = ''
-                
-                # 판매자 정보 추출
-                try:
-                    seller_elem = product.find_element(By.CSS_SELECTOR, "a[onclick*='supplyList']")
-                    seller_text = seller_elem.text.strip()
-                    product_info['seller'] = seller_text
-                except:
-                    product_info['seller'] = ''
-                
-                # 상품 상세 링크 생성 (onclick에서 상품번호 추출)
-                if product_id:
-                    product_info['link'] = f"https://domemedb.domeggook.com/index/item/itemView.php?itemNo={product_id}"
-                else:
-                    product_info['link'] = ''
-                
-                # 추가 정보: 등급 추출
-                try:
-                    # 등급이 표시된 부분 찾기 (strong 태그 주변에 "등급" 텍스트가 있는 경우)
-                    grade_elems = product.find_elements(By.CSS_SELECTOR, ".main_cont_text3")
-                    for elem in grade_elems:
-                        text = elem.text.strip()
-                        if '등급' in text:
-                            # strong 태그에서 숫자 추출
-                            try:
-                                strong = elem.find_element(By.CSS_SELECTOR, "strong")
-                                product_info['grade'] = strong.text.strip()
-                                break
-                            except:
-                                # strong 태그가 없으면 텍스트에서 숫자 추출
-                                match = re.search(r'(\d+)등급', text)
-                                if match:
-                                    product_info['grade'] = match.group(1)
-                                    break
-                except:
-                    product_info['grade'] = ''
-                
-                # 빠른배송 여부
-                try:
-                    fast_delivery = product.find_element(By.CSS_SELECTOR, ".main_cont_bu9")
-                    product_info['fast_delivery'] = True
-                except:
-                    product_info['fast_delivery'] = False
-                
-                # 가격 필터링 적용
-                if min_price is not None:
-                    if product_info.get('price_value') is None:
-                        print(f"상품 {idx+1}: 가격을 파싱할 수 없어 건너뜀")
-                        continue
-                    if product_info['price_value'] < min_price:
-                        print(f"상품 {idx+1}: 가격 {product_info.get('price', 'N/A')}이(가) 최소 가격 {min_price:,}원 미만이어서 건너뜀")
-                        continue
-                
-                # 상품명이 있으면 결과에 추가
-                if product_info.get('name'):
-                    results.append(product_info)
-                else:
-                    print(f"상품 {idx+1}: 상품명을 찾을 수 없어 건너뜀")
-                    
+                results.append(future.result())
             except Exception as e:
-                print(f"상품 {idx+1} 파싱 중 오류: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
+                print(f"✗ '{item}' 처리 중 오류 발생: {e}")
+                results.append(None)
+        return results
+    
+    def close(self):
+        """대기 중인 작업을 취소하고 모든 driver 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
         
-    except Exception as e:
-        print(f"결과 파싱 중 오류: {e}")
-        import traceback
-        traceback.print_exc()
+        for driver in self._drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        if self._drivers:
+            print(f"\n브라우저 {len(self._drivers)}개를 종료했습니다.")
+        self._drivers = []
+        self._idle = queue.Queue()
     
-    return results
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
 
 
 if __name__ == "__main__":
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="도매꾹 사이트 검색 도구")
+    parser.add_argument('keywords', nargs='*', help="검색어 (여러 개는 쉼표 또는 공백으로 구분)")
+    parser.add_argument('--offline', action='store_true',
+                        help="네트워크 없이 HTTP 캐시에 있는 검색 결과만 사용 (마이박스 전송 생략)")
+    parser.add_argument('--trace', nargs='?', const=TRACE_PATH, default=None, metavar='PATH',
+                        help=f"단계별 소요 시간을 JSON Lines로 기록 (기본 경로: {TRACE_PATH}, 요약은 trace_summary.py)")
+    parser.add_argument('--diagnostics', action='store_true',
+                        help=f"실패 진단 스냅샷을 실행이 끝날 때 항상 {DIAGNOSTICS_DIR}/에 저장 (기본: 실행 실패 시에만)")
+    parser.add_argument('--driver-commands', action='store_true',
+                        help="WebDriver 명령 수를 단계/호출 함수별로 세고 예산(DRIVER_COMMAND_BUDGETS) 초과를 출력")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"중단된 마지막 실행을 이어서 처리 ({RUN_JOURNAL_PATH}, 검색어를 생략하면 마지막 실행의 검색어 사용)")
+    parser.add_argument('--rate-limit', type=float, default=None, metavar='RPS',
+                        help=f"사이트 요청 속도 제한, 초당 요청 수 (기본: {RATE_LIMIT_PER_SECOND:g}, 0이면 제한 없음)")
+    parser.add_argument('--burst', type=int, default=None, metavar='N',
+                        help=f"기다리지 않고 연속으로 보낼 수 있는 요청 수 (기본: {RATE_LIMIT_BURST})")
+    args = parser.parse_args()
+    
+    RATE_LIMITER.configure(rate=args.rate_limit, burst=args.burst)
+    
+    if args.trace:
+        TRACER.open(args.trace)
+    if args.driver_commands:
+        DRIVER_COMMANDS.enable()
     
     print("=" * 60)
     print("도매꾹 사이트 검색 도구")
     print("=" * 60)
     print()
     
+    # 검색어별 진행 기록 (--resume이면 마지막 실행의 진행 상태를 읽어 끝난 단계는 건너뜀)
+    run_journal = RunJournal()
+    resumed = args.resume and run_journal.load_last()
+    if args.resume and not resumed:
+        print(f"⚠ 이어서 실행할 기록이 없어 처음부터 실행합니다 ({RUN_JOURNAL_PATH})")
+    
     # 명령줄 인자로 검색어 받기 (여러 개 가능: 쉼표 또는 공백으로 구분)
-    if len(sys.argv) > 1:
+    if args.keywords:
         # 명령줄 인자들을 합쳐서 처리 (공백으로 구분된 여러 검색어)
-        search_keywords_input = " ".join(sys.argv[1:])
+        search_keywords_input = " ".join(args.keywords)
+    elif resumed:
+        # 마지막 실행의 검색어를 그대로 사용
+        search_keywords_input = None
     else:
         # 기본 검색어 또는 사용자 입력
         search_keywords_input = input("검색할 상품명을 입력하세요 (여러 개는 쉼표 또는 공백으로 구분): ").strip()
@@ -1668,16 +5554,18 @@ if __name__ == "__main__":
     
     # 검색어 분리 (쉼표 또는 공백으로 구분)
     search_keywords = []
-    if ',' in search_keywords_input:
+    if search_keywords_input is None:
+        search_keywords = list(run_journal.keywords)
+    elif ',' in search_keywords_input:
         # 쉼표로 구분
         search_keywords = [kw.strip() for kw in search_keywords_input.split(',') if kw.strip()]
     else:
         # 공백으로 구분 (하지만 하나의 검색어일 수도 있음)
         # 사용자가 여러 단어로 된 하나의 검색어를 입력했을 수도 있으므로
         # 일단 하나로 처리하고, 명령줄 인자로 여러 개가 들어온 경우만 분리
-        if len(sys.argv) > 2:
+        if len(args.keywords) > 1:
             # 명령줄에서 여러 개가 들어온 경우
-            search_keywords = [kw.strip() for kw in sys.argv[1:] if kw.strip()]
+            search_keywords = [kw.strip() for kw in args.keywords if kw.strip()]
         else:
             # 하나의 검색어로 처리
             search_keywords = [search_keywords_input]
@@ -1691,6 +5579,10 @@ if __name__ == "__main__":
         print(f"  {idx}. {kw}")
     print()
     
+    run_journal.begin(search_keywords, resume=resumed)
+    if resumed:
+        run_journal.print_resume_summary()
+    
     # 직접 URL 접근 방식 사용 (더 빠르고 안정적)
     # use_direct_url=True로 설정하면 검색 폼 대신 직접 URL로 접근
     # min_price=12000으로 설정하면 12,000원 이상인 상품만 필터링
@@ -1702,8 +5594,42 @@ if __name__ == "__main__":
     MY_USERNAME = None  # 여기에 아이디를 입력하세요 (예: "your_id")
     MY_PASSWORD = None  # 여기에 비밀번호를 입력하세요 (예: "your_password")
     
+    # True면 브라우저 대신 HTTP(requests + lxml)로 검색하고,
+    # 브라우저는 마이박스담기/스피드고 전송에만 사용
+    # (로그인 쿠키는 SESSION_STORE_PATH에 저장되어 다음 실행에서도 재사용)
+    USE_HTTP_SEARCH = True
+    
+    # 검색 필터 (검색 URL에 넣어 서버에서 먼저 거르고, 받은 결과도 다시 확인)
+    # FAST_DELIVERY_ONLY=True면 빠른배송 상품만, MIN_SELLER_GRADE=숫자면 그 등급 이상 판매자 상품만
+    FAST_DELIVERY_ONLY = None
+    MIN_SELLER_GRADE = None
+    
+    # True면 낮은 가격순으로 정렬해 최소 가격(12,000원)을 넘는 페이지를 이진 탐색한 뒤 그 페이지부터 가져옴
+    # (상품이 수천 개인 넓은 검색어에서 최소 가격 미만 페이지를 건너뜀)
+    PRICE_SORTED_SEARCH = False
+    
+    # 병렬로 사용할 브라우저 수 (1이면 하나의 브라우저로 순차 처리)
+    POOL_SIZE = 1
+    
+    # True면 이미지/폰트를 받지 않는 빠른 브라우저 프로필 사용 (get_chrome_driver 참고)
+    FAST_BROWSER_PROFILE = False
+    
     # driver는 한 번만 생성하고 재사용
     driver = None
+    driver_login_failed = False
+    http_session = None
+    
+    def get_driver():
+        """순차 처리용 driver를 처음 필요할 때 한 번만 생성 (로그인 포함, 실패하면 None)"""
+        global driver, driver_login_failed
+        if driver is None and not driver_login_failed:
+            # 로그인을 위해 브라우저 창 표시 (필요시 headless=True로 변경)
+            driver = start_logged_in_driver(headless=False, username=MY_USERNAME, password=MY_PASSWORD,
+                                            fast=FAST_BROWSER_PROFILE)
+            if driver is None:
+                driver_login_failed = True
+                DIAGNOSTICS.mark_failed("브라우저 로그인 실패")
+        return driver
     
     # result 폴더 생성 (없으면 생성)
     result_dir = "result"
@@ -1711,110 +5637,111 @@ if __name__ == "__main__":
         os.makedirs(result_dir)
         print(f"✓ '{result_dir}' 폴더를 생성했습니다.")
     
-    try:
-        # 각 검색어마다 순차 처리
-        for search_idx, search_keyword in enumerate(search_keywords, 1):
-            print("\n" + "=" * 60)
-            print(f"[{search_idx}/{len(search_keywords)}] 검색어: '{search_keyword}'")
-            print("=" * 60)
-            
-            # 첫 번째 검색어일 때만 driver 생성 (로그인 포함)
-            if driver is None:
-                # 검색 실행 (driver도 함께 반환받기 위해 return_driver=True)
-                search_result = search_products(
-                    search_keyword, 
-                    headless=False,  # 로그인을 위해 브라우저 창 표시 (필요시 True로 변경)
-                    max_results=20, 
-                    use_direct_url=True,
-                    min_price=12000,  # 12,000원 이상인 상품만 필터링
-                    username=MY_USERNAME,  # 직접 입력하거나 None으로 두면 실행 시 입력 요청
-                    password=MY_PASSWORD,   # 직접 입력하거나 None으로 두면 실행 시 입력 요청
-                    return_driver=True  # driver도 함께 반환받기
-                )
-                
-                # 결과와 driver 분리
-                if isinstance(search_result, tuple):
-                    results, driver = search_result
-                else:
-                    results = search_result
-                    driver = None
-            else:
-                # 두 번째 검색어부터는 기존 driver 재사용 (이미 로그인됨)
-                # 검색 페이지만 이동
-                encoded_keyword = quote(search_keyword, safe='')
-                search_url = f"https://domemedb.domeggook.com/index/item/supplyList.php?sf=subject&enc=utf8&fromOversea=0&mode=search&sw={encoded_keyword}"
-                driver.get(search_url)
-                print(f"✓ 검색 URL로 이동: {search_url}")
-                
-                # 페이지 로딩 대기
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                
-                # 검색 결과 파싱
-                time.sleep(2)  # 동적 콘텐츠 로딩 대기
-                results = parse_search_results(driver, max_results=20, min_price=12000)
-            
-            # 결과 출력
-            if results:
-                print(f"\n검색 결과: {len(results)}개 상품 발견")
-                
-                for idx, product in enumerate(results, 1):
-                    print(f"\n[{idx}] {product.get('name', 'N/A')}")
-                    if product.get('product_id'):
-                        print(f"    상품번호: {product['product_id']}")
-                    if product.get('price'):
-                        print(f"    가격: {product['price']}")
-                    if product.get('seller'):
-                        print(f"    판매자: {product['seller']}")
-                    if product.get('grade'):
-                        print(f"    등급: {product['grade']}등급")
-                    if product.get('fast_delivery'):
-                        print(f"    빠른배송: 가능")
+    # 모든 검색어의 결과를 SQLite 저장소에도 모아 둠 (검색어를 넘나드는 조회용)
+    product_store = ProductStore(PRODUCT_DB_PATH)
+    
+    if args.offline:
+        # 캐시에 저장된 응답만 사용 (로그인 확인/브라우저 없이 캐시 키용 사용자만 맞춤)
+        HTTP_CACHE.offline = True
+        http_session = create_http_session(load_login_session() or [])
+        http_session.cache_user = MY_USERNAME or os.getenv('DOMEID') or load_login_user()
+        print("✓ 오프라인 모드: HTTP 캐시에 있는 검색 결과만 사용하고 마이박스 전송은 건너뜁니다.")
+    elif USE_HTTP_SEARCH:
+        http_session = get_logged_in_http_session(username=MY_USERNAME, password=MY_PASSWORD)
+        if http_session is None:
+            print("⚠ HTTP 검색용 로그인 세션을 만들지 못해 브라우저로 검색합니다.")
+    
+    if POOL_SIZE > 1 and len(search_keywords) > 1 and not args.offline:
+        # 로그인된 브라우저 여러 개에 검색어를 나눠서 병렬 처리
+        try:
+            with DriverPool(size=POOL_SIZE, headless=True, username=MY_USERNAME, password=MY_PASSWORD,
+                            fast=FAST_BROWSER_PROFILE) as pool:
+                pool.map(process_keyword, search_keywords, http_session=http_session, result_dir=result_dir,
+                         product_store=product_store, fast_delivery=FAST_DELIVERY_ONLY, min_grade=MIN_SELLER_GRADE,
+                         price_search=PRICE_SORTED_SEARCH, journal=run_journal)
+        except CircuitOpenError as e:
+            # 순차 처리와 같이 남은 검색어를 실패로 소모하지 않고 여기서 끝냄
+            print(f"✗ 남은 검색어 처리를 중단합니다: {e}")
+            DIAGNOSTICS.mark_failed(str(e))
+        except KeyboardInterrupt:
+            print("\n✗ 사용자 중단으로 처리를 종료합니다.")
+            product_store.close()
+            DIAGNOSTICS.mark_failed("사용자 중단")
+            DIAGNOSTICS.dump()
+            sys.exit(130)
+    else:
+        try:
+            # 각 검색어마다 순차 처리 (브라우저는 처음 필요할 때 한 번만 시작)
+            for search_idx, search_keyword in enumerate(search_keywords, 1):
+                print("\n" + "=" * 60)
+                print(f"[{search_idx}/{len(search_keywords)}] 검색어: '{search_keyword}'")
+                print("=" * 60)
                 
-                # JSON 파일로 저장 (result 폴더에 저장)
-                safe_keyword = search_keyword.replace(' ', '_').replace('/', '_')
-                output_file = os.path.join(result_dir, f"search_results_{safe_keyword}.json")
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, ensure_ascii=False, indent=2)
-                print(f"\n✓ 결과가 '{output_file}' 파일에 저장되었습니다.")
+                results = process_keyword(driver, search_keyword, http_session=http_session, result_dir=result_dir,
+                                          product_store=product_store, fast_delivery=FAST_DELIVERY_ONLY,
+                                          min_grade=MIN_SELLER_GRADE, price_search=PRICE_SORTED_SEARCH,
+                                          journal=run_journal, transfer=not args.offline, get_driver=get_driver)
+                if driver_login_failed and http_session is None:
+                    print("✗ 로그인 실패로 검색을 중단합니다.")
+                    break
+                if results is None or args.offline:
+                    continue
                 
-                # 마이박스에 상품 추가 및 스피드고 전송 (driver가 있는 경우)
-                if driver:
-                    # 검색 결과에서 상품번호 추출
-                    product_ids = [p.get('product_id') for p in results if p.get('product_id')]
-                    
-                    if product_ids:
-                        print(f"\n{'=' * 60}")
-                        print(f"마이박스에 {len(product_ids)}개 상품 추가 및 스피드고 전송 시도")
-                        print(f"{'=' * 60}")
-                        
-                        # 마이박스담기 및 스피드고 전송 실행
-                        success = add_products_to_mybox(driver, product_ids=product_ids, select_all=False)
-                        
-                        if success:
-                            print(f"\n✓ 검색어 '{search_keyword}' 처리 완료!")
-                        else:
-                            print(f"\n✗ 검색어 '{search_keyword}' 처리 실패")
-                    else:
-                        print(f"\n⚠ 검색어 '{search_keyword}': 상품번호를 찾을 수 없어 마이박스담기를 건너뜁니다.")
-                else:
-                    print(f"\n⚠ 검색어 '{search_keyword}': driver가 없어 마이박스담기를 건너뜁니다.")
-            else:
-                print(f"\n검색어 '{search_keyword}': 검색 결과가 없습니다.")
-            
-            # 다음 검색어 처리 전 잠시 대기
-            if search_idx < len(search_keywords):
-                print(f"\n다음 검색어로 이동합니다...")
-                time.sleep(2)
+                # 다음 검색어 처리 전 잠시 대기
+                if search_idx < len(search_keywords):
+                    print(f"\n다음 검색어로 이동합니다...")
+                    time.sleep(2)
+        
+        except CircuitOpenError as e:
+            # 사이트 실패가 계속되면 남은 검색어를 실패로 소모하지 않고 여기서 끝냄
+            print(f"✗ 남은 검색어 처리를 중단합니다: {e}")
+            DIAGNOSTICS.mark_failed(str(e))
+        except BaseException as e:
+            # 예외/중단으로 끝나면 메모리에 있는 진단 스냅샷을 남기고 다시 발생
+            DIAGNOSTICS.mark_failed(f"{type(e).__name__}: {e}")
+            DIAGNOSTICS.dump()
+            raise
+        finally:
+            # driver 종료
+            if driver:
+                print("\n브라우저를 종료합니다...")
+                driver.quit()
     
-    finally:
-        # driver 종료
-        if driver:
-            print("\n브라우저를 종료합니다...")
-            driver.quit()
+    print(f"\n✓ 상품 저장소 '{PRODUCT_DB_PATH}': 총 {product_store.count()}개 상품")
+    product_store.close()
+    run_journal.close()
+    
+    # 대기 구간별 실제 소요 시간 (고정 sleep 대비 절감 효과 확인용)
+    print_wait_stats()
+    
+    # 단계/호출 함수별 WebDriver 왕복 수와 예산 초과
+    if args.driver_commands:
+        DRIVER_COMMANDS.report()
+    
+    # 속도 제한으로 기다린 횟수/시간
+    RATE_LIMITER.report()
+    
+    # HTTP 캐시 적중/재검증 횟수
+    HTTP_CACHE.print_stats()
+    HTTP_CACHE.close()
+    
+    if args.trace:
+        TRACER.close()
+        print(f"\n✓ 단계별 소요 시간 기록: {args.trace} (요약: python trace_summary.py {args.trace})")
+    
+    # 검색어/실행을 넘나드는 중복 전송 건너뜀 집계
+    print_transfer_stats()
+    
+    # 논리 요소별 선택자 적중률 (첫 시도에 맞지 않는 요소 확인용)
+    SELECTOR_REGISTRY.report()
+    SELECTOR_REGISTRY.flush()
+    
+    # 실패 진단 스냅샷 (요청했거나 실행 중 실패가 있었을 때만 파일로 저장)
+    if args.diagnostics or DIAGNOSTICS.failed:
+        if DIAGNOSTICS.failed:
+            print(f"\n⚠ 실패 {len(DIAGNOSTICS.failures)}건: {', '.join(DIAGNOSTICS.failures[:5])}")
+        DIAGNOSTICS.dump()
     
     print("\n" + "=" * 60)
     print("모든 검색어 처리 완료!")
     print("=" * 60)
-
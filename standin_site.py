@@ -0,0 +1,557 @@
+"""
+도매꾹 로컬 대체 사이트 (stand-in)와 검색 결과 페이지 녹화 도구
+
+실제 사이트와 계정 없이 검색/파싱/마이박스담기/스피드고 전송 흐름을 실행해 보기 위한 로컬 HTTP 서버이다.
+한 서버가 세 사이트(domeggook / domemedb / speedgo)의 경로를 모두 제공하므로
+main.py의 사이트 주소 환경변수를 모두 이 서버로 지정하고 실행한다.
+
+    python standin_site.py serve --port 8765 --latency 0.2 --fail-rate 0.05
+    DOMEGGOOK_URL=http://127.0.0.1:8765 DOMEMEDB_URL=http://127.0.0.1:8765 \\
+    SPEEDGO_URL=http://127.0.0.1:8765 DOMEID=test DOMPWD=test python main.py 양말
+
+제공하는 페이지:
+    - 로그인 폼/로그인 처리 (아무 아이디/비밀번호나 허용, 쿠키 세션 발급)
+    - 메인 페이지 (/index/, 로그인 상태면 로그아웃/마이페이지 링크 포함)
+    - 검색 결과 (supplyList.php): fixtures/supplyList에 녹화된 페이지가 있으면 그대로,
+      없으면 result/search_results_{검색어}.json으로 상품 카드 HTML을 만들어 필터(minPrice/fastDelivery/minGrade)를
+      적용하고 so=pa면 낮은 가격순으로 정렬한 뒤 sz/pg로 페이지를 나눔
+    - 마이박스담기(hashTagAdd), 스피드고 마이박스 목록, 스피드고 전송 팝업(iframe, #mkForm)
+    - /standin/state: 마이박스에 담긴 상품과 전송된 상품 (JSON), /standin/reset: 상태 초기화
+
+지연/장애 주입 (--seed로 재현 가능):
+    --latency/--jitter: 모든 응답 전 지연 (초)
+    --fail-rate: 503 응답 비율
+    --empty-rate: 검색 결과 레이아웃 없이 빈 페이지를 보내는 비율 (깨진 응답 흉내)
+    --login-expire-rate: 검색 요청을 로그인 페이지로 보내는 비율 (세션 만료 흉내)
+
+실제 검색 결과 페이지를 fixtures로 녹화하려면 (저장된 로그인 세션 또는 DOMEID/DOMPWD 사용):
+
+    python standin_site.py record 양말 A4 --pages 2
+"""
+
+import argparse
+import base64
+import html
+import json
+import os
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = "fixtures"
+RESULT_DIR = "result"
+SESSION_COOKIE = "STANDIN_SESS"
+DEFAULT_PAGE_SIZE = 20
+
+# 검색 필터 파라미터 (main.SEARCH_*_PARAM과 같은 이름)
+MIN_PRICE_PARAM = "minPrice"
+FAST_DELIVERY_PARAM = "fastDelivery"
+MIN_GRADE_PARAM = "minGrade"
+SORT_PARAM = "so"          # main.SEARCH_SORT_PARAM
+SORT_PRICE_ASC = "pa"      # main.SEARCH_SORT_PRICE_ASC
+
+
+def safe_keyword(search_keyword):
+    """파일 이름에 쓸 검색어 (save_search_results와 같은 규칙)"""
+    return search_keyword.replace(' ', '_').replace('/', '_')
+
+
+def fixture_path(fixture_dir, search_keyword, page, page_size):
+    """녹화된 검색 결과 페이지 파일 경로"""
+    return os.path.join(fixture_dir, "supplyList", f"{safe_keyword(search_keyword)}_p{page}_sz{page_size}.html")
+
+
+def _query_int(query, name):
+    """쿼리 파라미터를 정수로 (없거나 숫자가 아니면 None)"""
+    value = (query.get(name) or [''])[0]
+    return int(value) if value.isdigit() else None
+
+
+def filter_products(products, query):
+    """검색 URL의 필터 파라미터(최소 가격, 빠른배송, 최소 등급)를 상품 리스트에 적용"""
+    min_price = _query_int(query, MIN_PRICE_PARAM)
+    fast_delivery = _query_int(query, FAST_DELIVERY_PARAM)
+    min_grade = _query_int(query, MIN_GRADE_PARAM)
+    filtered = []
+    for product in products:
+        if min_price is not None and (product.get('price_value') or 0) < min_price:
+            continue
+        if fast_delivery and not product.get('fast_delivery'):
+            continue
+        grade = str(product.get('grade') or '').strip()
+        if min_grade is not None and (not grade.isdigit() or int(grade) < min_grade):
+            continue
+        filtered.append(product)
+    return filtered
+
+
+def page_template(title, body, script=""):
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{html.escape(title)}</title>
+<script>{script}</script></head>
+<body>{body}</body></html>"""
+
+
+def render_product_card(product):
+    """결과 JSON의 상품 하나를 검색 결과 카드(.sub_cont_bane1) HTML로 변환"""
+    product_id = html.escape(str(product.get('product_id') or ''))
+    name = html.escape(product.get('name') or '')
+    seller = html.escape(product.get('seller') or '')
+    image = html.escape(product.get('image') or '')
+    grade = product.get('grade')
+    parts = [
+        '<div class="sub_cont_bane1">',
+        f'<input type="checkbox" name="item[]" class="input_check3" id="input_check3_{product_id}" value="{product_id}">',
+        f'<label for="input_check3_{product_id}"></label>',
+        f'<div class="bane_brd1"><img src="{image}"></div>' if image else '',
+        f'<div class="itemName">{name}</div>',
+        f'<span class="txt8">{product_id}</span>',
+        f'<div class="main_cont_text1 priceLg"><strong>{html.escape(product.get("price") or "")}</strong></div>',
+        f'<a onclick="supplyList(\'{seller}\')">{seller}</a>' if seller else '',
+        f'<div class="main_cont_text3"><strong>{html.escape(str(grade))}</strong>등급</div>' if grade else '',
+        '<span class="main_cont_bu9">빠른배송</span>' if product.get('fast_delivery') else '',
+        '</div>',
+    ]
+    return "".join(parts)
+
+
+def load_result_products(result_dir, search_keyword):
+    """result/search_results_{검색어}.json의 상품 리스트 (없거나 읽을 수 없으면 빈 리스트)"""
+    path = os.path.join(result_dir, f"search_results_{safe_keyword(search_keyword)}.json")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def render_search_page(search_keyword, cards_html):
+    """상품 카드 HTML로 검색 결과 페이지(supplyList.php) 전체 HTML 생성"""
+    body = f"""
+<div class="sub_cont">{cards_html}</div>
+<button class="footer_position_btn1" onclick="itemSave()">선택상품DB담기</button>
+<button class="footer_position_btn1" onclick="hashTagAdd()">마이박스담기</button>"""
+    return page_template(f"{search_keyword} - 검색", body, SEARCH_PAGE_SCRIPT)
+
+
+# 검색 결과 페이지의 마이박스담기 버튼 (선택한 상품번호를 동기 요청으로 서버에 기록)
+SEARCH_PAGE_SCRIPT = """
+function hashTagAdd() {
+    var ids = Array.prototype.map.call(
+        document.querySelectorAll("input[name='item[]']:checked"), function (cb) { return cb.value; });
+    var xhr = new XMLHttpRequest();
+    xhr.open('POST', '/standin/mybox/add', false);
+    xhr.setRequestHeader('Content-Type', 'application/json');
+    xhr.send(JSON.stringify(ids));
+}
+function itemSave() {}
+"""
+
+MYBOX_PAGE_SCRIPT = """
+function toggleAll(cb) {
+    document.querySelectorAll("input[name='mybox[]']").forEach(function (item) { item.checked = cb.checked; });
+}
+function speedGoSend() {
+    var ids = Array.prototype.map.call(
+        document.querySelectorAll("input[name='mybox[]']:checked"), function (cb) { return cb.value; });
+    var layer = document.createElement('div');
+    layer.className = 'layui-layer';
+    layer.innerHTML = '<iframe id="layui-layer-iframe1" name="layui-layer-iframe1" ' +
+        'src="/mybox/popup_setBulkProduct.php?ids=' + encodeURIComponent(ids.join(',')) + '"></iframe>';
+    document.body.appendChild(layer);
+}
+"""
+
+POPUP_SCRIPT = """
+function goProduct() {
+    var ids = new URLSearchParams(location.search).get('ids') || '';
+    var xhr = new XMLHttpRequest();
+    xhr.open('POST', '/standin/speedgo/send', false);
+    xhr.setRequestHeader('Content-Type', 'application/json');
+    xhr.send(JSON.stringify(ids ? ids.split(',') : []));
+    document.body.innerHTML = '<p>스피드고 전송 완료</p>';
+}
+"""
+
+
+class StandInState:
+    """로그인 세션, 세션별 마이박스, 전송 기록을 메모리에 보관"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.mybox = {}
+        self.sent = []
+        self.requests = 0
+
+    def login(self, user_id):
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.sessions[token] = user_id
+            self.mybox[token] = []
+        return token
+
+    def user(self, token):
+        with self.lock:
+            return self.sessions.get(token)
+
+    def add_to_mybox(self, token, product_ids):
+        with self.lock:
+            box = self.mybox.setdefault(token, [])
+            box.extend(pid for pid in product_ids if pid not in box)
+            return list(box)
+
+    def send(self, token, product_ids):
+        with self.lock:
+            self.sent.extend({'user': self.sessions.get(token), 'product_id': pid, 'at': time.time()}
+                             for pid in product_ids)
+            box = self.mybox.get(token, [])
+            self.mybox[token] = [pid for pid in box if pid not in product_ids]
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'sessions': len(self.sessions),
+                'mybox': {self.sessions.get(t, t): list(ids) for t, ids in self.mybox.items()},
+                'sent': list(self.sent),
+            }
+
+    def reset(self):
+        with self.lock:
+            self.sessions.clear()
+            self.mybox.clear()
+            self.sent.clear()
+            self.requests = 0
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """도매꾹/도매매DB/스피드고 경로를 흉내 내는 요청 처리기 (설정은 server 속성에서 읽음)"""
+
+    server_version = "DomeggookStandIn/1.0"
+
+    # ---- 공통 ----
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _session_token(self):
+        for part in (self.headers.get('Cookie') or '').split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == SESSION_COOKIE:
+                return value
+        return None
+
+    def _logged_in(self):
+        token = self._session_token()
+        return token if token and self.server.state.user(token) else None
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location, headers=None):
+        self._send(302, "", headers=dict(headers or {}, Location=location))
+
+    def _redirect_to_login(self):
+        back = base64.b64encode(f"{self.server.base_url}/index".encode('utf-8')).decode('ascii')
+        self._redirect(f"/ssl/member/mem_loginForm.php?back={back}")
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            return json.loads(self.rfile.read(length).decode('utf-8') or 'null')
+        except ValueError:
+            return None
+
+    def _inject(self):
+        """지연과 503 장애 주입 (True면 이미 응답을 보냄)"""
+        with self.server.state.lock:
+            self.server.state.requests += 1
+        config = self.server
+        delay = config.latency + (config.rng.uniform(0, config.jitter) if config.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+        if config.fail_rate and config.rng.random() < config.fail_rate:
+            self._send(503, page_template("Service Unavailable", "<h1>503 Service Unavailable</h1>"))
+            return True
+        return False
+
+    # ---- 라우팅 ----
+
+    def do_GET(self):
+        if self._inject():
+            return
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        routes = {
+            '/ssl/member/mem_loginForm.php': self.login_form,
+            '/ssl/member/logout.php': self.logout,
+            '/index/': self.index,
+            '/index': self.index,
+            '/index/item/supplyList.php': self.supply_list,
+            '/': self.speedgo_home,
+            '/mybox/mb_saveList.php': self.mybox_list,
+            '/mybox/popup_setBulkProduct.php': self.speedgo_popup,
+            '/robots.txt': lambda q: self._send(200, "User-agent: *\n", "text/plain"),
+            '/standin/state': lambda q: self._send(200, json.dumps(self.server.state.snapshot(), ensure_ascii=False),
+                                                   "application/json; charset=utf-8"),
+        }
+        handler = routes.get(parsed.path)
+        if handler is None:
+            self._send(404, page_template("Not Found", "<h1>404</h1>"))
+        else:
+            handler(query)
+
+    def do_POST(self):
+        if self._inject():
+            return
+        parsed = urlparse(self.path)
+        if parsed.path == '/ssl/member/mem_login.php':
+            self.login_submit()
+        elif parsed.path == '/standin/mybox/add':
+            token = self._logged_in()
+            if not token:
+                return self._send(401, "{}", "application/json")
+            box = self.server.state.add_to_mybox(token, [str(pid) for pid in self._read_json() or []])
+            self._send(200, json.dumps({'mybox': box}), "application/json")
+        elif parsed.path == '/standin/speedgo/send':
+            token = self._logged_in()
+            if not token:
+                return self._send(401, "{}", "application/json")
+            self.server.state.send(token, [str(pid) for pid in self._read_json() or []])
+            self._send(200, json.dumps({'result': 'ok'}), "application/json")
+        elif parsed.path == '/standin/reset':
+            self.server.state.reset()
+            self._send(200, json.dumps({'result': 'ok'}), "application/json")
+        else:
+            self._send(404, page_template("Not Found", "<h1>404</h1>"))
+
+    # ---- 로그인 ----
+
+    def login_form(self, query):
+        back = html.escape((query.get('back') or [''])[0])
+        body = f"""
+<form method="post" action="/ssl/member/mem_login.php">
+  <input type="hidden" name="back" value="{back}">
+  <input type="text" name="id" id="id" placeholder="아이디">
+  <input type="password" name="password" id="password" placeholder="비밀번호">
+  <button type="submit" class="btn-login">로그인</button>
+</form>"""
+        self._send(200, page_template("로그인", body))
+
+    def login_submit(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        user_id = (form.get('id') or [''])[0]
+        password = (form.get('password') or [''])[0]
+        if not user_id or not password:
+            return self._send(200, page_template("로그인", '<div class="error">아이디와 비밀번호를 입력하세요.</div>'))
+        token = self.server.state.login(user_id)
+        try:
+            back = base64.b64decode((form.get('back') or [''])[0]).decode('utf-8')
+        except ValueError:
+            back = ''
+        # 다른 호스트로 가는 back은 허용하지 않고 같은 서버의 경로만 사용
+        location = urlparse(back).path or '/index/'
+        self._redirect(location, headers={'Set-Cookie': f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"})
+
+    def logout(self, query):
+        self._redirect('/index/', headers={'Set-Cookie': f"{SESSION_COOKIE}=; Path=/; Max-Age=0"})
+
+    def index(self, query):
+        if self._logged_in():
+            menu = '<a href="/ssl/member/logout.php">로그아웃</a> <a href="/mypage/">마이페이지</a>'
+        else:
+            menu = '<a href="/ssl/member/mem_loginForm.php">로그인</a>'
+        body = f"""
+<div class="top_menu">{menu}</div>
+<form action="/index/item/supplyList.php" method="get">
+  <input type="hidden" name="sf" value="subject"><input type="hidden" name="mode" value="search">
+  <input type="text" name="sw" title="검색">
+  <button type="submit" class="btn-search">검색</button>
+</form>"""
+        self._send(200, page_template("도매매DB", body))
+
+    # ---- 검색 결과 ----
+
+    def supply_list(self, query):
+        if not self._logged_in():
+            return self._redirect_to_login()
+        config = self.server
+        if config.login_expire_rate and config.rng.random() < config.login_expire_rate:
+            return self._redirect_to_login()
+
+        search_keyword = (query.get('sw') or [''])[0]
+        page = int((query.get('pg') or ['1'])[0] or 1)
+        page_size = int((query.get('sz') or [str(DEFAULT_PAGE_SIZE)])[0] or DEFAULT_PAGE_SIZE)
+
+        if config.empty_rate and config.rng.random() < config.empty_rate:
+            # 카드만 없는 결과 페이지는 정상 응답(필터에 맞는 상품 없음)이므로 레이아웃까지 없는 페이지를 보냄
+            return self._send(200, page_template(f"{search_keyword} - 검색", ""))
+        else:
+            recorded = fixture_path(config.fixture_dir, search_keyword, page, page_size)
+            if os.path.exists(recorded):
+                with open(recorded, 'rb') as f:
+                    return self._send(200, f.read())
+            products = filter_products(load_result_products(config.result_dir, search_keyword), query)
+            if (query.get(SORT_PARAM) or [''])[0] == SORT_PRICE_ASC:
+                products = sorted(products, key=lambda p: p.get('price_value') or 0)
+            start = (page - 1) * page_size
+            cards_html = "".join(render_product_card(p) for p in products[start:start + page_size])
+
+        self._send(200, render_search_page(search_keyword, cards_html))
+
+    # ---- 스피드고 ----
+
+    def speedgo_home(self, query):
+        if not self._logged_in():
+            return self._redirect_to_login()
+        body = '<div class="gnb"><a class="cur" href="/mybox/mb_saveList.php">마이박스</a></div>'
+        self._send(200, page_template("스피드고", body))
+
+    def mybox_list(self, query):
+        token = self._logged_in()
+        if not token:
+            return self._redirect_to_login()
+        items = self.server.state.add_to_mybox(token, [])
+        rows = "".join(
+            f'<li><input type="checkbox" name="mybox[]" value="{html.escape(pid)}"> {html.escape(pid)}</li>'
+            for pid in items
+        )
+        body = f"""
+<label for="selectAll">전체선택</label>
+<input type="checkbox" id="selectAll" name="selectAll" class="checkbox1" onclick="toggleAll(this)">
+<ul class="mybox_list">{rows}</ul>
+<button class="button2" onclick="speedGoSend()">스피드고전송</button>"""
+        self._send(200, page_template("마이박스", body, MYBOX_PAGE_SCRIPT))
+
+    def speedgo_popup(self, query):
+        if not self._logged_in():
+            return self._redirect_to_login()
+        body = """
+<form id="mkForm" onsubmit="return false;">
+  <div><div class="fr"><div class="cb t50">
+    <button type="button" class="cont_btn1" onclick="goProduct()">스피드고전송</button>
+  </div></div></div>
+</form>"""
+        self._send(200, page_template("스피드고 전송", body, POPUP_SCRIPT))
+
+
+def serve(host="127.0.0.1", port=8765, latency=0.0, jitter=0.0, fail_rate=0.0, empty_rate=0.0,
+          login_expire_rate=0.0, seed=None, fixture_dir=FIXTURE_DIR, result_dir=RESULT_DIR, quiet=False):
+    """
+    대체 사이트 서버 생성 (server.serve_forever()로 실행, 테스트에서는 스레드로 실행 가능)
+
+    Returns:
+        ThreadingHTTPServer 객체 (state 속성으로 마이박스/전송 기록 확인)
+    """
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    server.state = StandInState()
+    server.latency = latency
+    server.jitter = jitter
+    server.fail_rate = fail_rate
+    server.empty_rate = empty_rate
+    server.login_expire_rate = login_expire_rate
+    server.rng = random.Random(seed)
+    server.fixture_dir = fixture_dir
+    server.result_dir = result_dir
+    server.quiet = quiet
+    return server
+
+
+def record(search_keywords, pages=1, page_size=None, fixture_dir=FIXTURE_DIR):
+    """
+    실제 사이트의 검색 결과 페이지를 fixtures로 녹화
+
+    Args:
+        search_keywords: 녹화할 검색어 리스트
+        pages: 검색어별 녹화할 페이지 수
+        page_size: 페이지당 상품 수 (None이면 SEARCH_MAX_PAGE_SIZE)
+        fixture_dir: 저장 폴더
+
+    Returns:
+        저장한 파일 경로 리스트
+    """
+    from main import SEARCH_MAX_PAGE_SIZE, HTTP_CACHE, build_search_url, get_logged_in_http_session
+
+    page_size = page_size or SEARCH_MAX_PAGE_SIZE
+    session = get_logged_in_http_session()
+    if session is None:
+        raise RuntimeError("로그인 세션을 만들 수 없어 녹화할 수 없습니다.")
+
+    os.makedirs(os.path.join(fixture_dir, "supplyList"), exist_ok=True)
+    saved = []
+    for search_keyword in search_keywords:
+        for page in range(1, pages + 1):
+            url = build_search_url(search_keyword, page=page, page_size=page_size)
+            response = HTTP_CACHE.get(session, url, timeout=15)
+            response.raise_for_status()
+            path = fixture_path(fixture_dir, search_keyword, page, page_size)
+            with open(path, 'wb') as f:
+                f.write(response.content)
+            saved.append(path)
+            print(f"✓ 녹화: {search_keyword} {page}페이지 → {path}")
+    return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="도매꾹 로컬 대체 사이트와 검색 결과 페이지 녹화 도구")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="대체 사이트 실행")
+    serve_parser.add_argument('--host', default="127.0.0.1")
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--latency', type=float, default=0.0, help="응답 전 고정 지연 (초)")
+    serve_parser.add_argument('--jitter', type=float, default=0.0, help="응답 전 추가 무작위 지연 최대값 (초)")
+    serve_parser.add_argument('--fail-rate', type=float, default=0.0, help="503 응답 비율 (0~1)")
+    serve_parser.add_argument('--empty-rate', type=float, default=0.0, help="빈 검색 결과 비율 (0~1)")
+    serve_parser.add_argument('--login-expire-rate', type=float, default=0.0,
+                              help="검색 요청을 로그인 페이지로 보내는 비율 (0~1)")
+    serve_parser.add_argument('--seed', type=int, default=None, help="지연/장애 주입 난수 시드")
+    serve_parser.add_argument('--fixtures', default=FIXTURE_DIR, help=f"녹화된 페이지 폴더 (기본: {FIXTURE_DIR})")
+    serve_parser.add_argument('--results', default=RESULT_DIR, help=f"결과 JSON 폴더 (기본: {RESULT_DIR})")
+    serve_parser.add_argument('--quiet', action='store_true', help="요청 로그 출력 안 함")
+
+    record_parser = commands.add_parser('record', help="실제 검색 결과 페이지를 fixtures로 녹화")
+    record_parser.add_argument('keywords', nargs='+', help="녹화할 검색어")
+    record_parser.add_argument('--pages', type=int, default=1, help="검색어별 페이지 수 (기본: 1)")
+    record_parser.add_argument('--page-size', type=int, default=None, help="페이지당 상품 수")
+    record_parser.add_argument('--fixtures', default=FIXTURE_DIR, help=f"저장 폴더 (기본: {FIXTURE_DIR})")
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.keywords, pages=args.pages, page_size=args.page_size, fixture_dir=args.fixtures)
+        return
+
+    server = serve(
+        host=args.host, port=args.port, latency=args.latency, jitter=args.jitter, fail_rate=args.fail_rate,
+        empty_rate=args.empty_rate, login_expire_rate=args.login_expire_rate, seed=args.seed,
+        fixture_dir=args.fixtures, result_dir=args.results, quiet=args.quiet,
+    )
+    base_url = server.base_url
+    print(f"✓ 대체 사이트 실행 중: {base_url}")
+    print("  main.py를 이 사이트로 실행하려면:")
+    print(f"    DOMEGGOOK_URL={base_url} DOMEMEDB_URL={base_url} SPEEDGO_URL={base_url} python main.py 양말")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n대체 사이트를 종료합니다.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+단계별 소요 시간 기록(JSON Lines) 요약
+
+main.py --trace로 기록한 파일을 읽어 단계(stage)별 횟수, 합계, 전체 대비 비율,
+p50/p95/p99, 실패(outcome이 'ok'가 아닌 구간) 수와 재시도 수를 출력한다.
+로그인, 대기, 파싱 중 어느 단계가 실행 시간을 차지하는지 확인하는 용도이다.
+
+사용 예:
+    python main.py --trace 양말 A4
+    python trace_summary.py trace.jsonl
+    python trace_summary.py trace.jsonl --keywords 10   # 오래 걸린 검색어 10개도 출력
+    python trace_summary.py trace.jsonl --json
+
+main.py를 import하지 않으므로 selenium 등이 없는 환경에서도 실행할 수 있다.
+"""
+
+import argparse
+import json
+import math
+import sys
+
+TRACE_PATH = "trace.jsonl"  # main.TRACE_PATH와 같은 기본값
+
+# 처리 순서대로 출력할 단계 (그 외 단계는 뒤에 이름순)
+STAGE_ORDER = [
+    'driver_start', 'login', 'navigate', 'wait_results', 'scroll', 'parse',
+    'mybox_select', 'mybox_click', 'speedgo_nav', 'speedgo_popup', 'speedgo_send2', 'backoff',
+]
+
+
+def load_spans(path):
+    """JSON Lines 파일에서 구간 기록 리스트 읽기 (깨진 줄은 건너뜀)"""
+    spans = []
+    skipped = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                span = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            if 'stage' in span and 'duration' in span:
+                spans.append(span)
+    if skipped:
+        print(f"⚠ 읽을 수 없는 줄 {skipped}개를 건너뛰었습니다.", file=sys.stderr)
+    return spans
+
+
+def percentile(sorted_values, q):
+    """정렬된 값의 q 분위수 (0~1, 선형 보간)"""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q
+    lower = math.floor(pos)
+    upper = math.ceil(pos)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+def summarize_stages(spans):
+    """
+    단계별 통계 계산
+
+    Returns:
+        {stage: {'count', 'total', 'share', 'p50', 'p95', 'p99', 'max', 'failures', 'retries'}}
+    """
+    grouped = {}
+    for span in spans:
+        grouped.setdefault(span['stage'], []).append(span)
+
+    grand_total = sum(span['duration'] for span in spans) or 1.0
+    order = {stage: idx for idx, stage in enumerate(STAGE_ORDER)}
+    summary = {}
+    for stage in sorted(grouped, key=lambda name: (order.get(name, len(order)), name)):
+        items = grouped[stage]
+        durations = sorted(span['duration'] for span in items)
+        total = sum(durations)
+        summary[stage] = {
+            'count': len(items),
+            'total': total,
+            'share': total / grand_total,
+            'p50': percentile(durations, 0.50),
+            'p95': percentile(durations, 0.95),
+            'p99': percentile(durations, 0.99),
+            'max': durations[-1],
+            'failures': sum(1 for span in items if span.get('outcome', 'ok') != 'ok'),
+            'retries': sum(span.get('retries') or 0 for span in items),
+        }
+    return summary
+
+
+def summarize_keywords(spans, top=10):
+    """구간 합계가 큰 검색어 top개 [(검색어, 합계(초), 실패 구간 수)]"""
+    totals = {}
+    for span in spans:
+        keyword = span.get('keyword')
+        if keyword is None:
+            continue
+        total, failures = totals.get(keyword, (0.0, 0))
+        totals[keyword] = (total + span['duration'], failures + (span.get('outcome', 'ok') != 'ok'))
+    ranked = sorted(totals.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+    return [(keyword, total, failures) for keyword, (total, failures) in ranked]
+
+
+def print_summary(summary, spans):
+    keywords = {span.get('keyword') for span in spans if span.get('keyword') is not None}
+    print(f"구간 {len(spans)}개, 검색어 {len(keywords)}개")
+    print(f"\n  {'단계':<16}{'횟수':>7}{'합계(초)':>10}{'비율':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'최대':>8}{'실패':>6}{'재시도':>7}")
+    for stage, item in summary.items():
+        print(f"  {stage:<16}{item['count']:>7}{item['total']:>10.2f}{item['share']:>7.1%}"
+              f"{item['p50']:>8.2f}{item['p95']:>8.2f}{item['p99']:>8.2f}{item['max']:>8.2f}"
+              f"{item['failures']:>6}{item['retries']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="main.py --trace 기록의 단계별 p50/p95/p99 요약")
+    parser.add_argument('path', nargs='?', default=TRACE_PATH, help=f"기록 파일 (기본: {TRACE_PATH})")
+    parser.add_argument('--stage', action='append', help="이 단계만 요약 (여러 번 지정 가능)")
+    parser.add_argument('--keywords', type=int, default=0, metavar='N', help="구간 합계가 큰 검색어 N개 출력")
+    parser.add_argument('--json', action='store_true', help="요약을 JSON으로 출력")
+    args = parser.parse_args()
+
+    try:
+        spans = load_spans(args.path)
+    except OSError as e:
+        print(f"✗ 기록 파일을 열 수 없습니다: {e}")
+        return 1
+    if args.stage:
+        spans = [span for span in spans if span['stage'] in args.stage]
+    if not spans:
+        print("✗ 요약할 구간이 없습니다.")
+        return 1
+
+    summary = summarize_stages(spans)
+    top_keywords = summarize_keywords(spans, args.keywords) if args.keywords else []
+
+    if args.json:
+        json.dump({'stages': summary, 'keywords': [
+            {'keyword': keyword, 'total': total, 'failures': failures} for keyword, total, failures in top_keywords
+        ]}, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+
+    print_summary(summary, spans)
+    if top_keywords:
+        print(f"\n오래 걸린 검색어 {len(top_keywords)}개:")
+        for keyword, total, failures in top_keywords:
+            print(f"  {keyword:<24}{total:>10.2f}초  실패 구간 {failures}개")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())